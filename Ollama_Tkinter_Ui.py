@@ -1,21 +1,1611 @@
 #!/usr/bin/env python3
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, simpledialog
 import subprocess
+import shutil
+import glob
 import threading
 import time
 import os
 import sys
 import platform
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import re
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait
+from array import array
 import webbrowser
 import getpass
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urlparse
+from collections import OrderedDict
+import hashlib
+import struct
+
+# Optional: exact token counting with the model's own vocabulary
+try:
+    from tokenizers import Tokenizer, Regex as TokenizerRegex
+    from tokenizers import models as tokenizer_models, pre_tokenizers as tokenizer_pre_tokenizers
+except ImportError:
+    Tokenizer = None
+
+OLLAMA_BASE_URL = "http://localhost:11434"
+OLLAMA_DEFAULT_PORT = 11434
+DEFAULT_NUM_CTX = 8192  # Context window sent when num_ctx is 0 (auto), capped at the model's own
+
+
+def normalize_ollama_host(host):
+    """Turn 'host', 'host:port' or a full URL into a base URL like http://host:11434.
+    
+    Raises ValueError for a URL without a host or with a non-numeric or out-of-range port.
+    """
+    host = (host or "").strip().rstrip('/')
+    if not host:
+        return OLLAMA_BASE_URL
+    if "://" not in host:
+        if host.count(':') > 1 and not host.startswith('['):
+            host = f"[{host}]"  # Bare IPv6 address
+        host = f"http://{host}"
+    parsed = urlparse(host)
+    if not parsed.hostname:
+        raise ValueError(f"No host name in '{host}'")
+    if parsed.port is None and parsed.scheme == "http":
+        hostname = f"[{parsed.hostname}]" if ':' in parsed.hostname else parsed.hostname  # IPv6 needs brackets
+        host = f"{parsed.scheme}://{hostname}:{OLLAMA_DEFAULT_PORT}{parsed.path}"
+    return host.rstrip('/')
+
+
+# Precompiled regular expressions for everything parsed repeatedly (model info
+# refresh every 10 s, every download progress line, markdown, compatibility checks)
+PATTERNS = {
+    # Markdown
+    'code_block': re.compile(r'```[a-zA-Z]*\n?(.*?)\n?```', re.DOTALL),
+    
+    # ollama.com model page scraping
+    'page_sizes': re.compile(r'x-test-size[^>]*>([^<]+)'),
+    'page_pull_count': re.compile(r'x-test-pull-count>([^<]+)'),
+    'page_updated': re.compile(r'x-test-updated>([^<]+)'),
+    'page_capability': re.compile(r'bg-indigo-50[^>]*>([^<]+)</span>'),
+    
+    # Model size detection from name and tag
+    'size_noise_words': re.compile(r'\b(latest|default|instruct|chat|code)\b'),
+    'size_decimal_b': re.compile(r'(\d+\.\d+)\s*b\b'),
+    'size_millions': re.compile(r'(\d+)\s*m\b'),
+    'size_whole_b': re.compile(r'(\d+)\s*b\b'),
+    
+    # Download progress lines
+    'progress_percent': re.compile(r'(\d+)%'),
+    'progress_size': re.compile(r'(\d+(?:\.\d+)?)\s*([KMGT]?B)'),
+    
+    # keep_alive values accepted by the API: seconds (sent as a number) or a Go duration
+    # such as "30m", "1h30m", "1.5h" in which every number has a unit
+    'keep_alive': re.compile(r'^-?(\d+(\.\d+)?|(\d+(\.\d+)?(ns|us|µs|ms|s|m|h))+)$'),
+    'keep_alive_seconds': re.compile(r'^-?\d+(\.\d+)?$'),
+    
+    # num_ctx line in the /api/show parameters text (servers without model_info)
+    'num_ctx': re.compile(r'^num_ctx\s+(\d+)', re.MULTILINE),
+}
+
+# Patterns built from data at runtime (e.g. MODEL_REQUIREMENTS), compiled once on first use
+_DYNAMIC_PATTERNS = {}
+
+
+def compiled_pattern(source):
+    """Return a compiled regex for a pattern string that is only known at runtime."""
+    pattern = _DYNAMIC_PATTERNS.get(source)
+    if pattern is None:
+        pattern = _DYNAMIC_PATTERNS[source] = re.compile(source)
+    return pattern
+
+
+def keep_alive_value(keep_alive):
+    """Return keep_alive as the API expects it: plain seconds as a number, durations as a string.
+    
+    The server parses strings as Go durations, which need a unit ("1.5" alone is rejected).
+    """
+    if isinstance(keep_alive, (int, float)):
+        return keep_alive
+    keep_alive = str(keep_alive).strip()
+    if PATTERNS['keep_alive_seconds'].match(keep_alive):
+        seconds = float(keep_alive)
+        return int(seconds) if seconds.is_integer() else seconds
+    return keep_alive
+
+
+def format_context_size(context_size):
+    """Format a context window size in tokens as e.g. "131K" or "1.2M"."""
+    if context_size >= 1000000:
+        # 1M+ tokens: show as "1.2M" format
+        if context_size % 1000000 == 0:
+            return f"{context_size//1000000}M"
+        return f"{context_size/1000000:.1f}M"
+    elif context_size >= 1000:
+        # 1K+ tokens: show as "131K" format
+        if context_size % 1000 == 0:
+            return f"{context_size//1000}K"
+        return f"{context_size/1000:.1f}K"
+    # Less than 1000: show exact number
+    return str(context_size)
+
+
+def parse_download_progress(line):
+    """Parse download progress from ollama output."""
+    # Look for percentage patterns in ollama output
+    # Examples: "pulling manifest... 100%", "downloading 12345/67890 50%"
+    percent_match = PATTERNS['progress_percent'].search(line)
+    if percent_match:
+        percentage = int(percent_match.group(1))
+        
+        # Extract status text
+        status = line.strip()
+        line_lower = line.lower()
+        if 'pulling' in line_lower:
+            status = "Pulling manifest..."
+        elif 'downloading' in line_lower:
+            status = "Downloading model data..."
+        elif 'verifying' in line_lower:
+            status = "Verifying download..."
+        elif 'success' in line_lower or 'complete' in line_lower:
+            status = "Download complete!"
+        
+        return {'percentage': percentage, 'status': status, 'raw': line}
+    
+    # Look for size information
+    if PATTERNS['progress_size'].search(line):
+        return {'status': line.strip(), 'raw': line}
+    
+    return None
+
+
+# Inline markdown spans as one alternation, in priority order: at any position the
+# first alternative that matches wins, and the leftmost match in the text wins overall
+INLINE_MARKDOWN_PATTERN = re.compile(
+    r'`(?P<inline_code>[^`\n]+)`'     # `code` - highest priority
+    r'|\*\*(?P<bold>[^*]+)\*\*'        # **bold**
+    r'|\*(?P<italic>[^*]+)\*'          # *italic*
+    r'|__(?P<bold_alt>[^_]+)__'        # __bold__
+    r'|_(?P<italic_alt>[^_]+)_'        # _italic_
+)
+INLINE_MARKDOWN_TYPES = {
+    'inline_code': 'inline_code',
+    'bold': 'bold',
+    'italic': 'italic',
+    'bold_alt': 'bold',
+    'italic_alt': 'italic',
+}
+
+
+def iter_inline_markdown(text):
+    """Yield (type, content) spans for inline markdown in a single left-to-right pass."""
+    pos = 0
+    for match in INLINE_MARKDOWN_PATTERN.finditer(text):
+        if match.start() > pos:
+            yield ("text", text[pos:match.start()])
+        yield (INLINE_MARKDOWN_TYPES[match.lastgroup], match.group(match.lastgroup))
+        pos = match.end()
+    if pos < len(text):
+        yield ("text", text[pos:])
+
+
+class OllamaClient:
+    """HTTP client for the Ollama server built on one pooled keep-alive session.
+
+    Every request to the Ollama API goes through this object so TCP connections
+    are reused between chat turns, translations and health probes.
+    """
+
+    # Default timeouts in seconds per API endpoint (streaming calls are usually
+    # overridden with the user's response timeout)
+    DEFAULT_TIMEOUTS = {
+        '/api/version': 0.5,   # Health probes must stay sub-second
+        '/api/tags': 5,
+        '/api/ps': 5,
+        '/api/show': 10,
+        '/api/chat': 60,
+        '/api/generate': 60,
+        '/api/pull': 60,      # Maximum wait between progress events
+        '/api/delete': 30,
+    }
+
+    LOCAL_HOSTNAMES = ('localhost', '127.0.0.1', '::1', '0.0.0.0')
+
+    def __init__(self, base_url=OLLAMA_BASE_URL, pool_size=4, retries=2, timeouts=None):
+        self.base_url = normalize_ollama_host(base_url)
+        self.session = requests.Session()
+        # Health probes get their own session without retries, so a dead server fails within one timeout
+        self.probe_session = requests.Session()
+        self.timeouts = dict(self.DEFAULT_TIMEOUTS)
+        self.last_probe_latency_ms = None
+        self.configure(pool_size=pool_size, retries=retries, timeouts=timeouts)
+
+    def configure(self, pool_size=None, retries=None, timeouts=None):
+        """Apply connection pool size, retry count and per-endpoint timeout overrides."""
+        if pool_size is not None:
+            self.pool_size = max(1, int(pool_size))
+        if retries is not None:
+            self.retries = max(0, int(retries))
+        if timeouts:
+            self.timeouts.update({endpoint: float(value) for endpoint, value in timeouts.items()})
+        
+        # An integer max_retries only retries failed connects, never a request the
+        # server has already received, so it is safe for POST as well
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                              max_retries=self.retries)
+        probe_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        for session, new_adapter in ((self.session, adapter), (self.probe_session, probe_adapter)):
+            # Close the pools of the adapters being replaced instead of leaking their connections
+            for old_adapter in set(session.adapters.values()):
+                old_adapter.close()
+            session.mount("http://", new_adapter)
+            session.mount("https://", new_adapter)
+
+    def set_base_url(self, base_url):
+        """Point the client at a different Ollama server."""
+        self.base_url = normalize_ollama_host(base_url)
+        self.last_probe_latency_ms = None
+
+    def is_local(self):
+        """Return True if the configured server runs on this machine."""
+        return urlparse(self.base_url).hostname in self.LOCAL_HOSTNAMES
+
+    def timeout_for(self, endpoint):
+        """Return the configured timeout for an endpoint."""
+        return self.timeouts.get(endpoint, 30)
+
+    def get(self, endpoint, timeout=None, **kwargs):
+        """Send a GET request to an API endpoint."""
+        return self.session.get(f"{self.base_url}{endpoint}",
+                                timeout=timeout or self.timeout_for(endpoint), **kwargs)
+
+    def post(self, endpoint, payload, stream=False, timeout=None):
+        """Send a POST request with a JSON payload to an API endpoint."""
+        return self.session.post(f"{self.base_url}{endpoint}", json=payload, stream=stream,
+                                 timeout=timeout or self.timeout_for(endpoint))
+
+    def delete(self, endpoint, payload, timeout=None):
+        """Send a DELETE request with a JSON payload to an API endpoint."""
+        return self.session.delete(f"{self.base_url}{endpoint}", json=payload,
+                                   timeout=timeout or self.timeout_for(endpoint))
+
+    def list_models(self):
+        """Return the installed models from /api/tags."""
+        response = self.get('/api/tags')
+        response.raise_for_status()
+        return response.json().get('models', [])
+
+    def running_models(self):
+        """Return the models currently loaded in memory from /api/ps."""
+        response = self.get('/api/ps')
+        response.raise_for_status()
+        return response.json().get('models', [])
+
+    def show(self, model_name, timeout=None):
+        """Return the /api/show metadata for a model."""
+        # 'name' is the older spelling of 'model', sent for compatibility with older servers
+        response = self.post('/api/show', {'model': model_name, 'name': model_name}, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def pull(self, model_name):
+        """Start pulling a model; returns the streaming NDJSON progress response."""
+        response = self.post('/api/pull', {'model': model_name, 'name': model_name, 'stream': True}, stream=True)
+        response.raise_for_status()
+        return response
+
+    def delete_model(self, model_name):
+        """Delete an installed model."""
+        response = self.delete('/api/delete', {'model': model_name, 'name': model_name})
+        response.raise_for_status()
+
+    def probe(self):
+        """Check the server via /api/version and record the round-trip latency.
+
+        Raises requests.exceptions.RequestException when the server is unreachable.
+        """
+        start = time.perf_counter()
+        response = self.probe_session.get(f"{self.base_url}/api/version", timeout=self.timeout_for('/api/version'))
+        response.raise_for_status()
+        self.last_probe_latency_ms = (time.perf_counter() - start) * 1000
+        return True
+
+
+@dataclass(frozen=True)
+class ModelMetadata:
+    """Static model facts from the /api/show JSON (immutable for a given digest)."""
+
+    name: str
+    digest: str = ''
+    family: str = ''
+    parameter_size: str = ''   # As reported by the server, e.g. "8.0B" or "270M"
+    parameter_count: int = 0
+    context_length: int = 0    # Trained context window in tokens
+    quantization: str = ''     # e.g. "Q4_K_M"
+    capabilities: tuple = field(default_factory=tuple)
+
+    @classmethod
+    def from_show(cls, name, digest, show_data):
+        """Build the record from the structured details/model_info fields of /api/show."""
+        details = show_data.get('details') or {}
+        model_info = show_data.get('model_info') or {}
+        architecture = model_info.get('general.architecture') or details.get('family', '')
+        
+        context_length = model_info.get(f"{architecture}.context_length") or 0
+        if not context_length:
+            # Older servers without model_info: fall back to a num_ctx in the parameters text
+            num_ctx_match = PATTERNS['num_ctx'].search(show_data.get('parameters') or '')
+            context_length = int(num_ctx_match.group(1)) if num_ctx_match else 0
+        
+        return cls(
+            name=name,
+            digest=digest or '',
+            family=details.get('family') or architecture or '',
+            parameter_size=details.get('parameter_size') or '',
+            parameter_count=int(model_info.get('general.parameter_count') or 0),
+            context_length=int(context_length),
+            quantization=details.get('quantization_level') or '',
+            capabilities=tuple(show_data.get('capabilities') or ()),
+        )
+
+    @property
+    def size_display(self):
+        """Parameter size for the details panel, e.g. "8B"."""
+        if self.parameter_size:
+            return self.parameter_size
+        if self.parameter_count:
+            return f"{self.parameter_count / 1e9:.1f}B"
+        return "Unknown"
+
+    @property
+    def context_display(self):
+        """Context window for the details panel, e.g. "131K"."""
+        return format_context_size(self.context_length) if self.context_length else "Unknown"
+
+
+@dataclass(frozen=True)
+class RunningModel:
+    """One model loaded in server memory, as listed by /api/ps."""
+
+    name: str
+    digest: str = ''
+    size: int = 0        # Bytes the loaded model occupies in total
+    size_vram: int = 0   # Bytes of that resident in GPU memory
+    expires_at: str = ''
+
+    @classmethod
+    def from_api(cls, entry):
+        """Build the record from one entry of the /api/ps 'models' list."""
+        return cls(
+            name=entry.get('name') or entry.get('model') or '',
+            digest=entry.get('digest') or '',
+            size=int(entry.get('size') or 0),
+            size_vram=int(entry.get('size_vram') or 0),
+            expires_at=entry.get('expires_at') or '',
+        )
+
+    def matches(self, model_name, digest=''):
+        """Whether this entry is the given model (by digest, or by name with an implied ':latest')."""
+        if digest and self.digest == digest:
+            return True
+        if ':' not in model_name:
+            model_name += ':latest'
+        name = self.name if ':' in self.name else f"{self.name}:latest"
+        return name == model_name
+
+    @property
+    def size_ram(self):
+        """Bytes of the model held in system RAM (the part not offloaded to the GPU)."""
+        return max(self.size - self.size_vram, 0)
+
+    @property
+    def gpu_percent(self):
+        """Share of the model resident in GPU memory, 0-100."""
+        return int(round(self.size_vram * 100 / self.size)) if self.size else 0
+
+
+class RunningModelsSnapshot:
+    """Shared view of /api/ps so concurrent callers reuse one request instead of each polling."""
+
+    def __init__(self, client, ttl=2.0):
+        self.client = client
+        self.ttl = ttl
+        self.models = []
+        self.fetched_at = 0.0
+        self.lock = threading.Lock()
+
+    def get(self, max_age=None):
+        """Return the running models, refreshing if the snapshot is older than max_age seconds.
+        
+        Raises requests.exceptions.RequestException if a needed refresh fails.
+        """
+        max_age = self.ttl if max_age is None else max_age
+        # The lock is held during the request so simultaneous callers wait for one shared answer
+        with self.lock:
+            if time.monotonic() - self.fetched_at > max_age:
+                self.models = [RunningModel.from_api(entry) for entry in self.client.running_models()]
+                self.fetched_at = time.monotonic()
+            return list(self.models)
+
+    def find(self, model_name, digest='', max_age=None):
+        """Return the RunningModel for a model, or None if it is not loaded."""
+        for running in self.get(max_age):
+            if running.matches(model_name, digest):
+                return running
+        return None
+
+    def invalidate(self):
+        """Force the next read to fetch fresh data (after loads, unloads or a server change)."""
+        with self.lock:
+            self.fetched_at = 0.0
+
+
+class ResidencyManager:
+    """Keeps pinned models loaded and unloads idle ones, least recently used first, beyond a memory budget.
+
+    Loads and unloads are empty /api/generate calls: keep_alive -1 pins a model
+    in memory, keep_alive 0 unloads it.
+    """
+
+    def __init__(self, client, running_models, prepare_payload=None):
+        self.client = client
+        self.running_models = running_models
+        self.prepare_payload = prepare_payload or (lambda payload: payload)  # Adds num_ctx and keep_alive
+        self.pinned = set()
+        self.budget_bytes = 0  # 0 = no limit
+        self.last_used = {}    # model -> time.monotonic() of its last selection or request
+        self.lock = threading.Lock()
+
+    def touch(self, model_name):
+        """Mark a model as just used, moving it to the back of the eviction order."""
+        self.last_used[model_name] = time.monotonic()
+
+    def set_pinned(self, model_name, pinned):
+        """Pin or unpin a model; the change takes effect on the next enforce()."""
+        if pinned:
+            self.pinned.add(model_name)
+        else:
+            self.pinned.discard(model_name)
+
+    def load(self, model_name, keep_alive=None, timeout=300):
+        """Load a model without generating anything (keep_alive None uses the session default)."""
+        payload = self.prepare_payload({"model": model_name})
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        response = self.client.post('/api/generate', payload, timeout=timeout)
+        response.raise_for_status()
+        self.running_models.invalidate()
+
+    def unload(self, model_name):
+        """Ask the server to drop a model from memory now."""
+        response = self.client.post('/api/generate', {"model": model_name, "keep_alive": 0})
+        response.raise_for_status()
+        self.running_models.invalidate()
+
+    def prefetch(self, model_name, size_bytes, free_bytes=None):
+        """Load a model in advance if it fits next to the loaded ones. Returns True if a load was started.
+        
+        size_bytes is the expected memory of the loaded model. It must fit within the budget
+        and within free_bytes (free GPU or system memory) where those are known; otherwise the
+        server would make room by evicting a model, possibly the one being chatted with.
+        """
+        running = self.running_models.get()
+        if any(model.matches(model_name) for model in running):
+            return False
+        if not size_bytes or (not self.budget_bytes and free_bytes is None):
+            return False  # No way to tell whether it fits
+        if self.budget_bytes and sum(model.size for model in running) + size_bytes > self.budget_bytes:
+            return False
+        if free_bytes is not None and size_bytes > free_bytes:
+            return False
+        # A fresh prefetch must not be the first model enforce() unloads
+        self.touch(model_name)
+        self.load(model_name, keep_alive=-1 if model_name in self.pinned else None)
+        return True
+
+    def enforce(self, in_use=()):
+        """Load missing pinned models, then unload idle unpinned ones until within the budget.
+        
+        Models in in_use (e.g. the selected one) are never unloaded. Returns (loaded, unloaded).
+        """
+        loaded, unloaded = [], []
+        with self.lock:
+            running = self.running_models.get(max_age=0)
+            for model_name in sorted(self.pinned):
+                if not any(model.matches(model_name) for model in running):
+                    self.load(model_name, keep_alive=-1)
+                    loaded.append(model_name)
+            if loaded:
+                running = self.running_models.get(max_age=0)
+            
+            if self.budget_bytes:
+                total = sum(model.size for model in running)
+                protected = self.pinned | set(in_use)
+                idle = sorted((model for model in running
+                               if not any(model.matches(name) for name in protected)),
+                              key=lambda model: self.last_used.get(model.name, 0))
+                for model in idle:
+                    if total <= self.budget_bytes:
+                        break
+                    self.unload(model.name)
+                    unloaded.append(model.name)
+                    total -= model.size
+        return loaded, unloaded
+
+
+class ModelLoadTracker:
+    """Loads models in the background and reports each as queued, loading, ready, failed, cancelled or unloaded.
+
+    A model is ready when the server answers its empty /api/generate load request,
+    so nothing has to poll for it; every state change is reported exactly once
+    through on_change(model_name, state, detail), called from the calling or a worker thread.
+    Each load runs on its own thread, so a new choice never waits behind an abandoned load.
+    """
+
+    QUEUED = "queued"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    UNLOADED = "unloaded"
+
+    def __init__(self, load, on_change):
+        self.load = load            # load(model_name) returns once the model is in memory, raises on failure
+        self.on_change = on_change
+        self.states = {}            # model -> its latest state
+        self.requests = {}          # model -> id of the load request whose result still counts
+        self.next_request = 0
+        self.lock = threading.Lock()
+
+    def state(self, model_name):
+        """Return the model's latest state, or None if no load was requested for it."""
+        return self.states.get(model_name)
+
+    def is_ready(self, model_name):
+        """Whether the last load request for the model completed and it has not been unloaded since."""
+        return self.states.get(model_name) == self.READY
+
+    def request(self, model_name):
+        """Start loading the model unless a load is already pending. Returns True if started."""
+        with self.lock:
+            if self.states.get(model_name) in (self.QUEUED, self.LOADING):
+                return False
+            self.next_request += 1
+            request_id = self.requests[model_name] = self.next_request
+        self.publish(model_name, self.QUEUED, '', request_id=request_id)
+        threading.Thread(target=self.run, args=(model_name, request_id), daemon=True).start()
+        return True
+
+    def cancel(self, model_name):
+        """Abandon a pending load (e.g. the user picked another model).
+        
+        A load already sent to the server can't be aborted; its result is ignored.
+        """
+        self.publish(model_name, self.CANCELLED, '', only_from=(self.QUEUED, self.LOADING))
+
+    def unloaded(self, model_name, reason=''):
+        """Record that a ready model is no longer in server memory (keep_alive expiry, eviction)."""
+        self.publish(model_name, self.UNLOADED, reason, only_from=(self.READY,))
+
+    def reset(self, reason=''):
+        """Forget every load, e.g. when the server stopped or the GUI switched to another server."""
+        for model_name, state in list(self.states.items()):
+            if state in (self.QUEUED, self.LOADING):
+                self.cancel(model_name)
+            else:
+                self.unloaded(model_name, reason)
+
+    def publish(self, model_name, state, detail, request_id=None, only_from=None):
+        """Record and report a state change.
+        
+        Results of superseded or abandoned requests (request_id) and changes from any
+        state not in only_from are dropped, so each transition is reported once.
+        """
+        with self.lock:
+            current = self.states.get(model_name)
+            if request_id is not None and self.requests.get(model_name) != request_id:
+                return
+            if only_from is not None and current not in only_from:
+                return
+            if current == state:
+                return
+            self.states[model_name] = state
+            if state in (self.CANCELLED, self.UNLOADED):
+                self.requests.pop(model_name, None)
+        self.on_change(model_name, state, detail)
+
+    def run(self, model_name, request_id):
+        """Worker: load one model and report the outcome unless the request was abandoned meanwhile."""
+        with self.lock:
+            if self.requests.get(model_name) != request_id:
+                return  # Cancelled before it started
+        self.publish(model_name, self.LOADING, '', request_id=request_id)
+        try:
+            self.load(model_name)
+            state, detail = self.READY, ''
+        except Exception as e:
+            state, detail = self.FAILED, str(e)
+        self.publish(model_name, state, detail, request_id=request_id)
+
+
+class StartupTasks:
+    """Startup steps run on a thread pool, each as soon as the steps it depends on have finished.
+
+    A step is called with the results of its dependencies as keyword arguments.
+    Steps wait for their dependencies inside the pool, so it needs a worker per step.
+    """
+
+    def __init__(self, started, max_workers=6):
+        self.started = started    # time.perf_counter() at launch; timings are relative to it
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self.futures = {}
+        self.timings = {}         # step -> (start, end) in ms since launch
+        self.finished_ms = None   # When the last step finished
+
+    def elapsed_ms(self):
+        """Milliseconds since launch."""
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, name):
+        """Record a step that ran on the calling thread from launch until now."""
+        self.timings[name] = (0.0, self.elapsed_ms())
+
+    def add(self, name, func, after=()):
+        """Schedule func(**{dependency: result}) to run once the named steps have finished."""
+        dependencies = {dependency: self.futures[dependency] for dependency in after}
+        
+        def run():
+            kwargs = {dependency: future.result() for dependency, future in dependencies.items()}
+            start = self.elapsed_ms()
+            try:
+                return func(**kwargs)
+            finally:
+                self.timings[name] = (start, self.elapsed_ms())
+        
+        self.futures[name] = self.executor.submit(run)
+
+    def result(self, name):
+        """Return a finished step's result, or None if it failed or was not scheduled."""
+        future = self.futures.get(name)
+        try:
+            return future.result() if future is not None else None
+        except Exception:
+            return None
+
+    def finish(self, callback):
+        """Call callback() on a pool thread once every step has finished, then release the pool."""
+        futures = list(self.futures.values())
+        
+        def run():
+            wait(futures)
+            self.finished_ms = self.elapsed_ms()
+            callback()
+        
+        self.executor.submit(run)
+        self.executor.shutdown(wait=False)
+
+    def timing_summary(self):
+        """One log line with each step's start and end, e.g. "probe 180-183 ms"."""
+        steps = sorted(self.timings.items(), key=lambda item: item[1])
+        breakdown = ", ".join(f"{name} {start:.0f}-{end:.0f} ms" for name, (start, end) in steps)
+        finished_ms = self.finished_ms if self.finished_ms is not None else self.elapsed_ms()
+        return f"⏱️ Startup: {breakdown}; ready after {finished_ms:.0f} ms"
+
+
+class OllamaBackend:
+    """One Ollama server in the backend pool and its routing statistics."""
+
+    def __init__(self, client):
+        self.client = client
+        self.in_flight = 0          # Requests currently streaming from this backend
+        self.ttft_ms = None         # Smoothed time to first token
+        self.healthy = True         # Assume healthy until a probe says otherwise
+        self.models = None          # Installed model names, None until first health check
+        self.models_fetched_at = 0.0  # time.monotonic() of the last model list refresh
+
+    @property
+    def name(self):
+        """Short host:port label for the UI."""
+        return urlparse(self.client.base_url).netloc
+
+    def has_model(self, model):
+        """Return True if the backend has the model (or its model list is not known yet)."""
+        return self.models is None or model in self.models
+
+
+class BackendPool:
+    """Routes chat and translation requests to the least-loaded healthy Ollama backend.
+
+    The primary backend is the shared OllamaClient used for everything else
+    (model management, status checks); extra backends only serve inference.
+    """
+
+    TTFT_SMOOTHING = 0.3  # Weight of the newest sample in the time-to-first-token average
+    MODELS_REFRESH_INTERVAL = 30.0  # Seconds between model list refreshes of a healthy backend
+
+    def __init__(self, primary_client):
+        self.lock = threading.Lock()
+        self.backends = [OllamaBackend(primary_client)]
+
+    def set_extra_urls(self, urls):
+        """Replace the extra backends, keeping stats for URLs that stay in the pool."""
+        primary = self.backends[0]
+        with self.lock:
+            existing = {backend.client.base_url: backend for backend in self.backends[1:]}
+            backends = [primary]
+            for url in urls:
+                try:
+                    url = normalize_ollama_host(url)
+                except ValueError as e:
+                    print(f"Skipping invalid backend URL: {e}")
+                    continue
+                if url == primary.client.base_url or any(b.client.base_url == url for b in backends):
+                    continue
+                if url in existing:
+                    backends.append(existing[url])
+                else:
+                    primary_client = primary.client
+                    backends.append(OllamaBackend(OllamaClient(url, pool_size=primary_client.pool_size,
+                                                               retries=primary_client.retries,
+                                                               timeouts=primary_client.timeouts)))
+            self.backends = backends
+
+    def extra_urls(self):
+        """Return the URLs of the non-primary backends."""
+        return [backend.client.base_url for backend in self.backends[1:]]
+
+    def check_health(self, primary_healthy=None):
+        """Probe every backend and refresh the list of models it can serve when it is due.
+        
+        primary_healthy is the result of a probe of the primary the caller has just made,
+        so the primary isn't probed twice.
+        """
+        now = time.monotonic()
+        for backend in list(self.backends):
+            try:
+                if backend is self.backends[0] and primary_healthy is not None:
+                    healthy = primary_healthy
+                else:
+                    backend.client.probe()
+                    healthy = True
+                # A backend that was down may have gained or lost models meanwhile
+                if healthy and (not backend.healthy or now - backend.models_fetched_at >= self.MODELS_REFRESH_INTERVAL):
+                    backend.models = {model.get('name') or model.get('model')
+                                      for model in backend.client.list_models()}
+                    backend.models_fetched_at = now
+            except (requests.exceptions.RequestException, ValueError):
+                backend.client.last_probe_latency_ms = None
+                healthy = False
+            backend.healthy = healthy
+
+    def set_primary_models(self, models):
+        """Use a freshly fetched model list of the primary (e.g. after a download) for routing."""
+        primary = self.backends[0]
+        primary.models = set(models)
+        primary.models_fetched_at = time.monotonic()
+
+    def acquire(self, model, exclude=()):
+        """Pick the least-loaded healthy backend that has the model and reserve a slot on it."""
+        with self.lock:
+            candidates = [b for b in self.backends
+                          if b.healthy and b.has_model(model) and b not in exclude]
+            if not candidates:
+                # Nothing qualifies - fall back to any backend not already tried so the
+                # request still runs and the server reports a real error
+                candidates = [b for b in self.backends if b not in exclude]
+            if not candidates:
+                return None
+            # Fewest in-flight requests first, then the fastest recent first token
+            backend = min(candidates, key=lambda b: (b.in_flight, b.ttft_ms if b.ttft_ms is not None else 0))
+            backend.in_flight += 1
+            return backend
+
+    def release(self, backend, ttft_ms=None):
+        """Free the slot taken by acquire() and fold in the measured time to first token."""
+        with self.lock:
+            backend.in_flight = max(0, backend.in_flight - 1)
+            if ttft_ms is not None:
+                if backend.ttft_ms is None:
+                    backend.ttft_ms = ttft_ms
+                else:
+                    backend.ttft_ms += self.TTFT_SMOOTHING * (ttft_ms - backend.ttft_ms)
+
+    def open_stream(self, endpoint, payload, timeout):
+        """Start a streaming request on the best backend, failing over on connection errors.
+
+        Returns (backend, response); the caller must release() the backend.
+        """
+        tried = []
+        while True:
+            backend = self.acquire(payload.get('model'), exclude=tried)
+            if backend is None:
+                raise requests.exceptions.ConnectionError("No Ollama backend is reachable")
+            try:
+                response = backend.client.post(endpoint, payload, stream=True, timeout=timeout)
+                return backend, response
+            except requests.exceptions.ConnectionError:
+                # Backend stopped answering - take it out of rotation until the next health check
+                backend.healthy = False
+                self.release(backend)
+                tried.append(backend)
+
+    def stats_lines(self):
+        """Return one status line per backend for the left panel."""
+        lines = []
+        for backend in list(self.backends):
+            if not backend.healthy:
+                lines.append(f"✕ {backend.name}: unreachable")
+                continue
+            ttft = f"{backend.ttft_ms:.0f} ms" if backend.ttft_ms is not None else "--"
+            lines.append(f"● {backend.name}: {backend.in_flight} active, TTFT {ttft}")
+        return lines
+
+
+class ThinkTagFilter:
+    """Incremental splitter for <think>...</think> blocks in a streamed response.
+
+    Each chunk is scanned once; only an incomplete tag at the end of a chunk
+    (at most a few characters) is carried over to the next one, so the cost per
+    chunk is O(len(chunk)) no matter how long the response gets.
+    """
+
+    OPEN_TAG = '<think>'
+    CLOSE_TAG = '</think>'
+
+    def __init__(self):
+        self.in_think = False  # True while inside a <think> block
+        self.tail = ''         # Possible start of a tag split across chunks
+        self.answer_parts = [] # Everything outside think blocks, for the final transcript
+
+    def feed(self, chunk):
+        """Consume a chunk; returns (answer_text, thinking_text) that is now safe to show."""
+        text = self.tail + chunk
+        self.tail = ''
+        answer, thinking = [], []
+        pos = 0
+        while pos < len(text):
+            tag_start = text.find('<', pos)
+            if tag_start == -1:
+                tag_start = len(text)
+            # Text up to the next '<' belongs to whichever section we are in
+            if tag_start > pos:
+                (thinking if self.in_think else answer).append(text[pos:tag_start])
+            if tag_start == len(text):
+                break
+            
+            remainder = text[tag_start:tag_start + len(self.CLOSE_TAG)]
+            if remainder.startswith(self.OPEN_TAG):
+                self.in_think = True
+                pos = tag_start + len(self.OPEN_TAG)
+            elif remainder.startswith(self.CLOSE_TAG):
+                # A stray closing tag outside a block is dropped as well
+                self.in_think = False
+                pos = tag_start + len(self.CLOSE_TAG)
+            elif tag_start + len(remainder) == len(text) and (
+                    self.OPEN_TAG.startswith(remainder) or self.CLOSE_TAG.startswith(remainder)):
+                # Chunk ends in the middle of what may be a tag - wait for more text
+                self.tail = remainder
+                break
+            else:
+                (thinking if self.in_think else answer).append('<')
+                pos = tag_start + 1
+        
+        answer_text = ''.join(answer)
+        if answer_text:
+            self.answer_parts.append(answer_text)
+        return answer_text, ''.join(thinking)
+
+    def flush(self):
+        """Release a held-back partial tag at the end of the stream."""
+        text, self.tail = self.tail, ''
+        if not text:
+            return '', ''
+        if self.in_think:
+            return '', text
+        self.answer_parts.append(text)
+        return text, ''
+
+    def answer_text(self):
+        """Return the full response with all think blocks removed."""
+        return ''.join(self.answer_parts)
+
+
+class MarkdownStreamRenderer:
+    """Formats a streamed reply in a Text widget one completed markdown block at a time.
+
+    Raw text is appended as it arrives. As soon as a block is complete (a line
+    ending outside a ``` fence, or the closing fence of a code block) only that
+    block is replaced by its formatted version; earlier blocks are never touched
+    again, so there is no whole-reply rewrite at the end.
+    """
+
+    BLOCK_MARK = "md_block_start"
+
+    def __init__(self, widget, insert_formatted):
+        self.widget = widget
+        self.insert_formatted = insert_formatted  # (index, text) -> number of characters inserted
+        self.reset()
+
+    def reset(self):
+        """Forget any pending text (the widget content is left as is)."""
+        self.pending = ''      # Raw text of the block being streamed
+        self.scan_pos = 0      # Start of the first line in pending not scanned yet
+        self.in_fence = False  # True while inside a ``` code block
+        self.block_end = 0     # End of the last completed block in pending
+
+    def start(self):
+        """Begin a new reply at the current end of the widget."""
+        self.reset()
+        self.widget.mark_set(self.BLOCK_MARK, "end-1c")
+        self.widget.mark_gravity(self.BLOCK_MARK, tk.LEFT)
+
+    def feed(self, text):
+        """Append streamed text and format any block it completes (widget must be editable)."""
+        self.widget.insert(tk.END, text)
+        self.pending += text
+        
+        # Only the lines completed by this chunk are scanned
+        while True:
+            newline = self.pending.find('\n', self.scan_pos)
+            if newline == -1:
+                break
+            if self.pending[self.scan_pos:newline].lstrip().startswith('```'):
+                self.in_fence = not self.in_fence
+            self.scan_pos = newline + 1
+            if not self.in_fence:
+                self.block_end = self.scan_pos
+        
+        if self.block_end:
+            self.render(self.block_end)
+
+    def finish(self):
+        """Format whatever is still pending at the end of the reply."""
+        if self.pending:
+            self.render(len(self.pending))
+        self.reset()
+        if self.BLOCK_MARK in self.widget.mark_names():
+            self.widget.mark_unset(self.BLOCK_MARK)
+
+    def render(self, length):
+        """Replace the first length raw characters after the block mark with formatted text."""
+        block = self.pending[:length]
+        self.widget.delete(self.BLOCK_MARK, f"{self.BLOCK_MARK} + {len(block)} chars")
+        inserted = self.insert_formatted(self.BLOCK_MARK, block)
+        self.widget.mark_set(self.BLOCK_MARK, f"{self.BLOCK_MARK} + {inserted} chars")
+        
+        self.pending = self.pending[length:]
+        self.scan_pos -= length
+        self.block_end = 0
+
+
+class StreamRenderer:
+    """Batches streamed text from worker threads into one UI update per frame.
+
+    Worker threads push text chunks and callbacks onto a thread-safe queue; the
+    Tk main loop drains it on a fixed tick and hands each sink one coalesced
+    string per frame instead of one event per token. Everything is tagged with
+    the generation it belongs to, and items of a stopped or finished generation
+    are dropped, so a late worker can never write into the next reply.
+    """
+
+    MIN_FPS = 1
+    MAX_FPS = 120
+
+    def __init__(self, root, fps=30):
+        self.root = root
+        self.queue = queue.Queue()
+        self.next_generation = 0
+        self.active_generation = None  # Id of the reply being streamed, None when idle
+        self.set_fps(fps)
+        self.root.after(self.interval_ms, self.tick)
+
+    def set_fps(self, fps):
+        """Change the UI refresh rate for streamed text."""
+        self.fps = max(self.MIN_FPS, min(self.MAX_FPS, int(fps)))
+        self.interval_ms = max(1, int(1000 / self.fps))
+
+    def begin(self):
+        """Start streaming a new reply, dropping anything still queued. Returns its generation id."""
+        self.clear()
+        self.next_generation += 1
+        self.active_generation = self.next_generation
+        return self.active_generation
+
+    def end(self, generation):
+        """Close a generation, dropping its queued items.
+        
+        Returns False if it already ended or was superseded, so callers finalize each reply once.
+        """
+        if generation is None or generation != self.active_generation:
+            return False
+        self.active_generation = None
+        self.clear()
+        return True
+
+    def is_active(self, generation):
+        """Whether generation is still the reply being streamed (safe to call from any thread)."""
+        return generation == self.active_generation
+
+    def push(self, sink, text, generation):
+        """Queue text for sink(text) on the next frame (safe to call from any thread)."""
+        if text and self.is_active(generation):
+            self.queue.put((generation, sink, text))
+
+    def call(self, callback, generation):
+        """Queue callback() to run after all text pushed before it has been rendered."""
+        if self.is_active(generation):
+            self.queue.put((generation, callback, None))
+
+    def clear(self):
+        """Drop everything still queued."""
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def tick(self):
+        """Drain the queue, merging consecutive chunks for the same sink into one update."""
+        try:
+            pending_sink = None
+            pending_text = []
+            while True:
+                try:
+                    generation, target, text = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if not self.is_active(generation):
+                    continue  # Queued before its reply was stopped or finalized
+                if text is not None and target == pending_sink:
+                    pending_text.append(text)
+                    continue
+                if pending_sink is not None:
+                    pending_sink("".join(pending_text))
+                    pending_sink, pending_text = None, []
+                if text is None:
+                    target()
+                else:
+                    pending_sink, pending_text = target, [text]
+            if pending_sink is not None:
+                pending_sink("".join(pending_text))
+        except Exception as e:
+            print(f"Error rendering streamed text: {e}")
+        finally:
+            self.root.after(self.interval_ms, self.tick)
+
+
+def read_proc_status(pid):
+    """Return the fields of /proc/<pid>/status as a dict, or None if the process is gone."""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            return dict(line.rstrip('\n').split(':\t', 1) for line in f if ':\t' in line)
+    except (OSError, ValueError):
+        return None
+
+
+def find_ollama_server_pid():
+    """Find the pid of a running 'ollama serve' by scanning /proc (Linux only)."""
+    try:
+        pids = [entry for entry in os.listdir('/proc') if entry.isdigit()]
+    except OSError:
+        return None
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                argv = f.read().split(b'\0')
+        except OSError:
+            continue
+        if argv and os.path.basename(argv[0]).startswith(b'ollama') and b'serve' in argv[1:]:
+            return int(pid)
+    return None
+
+
+@dataclass(frozen=True)
+class GpuSample:
+    """GPU utilization and memory as reported by a GPU backend."""
+
+    name: str
+    utilization: int = 0      # Percent busy
+    memory_used: int = 0      # Bytes
+    memory_total: int = 0     # Bytes
+
+
+class NvidiaSmiGpuBackend:
+    """GPU backend using nvidia-smi (one short subprocess per sample, so sampled slowly)."""
+
+    name = "nvidia-smi"
+
+    @staticmethod
+    def available():
+        """Whether nvidia-smi is on the PATH."""
+        return shutil.which('nvidia-smi') is not None
+
+    def sample(self):
+        """Return a GpuSample for the first GPU, or None if nvidia-smi fails."""
+        result = subprocess.run(
+            ["nvidia-smi", "--query-gpu=utilization.gpu,memory.used,memory.total",
+             "--format=csv,noheader,nounits"],
+            capture_output=True, text=True, timeout=3
+        )
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        # First GPU only, values in percent and MiB
+        utilization, used_mb, total_mb = (int(value) for value in result.stdout.strip().split('\n')[0].split(','))
+        return GpuSample("NVIDIA", utilization, used_mb * 1024 ** 2, total_mb * 1024 ** 2)
+
+
+class AmdSysfsGpuBackend:
+    """GPU backend reading the amdgpu driver's sysfs counters (no subprocess)."""
+
+    name = "amdgpu sysfs"
+    DEVICE_GLOB = '/sys/class/drm/card*/device'
+
+    def __init__(self):
+        self.device = next((path for path in sorted(glob.glob(self.DEVICE_GLOB))
+                            if os.path.exists(os.path.join(path, 'gpu_busy_percent'))), None)
+
+    @classmethod
+    def available(cls):
+        """Whether an amdgpu device exposes its busy counter."""
+        return cls().device is not None
+
+    def _read_int(self, filename):
+        """Read one integer sysfs attribute of the device."""
+        with open(os.path.join(self.device, filename), 'r') as f:
+            return int(f.read().strip())
+
+    def sample(self):
+        """Return a GpuSample from the driver counters."""
+        return GpuSample("AMD", self._read_int('gpu_busy_percent'),
+                         self._read_int('mem_info_vram_used'), self._read_int('mem_info_vram_total'))
+
+
+# Tried in order by SystemSampler; append a class with available() and sample() to support another GPU
+GPU_BACKENDS = [AmdSysfsGpuBackend, NvidiaSmiGpuBackend]
+
+
+@dataclass(frozen=True)
+class SystemSample:
+    """One reading of host load; None means the value is not available on this platform."""
+
+    cpu_percent: float = None
+    memory_used: int = None     # Bytes (MemTotal - MemAvailable)
+    memory_total: int = None    # Bytes
+    server_rss: int = None      # Bytes resident for the Ollama server process
+    gpu: GpuSample = None
+
+
+class SystemSampler:
+    """Host CPU/memory sampler reading /proc directly, with an optional slower GPU backend."""
+
+    def __init__(self, gpu_backend=None, gpu_interval=15.0):
+        self.gpu_backend = gpu_backend if gpu_backend is not None else self.detect_gpu_backend()
+        self.gpu_interval = gpu_interval
+        self.last_gpu_sample = None
+        self.last_gpu_time = 0.0
+        self.last_cpu_times = None
+
+    @staticmethod
+    def detect_gpu_backend():
+        """Return the first available backend from GPU_BACKENDS, or None."""
+        for backend_class in GPU_BACKENDS:
+            try:
+                if backend_class.available():
+                    return backend_class()
+            except Exception:
+                continue
+        return None
+
+    def cpu_percent(self):
+        """Whole-system CPU busy percent since the previous call, from /proc/stat."""
+        try:
+            with open('/proc/stat', 'r') as f:
+                fields = [int(value) for value in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)  # idle + iowait
+        total = sum(fields[:8])  # guest time is already included in user/nice
+        previous, self.last_cpu_times = self.last_cpu_times, (idle, total)
+        if previous is None or total == previous[1]:
+            return None  # The first call only sets the baseline
+        return 100.0 * (1 - (idle - previous[0]) / (total - previous[1]))
+
+    @staticmethod
+    def memory():
+        """Return (used, total) system memory in bytes from /proc/meminfo."""
+        try:
+            meminfo = {}
+            with open('/proc/meminfo', 'r') as f:
+                for line in f:
+                    key, value = line.split(':', 1)
+                    meminfo[key] = int(value.split()[0]) * 1024
+            return meminfo['MemTotal'] - meminfo['MemAvailable'], meminfo['MemTotal']
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    @staticmethod
+    def process_rss(pid):
+        """Resident memory of a process in bytes, from VmRSS in /proc/<pid>/status."""
+        status = read_proc_status(pid) if pid else None
+        if not status or 'VmRSS' not in status:
+            return None
+        return int(status['VmRSS'].split()[0]) * 1024
+
+    def gpu(self):
+        """Latest GPU reading, refreshed at most once per gpu_interval seconds."""
+        if self.gpu_backend is None:
+            return None
+        if time.monotonic() - self.last_gpu_time >= self.gpu_interval:
+            self.last_gpu_time = time.monotonic()
+            try:
+                self.last_gpu_sample = self.gpu_backend.sample()
+            except Exception:
+                self.last_gpu_sample = None
+        return self.last_gpu_sample
+
+    def sample(self, server_pid=None):
+        """Take one SystemSample; server_pid is the Ollama server process, if known."""
+        memory_used, memory_total = self.memory()
+        return SystemSample(self.cpu_percent(), memory_used, memory_total,
+                            self.process_rss(server_pid), self.gpu())
+
+
+class RingBuffer:
+    """Fixed-size numeric history backed by an array; the oldest value is overwritten when full."""
+
+    def __init__(self, capacity, typecode='d'):
+        self.data = array(typecode, [0] * capacity)
+        self.capacity = capacity
+        self.count = 0
+        self.next_index = 0
+
+    def append(self, value):
+        """Record a value, replacing the oldest one once the buffer is full."""
+        self.data[self.next_index] = value
+        self.next_index = (self.next_index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def values(self):
+        """Return the recorded values, oldest first."""
+        if self.count < self.capacity:
+            return self.data[:self.count].tolist()
+        return (self.data[self.next_index:] + self.data[:self.next_index]).tolist()
+
+    def latest(self):
+        """Return the most recent value, or None if nothing was recorded yet."""
+        return self.data[self.next_index - 1] if self.count else None
+
+    def __len__(self):
+        return self.count
+
+
+def cached_prompt_tokens(prompt_eval_count, prompt_tokens, cacheable_tokens):
+    """Estimate how many tokens of a sent prompt the server took from its KV cache.
+    
+    prompt_tokens is the local count of the prompt sent and cacheable_tokens the part of it
+    before the newest message (the only part a cache can hold); both are estimates unless
+    the model's tokenizer is loaded. The server reports no cache hits, only prompt_eval_count,
+    so a count closer to the newest message than to the whole prompt is taken as a hit and
+    anything else as a full evaluation. The result never exceeds cacheable_tokens.
+    """
+    if not prompt_eval_count or not cacheable_tokens:
+        return 0
+    new_tokens = prompt_tokens - cacheable_tokens
+    if prompt_eval_count >= new_tokens + cacheable_tokens / 2:
+        return 0
+    return min(cacheable_tokens, max(prompt_tokens - prompt_eval_count, 0))
+
+
+class MetricsStore:
+    """Per-request performance history kept in fixed-size ring buffers (safe to use from any thread)."""
+
+    SERIES = ('tokens_per_sec', 'ttft_ms', 'prompt_eval_ms', 'prompt_eval_saved_ms', 'total_ms', 'server_memory')
+
+    def __init__(self, capacity=100):
+        self.buffers = {name: RingBuffer(capacity) for name in self.SERIES}
+        self.lock = threading.Lock()
+
+    def record_request(self, final_chunk, ttft_ms=None, server_memory=None, prompt_tokens=None, cacheable_tokens=0):
+        """Record one finished request from the timing fields of its final ("done") stream chunk.
+        
+        Server durations are in nanoseconds; values the server didn't report are skipped.
+        prompt_tokens is the size of the prompt sent and cacheable_tokens its part before the
+        newest message; the tokens cached_prompt_tokens() attributes to the KV cache are
+        valued at this request's eval rate.
+        """
+        values = {'ttft_ms': ttft_ms, 'server_memory': server_memory}
+        eval_count = final_chunk.get('eval_count') or 0
+        eval_duration = final_chunk.get('eval_duration') or 0
+        if eval_count and eval_duration:
+            values['tokens_per_sec'] = eval_count / (eval_duration / 1e9)
+        if final_chunk.get('prompt_eval_duration'):
+            values['prompt_eval_ms'] = final_chunk['prompt_eval_duration'] / 1e6
+            prompt_eval_count = final_chunk.get('prompt_eval_count') or 0
+            if prompt_tokens is not None and prompt_eval_count:
+                cached_tokens = cached_prompt_tokens(prompt_eval_count, prompt_tokens, cacheable_tokens)
+                values['prompt_eval_saved_ms'] = cached_tokens * values['prompt_eval_ms'] / prompt_eval_count
+        if final_chunk.get('total_duration'):
+            values['total_ms'] = final_chunk['total_duration'] / 1e6
+        
+        with self.lock:
+            for name, value in values.items():
+                if value is not None:
+                    self.buffers[name].append(value)
+
+    def values(self, name):
+        """Return the history of one series, oldest first."""
+        with self.lock:
+            return self.buffers[name].values()
+
+    def latest(self, name):
+        """Return the newest value of one series, or None."""
+        with self.lock:
+            return self.buffers[name].latest()
+
+
+@dataclass(frozen=True)
+class ProcessSample:
+    """Resource use of one process in the Ollama server tree."""
+
+    pid: int
+    name: str
+    cpu_percent: float = 0.0   # Of one core, so a busy runner can exceed 100
+    rss: int = 0               # Bytes
+    threads: int = 0
+    fds: int = 0               # Open file descriptors (0 if not readable)
+
+
+class ProcessTreeMonitor:
+    """Per-process CPU, RSS, thread and fd accounting for a process and its descendants via /proc."""
+
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+    MIN_CPU_WINDOW = 0.1  # Shorter windows are dominated by the tick granularity
+
+    def __init__(self, history_size=60):
+        self.last_cpu_ticks = {}  # pid -> (utime + stime, monotonic time)
+        self.cpu_history = RingBuffer(history_size)   # Whole tree, percent of one core
+        self.rss_history = RingBuffer(history_size)   # Whole tree, bytes
+        self.last_samples = []
+
+    @staticmethod
+    def children_by_parent():
+        """Map each pid to its child pids from the ppid field of /proc/<pid>/stat."""
+        children = {}
+        try:
+            pids = [entry for entry in os.listdir('/proc') if entry.isdigit()]
+        except OSError:
+            return children
+        for pid in pids:
+            try:
+                with open(f'/proc/{pid}/stat', 'r') as f:
+                    # The command name may contain spaces, so split after its closing parenthesis
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, ValueError, IndexError):
+                continue
+            children.setdefault(ppid, []).append(int(pid))
+        return children
+
+    def tree_pids(self, root_pid):
+        """Return root_pid followed by all of its descendants."""
+        children = self.children_by_parent()
+        pids, pending = [], [root_pid]
+        while pending:
+            pid = pending.pop(0)
+            pids.append(pid)
+            pending.extend(children.get(pid, []))
+        return pids
+
+    def sample_process(self, pid, now):
+        """Return a ProcessSample for one pid, or None if it exited."""
+        status = read_proc_status(pid)
+        try:
+            with open(f'/proc/{pid}/stat', 'r') as f:
+                stat_fields = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            return None
+        if status is None:
+            return None
+        
+        # utime and stime are fields 14 and 15 of /proc/<pid>/stat (12 and 13 after the name)
+        cpu_ticks = int(stat_fields[11]) + int(stat_fields[12])
+        previous = self.last_cpu_ticks.get(pid)
+        cpu_percent = 0.0
+        if previous is None or now - previous[1] >= self.MIN_CPU_WINDOW:
+            self.last_cpu_ticks[pid] = (cpu_ticks, now)
+            if previous is not None:
+                cpu_percent = 100.0 * (cpu_ticks - previous[0]) / self.CLOCK_TICKS / (now - previous[1])
+        
+        try:
+            fds = len(os.listdir(f'/proc/{pid}/fd'))
+        except OSError:
+            fds = 0  # Not our process (e.g. a system service)
+        
+        rss = int(status['VmRSS'].split()[0]) * 1024 if 'VmRSS' in status else 0
+        return ProcessSample(pid, status.get('Name', '?'), cpu_percent, rss,
+                             int(status.get('Threads', 0)), fds)
+
+    def sample(self, root_pid):
+        """Sample the whole tree under root_pid and record its totals in the history buffers."""
+        now = time.monotonic()
+        samples = [sample for sample in (self.sample_process(pid, now) for pid in self.tree_pids(root_pid))
+                   if sample is not None]
+        # Forget exited processes so a reused pid doesn't inherit their CPU counters
+        live_pids = {sample.pid for sample in samples}
+        self.last_cpu_ticks = {pid: ticks for pid, ticks in self.last_cpu_ticks.items() if pid in live_pids}
+        
+        self.cpu_history.append(sum(sample.cpu_percent for sample in samples))
+        self.rss_history.append(sum(sample.rss for sample in samples))
+        self.last_samples = samples
+        return samples
+
+
+# GGUF metadata value types (https://github.com/ggml-org/ggml/blob/master/docs/gguf.md)
+_GGUF_SCALAR_FORMATS = {0: '<B', 1: '<b', 2: '<H', 3: '<h', 4: '<I', 5: '<i', 6: '<f', 7: '<?',
+                        10: '<Q', 11: '<q', 12: '<d'}
+_GGUF_STRING, _GGUF_ARRAY = 8, 9
+_GGUF_TOKENIZER_KEYS = ('tokenizer.ggml.model', 'tokenizer.ggml.pre', 'tokenizer.ggml.tokens',
+                        'tokenizer.ggml.merges', 'tokenizer.ggml.scores')
+
+# Split regexes of the byte-level BPE pre-tokenizers named by tokenizer.ggml.pre
+# (same patterns as the models' tokenizer.json). None means GPT-2's built-in split.
+GGUF_PRE_TOKENIZER_PATTERNS = {
+    'default': None,
+    'gpt-2': None,
+    'llama-bpe': (r"(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}{1,3}"
+                  r"| ?[^\s\p{L}\p{N}]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"),
+    'qwen2': (r"(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}"
+              r"| ?[^\s\p{L}\p{N}]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"),
+}
+
+
+def read_gguf_tokenizer(path):
+    """Read the tokenizer.ggml.* metadata (model type, pre-tokenizer, tokens, merges, scores) from a GGUF file."""
+    def read_string(f):
+        length, = struct.unpack('<Q', f.read(8))
+        return f.read(length).decode('utf-8', errors='replace')
+    
+    def read_value(f, value_type, keep):
+        if value_type == _GGUF_STRING:
+            return read_string(f) if keep else f.seek(struct.unpack('<Q', f.read(8))[0], 1)
+        if value_type == _GGUF_ARRAY:
+            item_type, count = struct.unpack('<IQ', f.read(12))
+            if item_type in _GGUF_SCALAR_FORMATS:
+                # Fixed-size items are read (or skipped) in one go
+                item_format = _GGUF_SCALAR_FORMATS[item_type][1]
+                size = struct.calcsize(f'<{item_format}') * count
+                return struct.unpack(f'<{count}{item_format}', f.read(size)) if keep else f.seek(size, 1)
+            return [read_value(f, item_type, keep) for _ in range(count)]
+        scalar_format = _GGUF_SCALAR_FORMATS[value_type]
+        return struct.unpack(scalar_format, f.read(struct.calcsize(scalar_format)))[0]
+    
+    metadata = {}
+    with open(path, 'rb') as f:
+        magic, version = struct.unpack('<4sI', f.read(8))
+        if magic != b'GGUF' or version < 2:
+            raise ValueError(f"{path} is not a GGUF v2+ file")
+        _tensor_count, kv_count = struct.unpack('<QQ', f.read(16))
+        for _ in range(kv_count):
+            key = read_string(f)
+            value_type, = struct.unpack('<I', f.read(4))
+            keep = key in _GGUF_TOKENIZER_KEYS
+            value = read_value(f, value_type, keep)
+            if keep:
+                metadata[key] = value
+                if len(metadata) == len(_GGUF_TOKENIZER_KEYS):
+                    break  # Everything needed was read; skip the rest of the header
+    return metadata
+
+
+class LocalTokenizer:
+    """Token counts from a model's own vocabulary (requires the optional 'tokenizers' package)."""
+
+    def __init__(self, tokenizer, source, exact=True):
+        self.tokenizer = tokenizer
+        self.source = source  # Where the vocabulary came from, for the logs
+        self.exact = exact    # False when the rebuilt tokenizer only approximates the model's
+
+    @staticmethod
+    def available():
+        """Whether the optional 'tokenizers' package is installed."""
+        return Tokenizer is not None
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a Hugging Face tokenizer.json."""
+        return cls(Tokenizer.from_file(path), path)
+
+    @classmethod
+    def from_gguf(cls, path):
+        """Rebuild the tokenizer from the vocabulary stored in a GGUF model file."""
+        metadata = read_gguf_tokenizer(path)
+        tokens = metadata.get('tokenizer.ggml.tokens')
+        if not tokens:
+            raise ValueError("GGUF file has no tokenizer vocabulary")
+        
+        tokenizer_model = metadata.get('tokenizer.ggml.model')
+        if tokenizer_model == 'gpt2':
+            # Byte-level BPE (Llama 3, Qwen, Mistral Nemo, ...)
+            vocab = {token: index for index, token in enumerate(tokens)}
+            merges = [tuple(merge.split(' ', 1)) for merge in metadata.get('tokenizer.ggml.merges', [])]
+            tokenizer = Tokenizer(tokenizer_models.BPE(vocab, merges))
+            
+            # The text is split by the model's own pre-tokenizer regex before merging; for
+            # one we don't know, GPT-2's split is used and the counts are marked as estimates
+            pre = metadata.get('tokenizer.ggml.pre', 'default')
+            pattern = GGUF_PRE_TOKENIZER_PATTERNS.get(pre)
+            if pattern is None:
+                tokenizer.pre_tokenizer = tokenizer_pre_tokenizers.ByteLevel(add_prefix_space=False)
+            else:
+                tokenizer.pre_tokenizer = tokenizer_pre_tokenizers.Sequence([
+                    tokenizer_pre_tokenizers.Split(TokenizerRegex(pattern), behavior='isolated'),
+                    tokenizer_pre_tokenizers.ByteLevel(add_prefix_space=False, use_regex=False),
+                ])
+            return cls(tokenizer, path, exact=pre in GGUF_PRE_TOKENIZER_PATTERNS)
+        elif tokenizer_model == 'llama':
+            # SentencePiece vocabulary with scores (Llama 2, Gemma, Mistral 7B, ...). These models
+            # merge pieces BPE-style by score, which a Unigram model over the same pieces only
+            # approximates, so the counts are marked as estimates
+            scores = metadata.get('tokenizer.ggml.scores') or [0.0] * len(tokens)
+            tokenizer = Tokenizer(tokenizer_models.Unigram(list(zip(tokens, scores))))
+            tokenizer.pre_tokenizer = tokenizer_pre_tokenizers.Metaspace()
+            return cls(tokenizer, path, exact=False)
+        else:
+            raise ValueError(f"Unsupported GGUF tokenizer type '{tokenizer_model}'")
+        return cls(tokenizer, path)
+
+    def count(self, text):
+        """Return the number of tokens in text."""
+        return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+class TokenCounter:
+    """Token counts for text, cached by content hash; estimates when no local tokenizer is loaded."""
+
+    def __init__(self, estimate, max_entries=4096):
+        self.estimate = estimate
+        self.max_entries = max_entries
+        self.tokenizer = None
+        self.cache = OrderedDict()  # sha1(text) -> token count, least recently used first
+        self.lock = threading.Lock()
+
+    @property
+    def exact(self):
+        """Whether counts come from the model's real tokenizer rather than an approximation."""
+        return self.tokenizer is not None and self.tokenizer.exact
+
+    def set_tokenizer(self, tokenizer):
+        """Switch to another model's tokenizer (None for the heuristic) and drop cached counts."""
+        with self.lock:
+            self.tokenizer = tokenizer
+            self.cache.clear()
+
+    def count(self, text):
+        """Return the token count for text, tokenizing each distinct text only once."""
+        if not text:
+            return 0
+        key = hashlib.sha1(text.encode('utf-8')).digest()
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+            tokenizer = self.tokenizer
+        
+        if tokenizer is None:
+            return self.estimate(text)  # Cheap enough that caching it gains nothing
+        count = tokenizer.count(text)
+        
+        with self.lock:
+            if tokenizer is self.tokenizer:  # Don't cache a count from a tokenizer that was just replaced
+                self.cache[key] = count
+                if len(self.cache) > self.max_entries:
+                    self.cache.popitem(last=False)
+        return count
+
 
 class OllamaGUI:
     def __init__(self, root):
+        self.startup_started = time.perf_counter()  # Startup timings are measured from here
         self.root = root
         self.root.title("Tkinter GUI for Ollama - Chat Mode")
         self.root.geometry("1400x900")
@@ -28,6 +1618,8 @@ class OllamaGUI:
         settings_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Settings", menu=settings_menu)
         settings_menu.add_command(label="Model Parameters", command=self.show_settings_dialog)
+        settings_menu.add_command(label="Server Endpoint", command=self.show_server_endpoint_dialog)
+        settings_menu.add_command(label="Additional Backends", command=self.show_backends_dialog)
         
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
@@ -73,6 +1665,40 @@ class OllamaGUI:
         # Restart button at the end of status line
         self.restart_button = ttk.Button(server_status_frame, text="Restart", command=self.restart_ollama_server)
         self.restart_button.pack(side=tk.RIGHT)
+        
+        # Health probe latency (measured on each HTTP server check)
+        self.server_latency_label = ttk.Label(server_section_frame, 
+                                            text="Probe latency: --", 
+                                            foreground="#666666", 
+                                            font=('Arial', 9))
+        self.server_latency_label.pack(anchor='w')
+        
+        # Per-backend routing stats (one line per Ollama backend in the pool)
+        self.backend_stats_label = ttk.Label(server_section_frame, 
+                                           text="", 
+                                           foreground="#666666", 
+                                           font=('Arial', 9),
+                                           justify=tk.LEFT)
+        self.backend_stats_label.pack(anchor='w')
+        
+        # Host load sampled from /proc (plus GPU when a GPU backend is available)
+        self.system_usage_label = ttk.Label(server_section_frame, 
+                                          text="", 
+                                          foreground="#666666", 
+                                          font=('Arial', 9),
+                                          justify=tk.LEFT)
+        self.system_usage_label.pack(anchor='w')
+        
+        # Ollama server process tree (per-process lines plus a CPU/RSS sparkline)
+        self.process_stats_label = ttk.Label(server_section_frame, 
+                                           text="", 
+                                           foreground="#666666", 
+                                           font=('Arial', 9),
+                                           justify=tk.LEFT)
+        self.process_stats_label.pack(anchor='w')
+        self.process_sparkline = tk.Canvas(server_section_frame, height=28, width=380, 
+                                           highlightthickness=0, background='#fafafa')
+        # Packed by update_process_stats_display once there is a local server to watch
 
         # Model Selection (in left panel)
         self.model_label = ttk.Label(left_frame, text="Select Model:")
@@ -88,7 +1714,7 @@ class OllamaGUI:
         
         # Don't bind automatic selection to dropdown - user must click Choose Model button
         # Just ensure we save the selection in case the app closes
-        self.model_dropdown.bind('<<ComboboxSelected>>', lambda e: self.save_settings())
+        self.model_dropdown.bind('<<ComboboxSelected>>', lambda e: self.on_model_dropdown_selected())
         
         buttons_frame = ttk.Frame(model_frame)
         buttons_frame.pack(fill=tk.X)
@@ -104,11 +1730,18 @@ class OllamaGUI:
         self.downloading_model = None
         
         # Add model status tracking
-        self.model_status = "Not selected"  # Possible values: "Not selected", "Loading", "Ready", "Error"
+        self.model_status = "Not selected"  # Possible values: "Not selected", "Loading", "Ready", "Unloaded", "Error"
+        self.announce_ready_model = None  # Model whose next ready state replaces the chat with the ready message
         
         self.download_button = ttk.Button(buttons_frame, text="Manage Models", command=self.start_download_action)
         self.download_button.pack(side=tk.LEFT, padx=(5, 0))
         
+        # Pin the model in the dropdown so it stays loaded (warm pool)
+        self.pin_model_var = tk.BooleanVar(value=False)
+        self.pin_model_check = ttk.Checkbutton(model_frame, text="📌 Keep this model loaded", 
+                                              variable=self.pin_model_var, command=self.toggle_model_pin)
+        self.pin_model_check.pack(anchor='w', pady=(5, 0))
+        
         # Download status label
         self.download_status_label = ttk.Label(model_frame, text="", foreground="#1976D2", font=('Arial', 9))
         self.download_status_label.pack(pady=(5, 0), anchor='w')
@@ -206,6 +1839,28 @@ class OllamaGUI:
         self.auto_detect_check.bind('<Button-1>', lambda e: self.root.after(10, self.save_settings))
         self.style_combo.bind('<<ComboboxSelected>>', lambda e: self.save_settings())
         
+        # Performance history (one sparkline per metric, newest request on the right)
+        metrics_frame = ttk.Frame(left_frame)
+        metrics_frame.pack(fill=tk.X)
+        
+        metrics_label = ttk.Label(metrics_frame, text="Performance:", font=('Arial', 10, 'bold'))
+        metrics_label.pack(anchor='w', pady=(0, 5))
+        
+        self.metrics_value_labels = {}
+        self.metrics_sparklines = {}
+        for series, title in (('tokens_per_sec', "Tokens/s"), ('ttft_ms', "First token"),
+                              ('prompt_eval_ms', "Prompt eval"), ('prompt_eval_saved_ms', "Cache saved"),
+                              ('total_ms', "Total time"),
+                              ('server_memory', "Server memory")):
+            row = ttk.Frame(metrics_frame)
+            row.pack(fill=tk.X)
+            value_label = ttk.Label(row, text=f"{title}: --", width=24, foreground="#666666", font=('Arial', 9))
+            value_label.pack(side=tk.LEFT)
+            sparkline = tk.Canvas(row, height=16, width=200, highlightthickness=0, background='#fafafa')
+            sparkline.pack(side=tk.LEFT, pady=1)
+            self.metrics_value_labels[series] = (value_label, title)
+            self.metrics_sparklines[series] = sparkline
+        
         # Logs section (in left panel)
         logs_label = ttk.Label(left_frame, text="System Logs:")
         logs_label.pack(pady=(20, 5), anchor='w')
@@ -221,18 +1876,40 @@ class OllamaGUI:
         self.chat_interface = ttk.Frame(self.right_panel_content)
         self.chat_interface.pack(fill=tk.BOTH, expand=True)
         
-        chat_label = ttk.Label(self.chat_interface, text="Chat:")
-        chat_label.pack(pady=(0, 5), anchor='w')
+        # Chat header: label on the left, reasoning pane toggle on the right
+        chat_header_frame = ttk.Frame(self.chat_interface)
+        chat_header_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        chat_label = ttk.Label(chat_header_frame, text="Chat:")
+        chat_label.pack(side=tk.LEFT, anchor='w')
+        
+        self.reasoning_toggle_button = ttk.Button(chat_header_frame, text="🧠 Reasoning ▸", 
+                                                 command=self.toggle_reasoning_pane)
+        self.reasoning_toggle_button.pack(side=tk.RIGHT)
+        
+        # Chat body: transcript plus the collapsible reasoning pane on its right
+        chat_body_frame = ttk.Frame(self.chat_interface)
+        chat_body_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        # Reasoning pane (thinking tokens stream here instead of into the transcript)
+        self.reasoning_frame = ttk.LabelFrame(chat_body_frame, text="Model Reasoning", padding=5)
+        self.reasoning_display = scrolledtext.ScrolledText(self.reasoning_frame, wrap=tk.WORD, width=40, 
+                                                         font=('Arial', 9), state='disabled', 
+                                                         bg='#F7F7F7', fg='#666666')
+        self.reasoning_display.pack(fill=tk.BOTH, expand=True)
         
         # Chat history display (read-only) with enhanced formatting support
-        self.chat_display = scrolledtext.ScrolledText(self.chat_interface, wrap=tk.WORD, font=('Arial', 11), 
+        self.chat_display = scrolledtext.ScrolledText(chat_body_frame, wrap=tk.WORD, font=('Arial', 11), 
                                                     state='disabled', bg='#FFFFFF', fg='#333333',
                                                     selectbackground='#0078D4', selectforeground='white')
-        self.chat_display.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        self.chat_display.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Configure text tags for rich formatting
         self.setup_chat_formatting()
         
+        # Formats each completed markdown block of a streamed reply in place
+        self.markdown_renderer = MarkdownStreamRenderer(self.chat_display, self.insert_markdown)
+        
         # User input frame
         input_frame = ttk.Frame(self.chat_interface)
         input_frame.pack(fill=tk.X, pady=(0, 10))
@@ -245,6 +1922,7 @@ class OllamaGUI:
         self.user_input = tk.Text(input_frame, height=3, font=('Arial', 11), wrap=tk.WORD, state='disabled')
         self.user_input.pack(fill=tk.X, pady=(0, 5))
         self.user_input.bind("<KeyPress>", self.on_input_keypress)
+        self.user_input.bind("<KeyRelease>", lambda e: self.schedule_token_count('chat', self.update_token_counter))
 
         # Send button (in chat interface)
         button_frame = ttk.Frame(self.chat_interface)
@@ -298,6 +1976,11 @@ class OllamaGUI:
                                                  command=self.stop_generation, state='disabled')
         self.translation_stop_button.pack(side=tk.LEFT, padx=(5, 0))
         
+        # Input size in tokens (exact when the model's own tokenizer is loaded)
+        self.translation_token_label = ttk.Label(translate_buttons_frame, text="", 
+                                               font=('Arial', 9), foreground="gray")
+        self.translation_token_label.pack(side=tk.RIGHT)
+        
         # Output text frame
         output_text_frame = ttk.LabelFrame(self.translator_interface, text="Translation Result", padding=10)
         output_text_frame.pack(fill=tk.BOTH, expand=True)
@@ -324,18 +2007,52 @@ class OllamaGUI:
         attribution_label.bind("<Enter>", lambda e: attribution_label.config(foreground="#1976D2", cursor="hand2"))
         attribution_label.bind("<Leave>", lambda e: attribution_label.config(foreground="#666666", cursor=""))
         
-        # Initialize Ollama
-        self.initialize_ollama()
-
         # Settings file path - in same directory as script
         script_dir = os.path.dirname(os.path.abspath(__file__))
         self.settings_file = os.path.join(script_dir, "ollama_gui_settings.json")
+        self.model_cache_file = os.path.join(script_dir, "ollama_model_cache.json")
+        self.tokenizer_dir = os.path.join(script_dir, "tokenizers")  # Optional tokenizer.json files
+        
+        # Shared HTTP client for all Ollama API traffic (must exist before the startup thread runs)
+        self.ollama_client = OllamaClient(self.get_saved_ollama_host())
+        
+        # Chat and translation requests are spread over this pool (primary client + extra backends)
+        self.backend_pool = BackendPool(self.ollama_client)
+        
+        # Host CPU/memory sampler (reads /proc, no subprocesses); GPU is sampled on a slower cadence
+        self.system_sampler = SystemSampler()
+        self.ollama_server_pid = None
+        self.process_monitor = ProcessTreeMonitor()
+        self.process_monitor_interval = 2  # Seconds between process tree samples
+        
+        # Per-request TTFT, tokens/sec, prompt eval, total time and server memory
+        self.metrics = MetricsStore()
+        
+        # One /api/ps snapshot shared by model info, the warm pool and the usage monitor
+        self.running_models = RunningModelsSnapshot(self.ollama_client)
+        
+        # Warm pool: pinned models stay loaded, idle ones are unloaded LRU-first beyond the budget
+        self.residency = ResidencyManager(self.ollama_client, self.running_models, self.apply_session_settings)
+        
+        # Model readiness: the selected model is ready once its load request completes
+        self.model_loads = ModelLoadTracker(
+            self.residency.load,
+            lambda *change: self.root.after(0, lambda: self.on_model_load_state(*change)))
+        
+        # Model metadata from /api/show, keyed by digest (installed model digests come from /api/tags)
+        self.model_digests = {}
+        self.model_file_sizes = {}  # Installed model sizes in bytes, for warm pool prefetch decisions
+        self.prefetch_job = None  # Pending debounced prefetch of the dropdown choice
+        self.model_metadata = {}
+        self.model_cache_lock = threading.Lock()
+        self.load_model_metadata_cache()
 
         # Variables
         self.ollama_process = None
         self.server_starting = False
         self.selected_model = None
         self.ollama_path = None  # Will be set when ollama is found
+        self.saved_model = ''  # Model from the last session, chosen once the model list is known
         self.server_was_running = False  # Track server state
         self.monitoring = True  # Enable server monitoring
         self.input_line_start = None  # Track where user input starts
@@ -345,23 +2062,46 @@ class OllamaGUI:
         self.server_started_by_user = False  # Track if server was started by this GUI
         self.current_response = ""  # Accumulate streaming response for filtering
         self.current_request = None  # Track current HTTP request for cancellation
+        self.think_filter = ThinkTagFilter()  # Streaming <think> filter for the current chat reply
         self.is_generating = False  # Track if model is generating response
         
         # Model settings variables
         self.response_timeout_var = tk.StringVar(value="60")  # Default timeout is 60 seconds
-        self.show_thinking_var = tk.BooleanVar(value=False)  # Default: hide thinking
+        self.show_thinking_var = tk.BooleanVar(value=False)  # Default: reasoning pane collapsed
+        self.show_thinking_var.trace_add('write', lambda *args: self.update_reasoning_pane_visibility())
         self.temperature_var = tk.DoubleVar(value=0.7)  # Default temperature
         self.top_p_var = tk.DoubleVar(value=0.9)  # Default top_p
         self.top_k_var = tk.IntVar(value=40)  # Default top_k
         self.repeat_penalty_var = tk.DoubleVar(value=1.1)  # Default repeat penalty
         self.max_tokens_var = tk.IntVar(value=0)  # 0 means no limit
         self.seed_var = tk.IntVar(value=-1)  # -1 means random seed
+        self.http_timeout_overrides = {}  # Per-endpoint HTTP timeout overrides from settings
+        self.stream_fps_var = tk.IntVar(value=30)  # Frame rate for rendering streamed responses
+        
+        # Session mode: stable prompt prefix, num_ctx and keep_alive so the server can reuse its KV cache
+        self.chat_session_var = tk.BooleanVar(value=True)
+        self.num_ctx_var = tk.IntVar(value=0)  # 0 means auto: DEFAULT_NUM_CTX capped at the model's window
+        self.keep_alive_var = tk.StringVar(value="30m")  # How long the server keeps the model loaded
+        self.model_keep_alive = {}  # Per-model keep_alive overrides from settings, e.g. {"llama3.1:8b": "2h"}
+        
+        # Streamed tokens are queued by the worker threads and drawn once per frame
+        self.stream_renderer = StreamRenderer(self.root, self.stream_fps_var.get())
         
         # Token tracking variables
         self.current_chat_tokens = 0  # Tokens used in current conversation
         self.max_context_tokens = 0  # Maximum context window for current model
         self.conversation_history = []  # Store conversation for token counting
         
+        # Exact counts with the selected model's tokenizer when one can be loaded, else the heuristic
+        self.token_counter = TokenCounter(self.estimate_token_count)
+        self.token_count_jobs = {}  # Pending debounced recounts by input, see schedule_token_count
+        self.tokenizer_model = None  # Model whose tokenizer was last looked up
+        
+        # Context window management: older turns are summarized once the history passes the budget
+        self.context_budget_percent = 75  # Share of the model's context window the history may use
+        self.context_keep_recent = 4  # Latest messages always sent verbatim
+        self.summarizing_history = False
+        
         # Model information cache
         self.model_info_cache = {}  # Cache for model size and info
         
@@ -384,14 +2124,16 @@ class OllamaGUI:
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
-        # Start server monitoring
-        self.start_server_monitoring()
+        # Start resource monitoring (server monitoring starts once the startup checks have answered)
+        self.start_system_sampling()
+        self.start_process_monitoring()
+        self.start_residency_management()
         
         # Start periodic model status updates
         self.start_periodic_model_updates()
         
-        # Initial status update
-        self.root.after(100, self.update_server_status_display)
+        # Check the installation and server in the background; the window is usable right away
+        self.initialize_ollama()
 
     def setup_chat_formatting(self):
         """Setup text formatting tags for the chat display"""
@@ -400,52 +2142,36 @@ class OllamaGUI:
         self.chat_display.tag_configure("ai_label", font=('Arial', 11, 'bold'), foreground='#009900')
         self.chat_display.tag_configure("code_block", font=('Courier New', 10), background='#f5f5f5',
                                       lmargin1=20, lmargin2=20, spacing1=5, spacing3=5)
+        self.chat_display.tag_configure("bold", font=('Arial', 11, 'bold'))
+        self.chat_display.tag_configure("italic", font=('Arial', 11, 'italic'))
+        self.chat_display.tag_configure("inline_code", font=('Courier New', 10), background='#f0f0f0')
         self.chat_display.tag_configure("error", font=('Arial', 11), foreground='#E74C3C')
         self.chat_display.tag_configure("warning", font=('Arial', 11), foreground='#F39C12')
         self.chat_display.tag_configure("success", font=('Arial', 11), foreground='#27AE60')
 
     def format_and_insert_text(self, text, position="end"):
-        """Simple text insertion without complex formatting"""
+        """Insert markdown text into the chat display with formatting tags applied"""
         if not text:
             return
             
         self.chat_display.config(state='normal')
-        
-        # Just clean the markdown, don't apply complex formatting
-        cleaned_text = self.clean_markdown_text(text)
-        
-        if position == "end" or position == tk.END:
-            self.chat_display.insert(tk.END, cleaned_text)
-        else:
-            self.chat_display.insert(position, cleaned_text)
-        
+        self.insert_markdown(position, text)
         self.chat_display.config(state='disabled')
     
-    def clean_markdown_text(self, text):
-        """Simple markdown removal - just strip markers, no formatting"""
-        if not text:
-            return text
-        
-        # Process in order to avoid conflicts
-        cleaned = text
-        
-        # 1. Handle code blocks first (highest priority)
-        # Keep code content but remove the backticks
-        cleaned = re.sub(r'```[a-zA-Z]*\n?', '', cleaned)  # Remove opening ```
-        cleaned = re.sub(r'\n?```', '', cleaned)            # Remove closing ```
-        
-        # 2. Handle inline code
-        cleaned = re.sub(r'`([^`\n]+)`', r'\1', cleaned)
-        
-        # 3. Handle bold (must be before italic to avoid conflicts)
-        cleaned = re.sub(r'\*\*([^*]+)\*\*', r'\1', cleaned)
-        cleaned = re.sub(r'__([^_]+)__', r'\1', cleaned)
-        
-        # 4. Handle italic
-        cleaned = re.sub(r'\*([^*\n]+)\*', r'\1', cleaned)
-        cleaned = re.sub(r'_([^_\n]+)_', r'\1', cleaned)
-        
-        return cleaned
+    def insert_markdown(self, index, text):
+        """Insert parsed markdown at index as tagged spans; returns the number of characters inserted."""
+        # Each parsed part maps onto a text tag of the same name ("text" stays untagged)
+        insert_args = []
+        inserted = 0
+        for part_type, content in self._parse_markdown(text):
+            if not content:
+                continue
+            insert_args.extend((content, () if part_type == "text" else (part_type,)))
+            inserted += len(content)
+        
+        if insert_args:
+            self.chat_display.insert(index, *insert_args)
+        return inserted
     
     def _parse_markdown(self, text):
         """Parse markdown text and return list of (type, content) tuples."""
@@ -453,11 +2179,9 @@ class OllamaGUI:
         remaining_text = text
         
         # First, handle code blocks (```code```) - highest priority
-        # Updated pattern to handle optional newlines for better compatibility
-        code_block_pattern = r'```[a-zA-Z]*\n?(.*?)\n?```'
         last_end = 0
         
-        for match in re.finditer(code_block_pattern, remaining_text, re.DOTALL):
+        for match in PATTERNS['code_block'].finditer(remaining_text):
             # Add text before code block
             if match.start() > last_end:
                 before_text = remaining_text[last_end:match.start()]
@@ -487,75 +2211,54 @@ class OllamaGUI:
     
     def _parse_inline_markdown(self, text):
         """Parse inline markdown (code, bold, italic) and return list of (type, content) tuples."""
-        parts = []
-        remaining = text
-        
-        # Process patterns in order: inline code, bold, italic, then regular text
-        patterns = [
-            (r'`([^`\n]+)`', 'inline_code'),  # `code` - highest priority
-            (r'\*\*([^*]+)\*\*', 'bold'),     # **bold**
-            (r'\*([^*]+)\*', 'italic'),       # *italic*
-            (r'__([^_]+)__', 'bold'),         # __bold__
-            (r'_([^_]+)_', 'italic'),         # _italic_
-        ]
-        
-        while remaining:
-            earliest_match = None
-            earliest_pos = len(remaining)
-            pattern_info = None
-            
-            # Find the earliest markdown pattern
-            for pattern, format_type in patterns:
-                match = re.search(pattern, remaining)
-                if match and match.start() < earliest_pos:
-                    earliest_match = match
-                    earliest_pos = match.start()
-                    pattern_info = (pattern, format_type)
-            
-            if earliest_match:
-                # Add text before the match
-                if earliest_pos > 0:
-                    before_text = remaining[:earliest_pos]
-                    if before_text:
-                        parts.append(("text", before_text))
-                
-                # Add the formatted content (without markers)
-                content = earliest_match.group(1)
-                parts.append((pattern_info[1], content))
-                
-                # Continue with remaining text after the match
-                remaining = remaining[earliest_match.end():]
-            else:
-                # No more patterns found, add remaining as regular text
-                if remaining:
-                    parts.append(("text", remaining))
-                break
-        
-        return parts
+        return list(iter_inline_markdown(text))
 
     def initialize_ollama(self):
-        """Initialize Ollama server and load models on startup."""
-        self.show_status_message("Checking Ollama installation...")
+        """Check the Ollama installation and server and load the models without blocking the window.
         
-        def check_and_start():
-            if not self.check_ollama_installation():
-                self.root.after(0, self.update_server_status_display)
-                return
-                
-            if not self.is_ollama_server_running():
-                self.root.after(0, lambda: self.show_status_message("Ollama server not running. Starting automatically..."))
-                # Call auto_start_server from the main thread
-                self.root.after(0, self.auto_start_server)
-            else:
-                self.root.after(0, lambda: self.show_status_message("Ollama server is already running. Detecting who started it..."))
-                # Server was already running, detect who started it
-                self.server_started_by_user = self.detect_server_starter()
+        Binary discovery and the HTTP probe run concurrently; the model list and the
+        server owner are fetched once, after the probe has answered.
+        """
+        self.show_status_message("Checking Ollama installation...")
+        startup = StartupTasks(self.startup_started)
+        startup.mark("build window")
+        
+        startup.add("probe", self.is_ollama_server_running)
+        if self.ollama_client.is_local():
+            # A remote server needs no local installation
+            startup.add("find binary", self.check_ollama_installation)
+            startup.add("server owner", lambda probe: self.detect_server_starter() if probe else False,
+                        after=("probe",))
+        startup.add("models", lambda probe: self.get_ollama_models() if probe else None, after=("probe",))
+        
+        startup.finish(lambda: self.root.after(0, lambda: self.on_startup_checks_finished(startup)))
+    
+    def on_startup_checks_finished(self, startup):
+        """Apply the startup check results to the UI and log the startup timing breakdown."""
+        running = bool(startup.result("probe"))
+        host = self.ollama_client.base_url
+        
+        if running:
+            if self.ollama_client.is_local():
+                self.server_started_by_user = bool(startup.result("server owner"))
                 starter = "user" if self.server_started_by_user else "system"
-                self.root.after(0, lambda: self.show_status_message(f"Server was started by: {starter}"))
-                self.root.after(0, self.update_server_status_display)
-                self.root.after(0, self.refresh_models)
+                self.show_status_message(f"Ollama server is already running. Server was started by: {starter}")
+            else:
+                self.show_status_message(f"Connected to remote Ollama server at {host}")
+            # The list fetched during startup is shared with the saved-model restore
+            self.refresh_models(startup.result("models") or [])
+        elif not self.ollama_client.is_local():
+            self.show_status_message(f"Remote Ollama server at {host} is not reachable")
+        elif startup.result("find binary"):
+            self.show_status_message("Ollama server not running. Starting automatically...")
+            self.auto_start_server()
+        
+        # The monitor reports changes from this state on, so the initial state isn't handled twice
+        self.server_was_running = running
+        self.start_server_monitoring()
+        self.update_server_status_display(running)
         
-        threading.Thread(target=check_and_start, daemon=True).start()
+        self.show_status_message(startup.timing_summary())
 
     def find_ollama_path(self):
         """Find the full path to ollama executable in a cross-platform way."""
@@ -586,57 +2289,32 @@ class OllamaGUI:
                 os.path.expanduser("~/.local/bin/ollama")
             ]
         
-        # Try common paths first
+        # Try common paths first; only the file is checked here, the caller runs --version once
         for path in common_paths:
             if os.path.isfile(path) and os.access(path, os.X_OK):
-                try:
-                    result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=5)
-                    if result.returncode == 0:
-                        return path
-                except (FileNotFoundError, subprocess.TimeoutExpired):
-                    continue
-        
-        # Try to find ollama in user's shell environment
-        try:
-            # Platform-specific command to locate executable in PATH
-            if platform.system() == "Windows":
-                result = subprocess.run(
-                    ["where", "ollama"], 
-                    capture_output=True, text=True, timeout=5
-                )
-            elif platform.system() in ["Darwin", "Linux"]:
-                # Use shell's which command
-                shell_cmd = ["which", "ollama"]
-                result = subprocess.run(
-                    shell_cmd, 
-                    capture_output=True, text=True, timeout=5
-                )
-            if result.returncode == 0 and result.stdout.strip():
-                ollama_path = result.stdout.strip()
-                # Verify it works
-                test_result = subprocess.run([ollama_path, "--version"], capture_output=True, text=True, timeout=5)
-                if test_result.returncode == 0:
-                    return ollama_path
-        except Exception as e:
-            self.show_status_message(f"Error finding Ollama in PATH: {str(e)}")
+                return path
         
-        # Final fallback - try "ollama" directly in PATH
-        try:
-            # Determine executable name based on platform
-            executable_name = "ollama.exe" if platform.system() == "Windows" else "ollama"
-            result = subprocess.run([executable_name, "--version"], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                return executable_name
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
+        # Search the user's PATH (shutil.which also handles Windows executable extensions)
+        path = shutil.which("ollama")
+        if path:
+            return path
         
-        self.show_status_message(f"Could not find Ollama on this {platform.system()} system")
+        # Runs on the startup pool, so log through the main loop
+        message = f"Could not find Ollama on this {platform.system()} system"
+        self.root.after(0, lambda: self.show_status_message(message))
         return None
 
     def is_ollama_server_running(self):
         """Check if Ollama server is running in a cross-platform way"""
+        # Fast path: HTTP probe over the persistent session (no process spawn)
         try:
-            if not self.ollama_path:
+            return self.ollama_client.probe()
+        except requests.exceptions.RequestException:
+            # HTTP unreachable - fall back to the CLI check below
+            self.ollama_client.last_probe_latency_ms = None
+        
+        try:
+            if not self.ollama_path or not self.ollama_client.is_local():
                 return False
                 
             # The 'list' command works cross-platform to check if server is responding
@@ -645,11 +2323,14 @@ class OllamaGUI:
             return True
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
             # For debugging server connectivity issues
-            self.show_status_message(f"Server check failed: {type(e).__name__}")
+            self.root.after(0, lambda m=f"Server check failed: {type(e).__name__}": self.show_status_message(m))
             return False
     
     def detect_server_starter(self):
         """Detect who started the Ollama server process in a cross-platform way."""
+        if not self.ollama_client.is_local():
+            return False  # Remote servers are never started by this GUI
+        
         try:
             # Get current user info
             current_user = getpass.getuser()
@@ -665,11 +2346,11 @@ class OllamaGUI:
                     
                     if task_result.returncode == 0 and "ollama.exe" in task_result.stdout:
                         # On Windows, for simplicity, we'll always consider it user-started if running
-                        self.show_status_message("Ollama server detected on Windows")
+                        self.root.after(0, lambda m="Ollama server detected on Windows": self.show_status_message(m))
                         return True
                     
                 except Exception as e:
-                    self.show_status_message(f"Windows process detection error: {str(e)}")
+                    self.root.after(0, lambda m=f"Windows process detection error: {str(e)}": self.show_status_message(m))
                     return False
                     
             elif platform.system() == "Darwin":  # macOS
@@ -687,7 +2368,7 @@ class OllamaGUI:
                                 parts = line.split()
                                 if len(parts) >= 3:
                                     process_user = parts[0]
-                                    self.show_status_message(f"Found ollama serve process running as: {process_user}")
+                                    self.root.after(0, lambda m=f"Found ollama serve process running as: {process_user}": self.show_status_message(m))
                                     
                                     # Check if it's the current user
                                     if process_user == current_user:
@@ -696,7 +2377,7 @@ class OllamaGUI:
                                         return False  # Started by system or another user
                 
                 except Exception as e:
-                    self.show_status_message(f"macOS process detection error: {str(e)}")
+                    self.root.after(0, lambda m=f"macOS process detection error: {str(e)}": self.show_status_message(m))
             
             else:  # Linux and other Unix-like systems
                 try:
@@ -714,7 +2395,7 @@ class OllamaGUI:
                                 parts = line.split()
                                 if len(parts) >= 11:
                                     process_user = parts[0]
-                                    self.show_status_message(f"Found ollama serve process running as: {process_user}")
+                                    self.root.after(0, lambda m=f"Found ollama serve process running as: {process_user}": self.show_status_message(m))
                                     
                                     # Check if it's the current user
                                     if process_user == current_user:
@@ -723,7 +2404,7 @@ class OllamaGUI:
                                         return False  # Started by system
                                     else:
                                         # Could be another user, assume system for safety
-                                        self.show_status_message(f"Unknown user '{process_user}', assuming system process")
+                                        self.root.after(0, lambda m=f"Unknown user '{process_user}', assuming system process": self.show_status_message(m))
                                         return False
                     
                     # Linux-specific fallback: try pgrep with user info
@@ -734,7 +2415,7 @@ class OllamaGUI:
                         )
                         
                         if pgrep_result.returncode == 0 and pgrep_result.stdout.strip():
-                            self.show_status_message(f"ollama serve confirmed running as {current_user}")
+                            self.root.after(0, lambda m=f"ollama serve confirmed running as {current_user}": self.show_status_message(m))
                             return True
                         else:
                             # Check if it's running as system user
@@ -743,35 +2424,50 @@ class OllamaGUI:
                                 capture_output=True, text=True, timeout=3
                             )
                             if pgrep_system.returncode == 0:
-                                self.show_status_message("ollama serve found running as system process")
+                                self.root.after(0, lambda m="ollama serve found running as system process": self.show_status_message(m))
                                 return False
                     except Exception:
                         # pgrep might not be available on all Linux distributions
                         pass
                         
                 except Exception as e:
-                    self.show_status_message(f"Linux process detection error: {str(e)}")
+                    self.root.after(0, lambda m=f"Linux process detection error: {str(e)}": self.show_status_message(m))
             
             # If we can't determine, assume system for safety
-            self.show_status_message("Could not determine server starter, assuming system")
+            self.root.after(0, lambda m="Could not determine server starter, assuming system": self.show_status_message(m))
             return False
             
         except Exception as e:
             # If detection fails, assume system
-            self.show_status_message(f"Server detection failed: {str(e)}, assuming system")
+            self.root.after(0, lambda m=f"Server detection failed: {str(e)}, assuming system": self.show_status_message(m))
             return False
     
-    def update_server_status_display(self):
-        """Update the server status display based on current state."""
+    def update_server_status_display(self, running=None):
+        """Update the server status display based on current state.
+        
+        Callers that have just probed the server pass the result so the UI thread doesn't probe again.
+        """
         if not hasattr(self, 'server_status_label'):
             return
-            
-        if not self.is_ollama_server_running():
+        
+        if running is None:
+            running = self.is_ollama_server_running()
+        if not running:
             self.server_status_label.config(text="Server Status: Not running", foreground="red")
+        elif not self.ollama_client.is_local():
+            host = urlparse(self.ollama_client.base_url).netloc
+            self.server_status_label.config(text=f"Server Status: Remote ({host})", foreground="green")
         elif self.server_started_by_user:
             self.server_status_label.config(text="Server Status: Started by user", foreground="green")
         else:
             self.server_status_label.config(text="Server Status: Started by system", foreground="orange")
+        
+        # Show the latency of the last HTTP health probe
+        latency_ms = self.ollama_client.last_probe_latency_ms
+        if latency_ms is None:
+            self.server_latency_label.config(text="Probe latency: -- (HTTP unreachable)")
+        else:
+            self.server_latency_label.config(text=f"Probe latency: {latency_ms:.1f} ms")
     
     def on_server_started(self):
         """Handle server start event"""
@@ -786,6 +2482,8 @@ class OllamaGUI:
             # Don't override if already set to True by auto_start_server
             if not hasattr(self, 'server_started_by_user') or not self.server_started_by_user:
                 self.server_started_by_user = True
+        # Nothing loaded before a restart is still in memory
+        self.model_loads.reset("server restarted")
         self.update_server_status_display()
         self.refresh_models()
     
@@ -796,6 +2494,7 @@ class OllamaGUI:
         else:
             self.show_status_message("Ollama server has stopped.")
         self.server_started_by_user = False
+        self.model_loads.reset("server stopped")
         self.update_server_status_display()
         self.model_var.set("")
         self.model_dropdown['values'] = []
@@ -803,25 +2502,29 @@ class OllamaGUI:
         self.update_model_details(None)  # Reset to "No model selected"
 
     def check_ollama_installation(self):
-        """Check if Ollama is properly installed."""
+        """Check if Ollama is properly installed (runs on the startup pool; logs via the main loop)."""
+        def log(*messages):
+            for message in messages:
+                self.root.after(0, lambda m=message: self.show_status_message(m))
+        
         ollama_path = self.find_ollama_path()
         if not ollama_path:
-            self.show_status_message("Ollama not found. Please install Ollama first.")
-            self.show_status_message("Visit: https://ollama.ai/ for installation instructions.")
+            log("Ollama not found. Please install Ollama first.",
+                "Visit: https://ollama.ai/ for installation instructions.")
             return False
             
         try:
             result = subprocess.run([ollama_path, "--version"], capture_output=True, text=True, timeout=5)
             if result.returncode == 0:
                 version = result.stdout.strip()
-                self.show_status_message(f"Ollama found at {ollama_path}: {version}")
+                log(f"Ollama found at {ollama_path}: {version}")
                 self.ollama_path = ollama_path  # Store for later use
                 return True
             else:
-                self.show_status_message("Ollama found but not responding properly.")
+                log("Ollama found but not responding properly.")
                 return False
         except Exception as e:
-            self.show_status_message(f"Error checking Ollama: {str(e)}")
+            log(f"Error checking Ollama: {str(e)}")
             return False
 
     def show_install_guide(self):
@@ -1023,31 +2726,26 @@ Once installed, click 'Refresh' in the main application to detect models.
     def get_model_details_from_page(self, model_name):
         """Scrape detailed model information from ollama.com individual model page."""
         try:
-            import re
             url = f"https://ollama.com/library/{model_name}"
             response = requests.get(url, timeout=10)
             if response.status_code == 200:
                 content = response.text
                 
                 # Extract parameter sizes
-                size_pattern = r'x-test-size[^>]*>([^<]+)'
-                sizes = re.findall(size_pattern, content)
+                sizes = PATTERNS['page_sizes'].findall(content)
                 
                 # Extract download count (pull count)
-                pull_pattern = r'x-test-pull-count>([^<]+)'
-                pull_match = re.search(pull_pattern, content)
+                pull_match = PATTERNS['page_pull_count'].search(content)
                 pull_count = pull_match.group(1) if pull_match else None
                 
                 # Extract last updated
-                updated_pattern = r'x-test-updated>([^<]+)'
-                updated_match = re.search(updated_pattern, content)
+                updated_match = PATTERNS['page_updated'].search(content)
                 last_updated = updated_match.group(1) if updated_match else None
                 
                 # Extract capabilities (tools, vision, embedding, thinking)
                 capabilities = []
                 # Look for capability badges in the HTML - they use bg-indigo-50 class
-                capability_pattern = r'bg-indigo-50[^>]*>([^<]+)</span>'
-                capability_matches = re.findall(capability_pattern, content)
+                capability_matches = PATTERNS['page_capability'].findall(content)
                 
                 for capability in capability_matches:
                     capability = capability.strip().lower()
@@ -1413,13 +3111,9 @@ Once installed, click 'Refresh' in the main application to detect models.
         def check_model_already_downloaded(model_name, size_tag):
             """Check if the specific model with size is already downloaded."""
             try:
-                if not self.ollama_path:
-                    return False
-                
                 # Get list of installed models
-                result = subprocess.run([self.ollama_path, "list"], 
-                                      capture_output=True, text=True, timeout=5)
-                if result.returncode != 0:
+                installed_models = self.get_ollama_models()
+                if not installed_models:
                     return False
                 
                 # Construct the full model name with size tag
@@ -1433,17 +3127,12 @@ Once installed, click 'Refresh' in the main application to detect models.
                     full_model_name = model_name
                 
                 # Check if this exact model is in the list
-                output_lines = result.stdout.strip().split('\n')
-                for line in output_lines[1:]:  # Skip header
-                    if line.strip():
-                        parts = line.split()
-                        if parts:
-                            installed_model = parts[0]
-                            # Check exact match or default tag match
-                            if (installed_model == full_model_name or 
-                                (installed_model == f"{model_name}:latest" and full_model_name == model_name) or
-                                (installed_model == model_name and full_model_name == f"{model_name}:latest")):
-                                return True
+                for installed_model in installed_models:
+                    # Check exact match or default tag match
+                    if (installed_model == full_model_name or 
+                        (installed_model == f"{model_name}:latest" and full_model_name == model_name) or
+                        (installed_model == model_name and full_model_name == f"{model_name}:latest")):
+                        return True
                 
                 return False
             except Exception as e:
@@ -1501,12 +3190,11 @@ Once installed, click 'Refresh' in the main application to detect models.
             
             def _detect_model_size(self, model_name, size_tag):
                 """Detect model size from name and tag."""
-                import re
                 text_to_analyze = f"{model_name} {size_tag}".lower()
-                text_to_analyze = re.sub(r'\b(latest|default|instruct|chat|code)\b', '', text_to_analyze)
+                text_to_analyze = PATTERNS['size_noise_words'].sub('', text_to_analyze)
                 
                 # First try to extract decimal numbers with 'b' (e.g., "1.8b", "2.7b")
-                decimal_size_match = re.search(r'(\d+\.\d+)\s*b\b', text_to_analyze)
+                decimal_size_match = PATTERNS['size_decimal_b'].search(text_to_analyze)
                 if decimal_size_match:
                     size_num = float(decimal_size_match.group(1))
                     if size_num <= 2: return 'micro'
@@ -1519,7 +3207,7 @@ Once installed, click 'Refresh' in the main application to detect models.
                     else: return 'massive'
                 
                 # Check for M (million) parameter models like "270m", "500M"
-                million_size_match = re.search(r'(\d+)\s*m\b', text_to_analyze)
+                million_size_match = PATTERNS['size_millions'].search(text_to_analyze)
                 if million_size_match:
                     size_num = float(million_size_match.group(1))
                     # Convert millions to billions for comparison
@@ -1532,11 +3220,11 @@ Once installed, click 'Refresh' in the main application to detect models.
                 for category, config in self.MODEL_REQUIREMENTS.items():
                     for pattern in config['patterns']:
                         # Use more specific regex to avoid false matches
-                        if re.search(r'(?<!\d)' + pattern + r'(?!\d)', text_to_analyze):
+                        if compiled_pattern(r'(?<!\d)' + pattern + r'(?!\d)').search(text_to_analyze):
                             return category
                 
                 # Final fallback: any number followed by 'b'
-                size_match = re.search(r'(\d+)\s*b\b', text_to_analyze)
+                size_match = PATTERNS['size_whole_b'].search(text_to_analyze)
                 if size_match:
                     size_num = float(size_match.group(1))
                     if size_num <= 2: return 'micro'
@@ -1777,29 +3465,23 @@ Once installed, click 'Refresh' in the main application to detect models.
                 
                 def delete_model():
                     try:
-                        if not self.ollama_path:
-                            dialog.after(0, lambda: manage_status_label.config(text="Error: Ollama not found"))
-                            return
+                        # Delete the model through the server's delete API
+                        self.ollama_client.delete_model(model_name)
                         
-                        # Use ollama rm command to delete the model
-                        result = subprocess.run([self.ollama_path, "rm", model_name], 
-                                              capture_output=True, text=True, timeout=30)
-                        
-                        if result.returncode == 0:
-                            dialog.after(0, lambda: manage_status_label.config(text=f"✅ Successfully deleted {model_name}"))
-                            dialog.after(0, refresh_installed_models)
-                            # If this was the currently selected model in main window, clear it
-                            if hasattr(self, 'selected_model') and self.selected_model == model_name:
-                                dialog.after(0, lambda: setattr(self, 'selected_model', None))
-                                dialog.after(0, lambda: self.update_model_details(None))
-                                dialog.after(0, lambda: self.model_var.set(""))
-                            # Refresh main window model list
-                            dialog.after(0, self.refresh_models)
-                        else:
-                            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-                            dialog.after(0, lambda: manage_status_label.config(text=f"❌ Failed to delete {model_name}: {error_msg}"))
-                    except subprocess.TimeoutExpired:
+                        dialog.after(0, lambda: manage_status_label.config(text=f"✅ Successfully deleted {model_name}"))
+                        dialog.after(0, refresh_installed_models)
+                        # If this was the currently selected model in main window, clear it
+                        if hasattr(self, 'selected_model') and self.selected_model == model_name:
+                            dialog.after(0, lambda: setattr(self, 'selected_model', None))
+                            dialog.after(0, lambda: self.update_model_details(None))
+                            dialog.after(0, lambda: self.model_var.set(""))
+                        # Refresh main window model list
+                        dialog.after(0, self.refresh_models)
+                    except requests.exceptions.Timeout:
                         dialog.after(0, lambda: manage_status_label.config(text=f"❌ Deletion timed out for {model_name}"))
+                    except requests.exceptions.HTTPError as e:
+                        error_msg = e.response.text.strip() if e.response is not None and e.response.text else "Unknown error"
+                        dialog.after(0, lambda: manage_status_label.config(text=f"❌ Failed to delete {model_name}: {error_msg}"))
                     except Exception as e:
                         dialog.after(0, lambda: manage_status_label.config(text=f"❌ Error deleting {model_name}: {str(e)}"))
                 
@@ -2035,39 +3717,35 @@ Once installed, click 'Refresh' in the main application to detect models.
                 """Run the download process in a separate thread."""
                 nonlocal download_process
                 try:
-                    if not self.ollama_path:
-                        dialog.after(0, lambda: download_error("Ollama not found"))
-                        return
-                    
-                    # Start the download process
-                    cmd = [self.ollama_path, "pull", full_model_name]
-                    download_process = subprocess.Popen(
-                        cmd, 
-                        stdout=subprocess.PIPE, 
-                        stderr=subprocess.STDOUT,
-                        text=True, 
-                        bufsize=1,
-                        universal_newlines=True
-                    )
+                    # Start the download through the pull API (streamed NDJSON progress events)
+                    download_process = self.ollama_client.pull(full_model_name)
                     
                     # Monitor download progress
-                    for line in iter(download_process.stdout.readline, ''):
-                        if download_process.poll() is not None:
-                            break
-                        
-                        # Parse progress from ollama output
-                        progress_info = parse_download_progress(line.strip())
-                        if progress_info:
-                            # Use main window's after method to handle updates even when dialog is closed
-                            self.root.after(0, lambda p=progress_info: update_progress(p))
-                    
-                    # Wait for process to complete
-                    return_code = download_process.wait()
+                    final_status = ""
+                    with download_process as response:
+                        for raw_line in response.iter_lines():
+                            if not raw_line:
+                                continue
+                            try:
+                                event = json.loads(raw_line)
+                            except json.JSONDecodeError:
+                                continue
+                            
+                            if event.get('error'):
+                                final_status = f"error: {event['error']}"
+                                break
+                            final_status = event.get('status', '')
+                            
+                            # Render the event like a CLI progress line and parse it
+                            progress_info = parse_download_progress(format_pull_event(event))
+                            if progress_info:
+                                # Use main window's after method to handle updates even when dialog is closed
+                                self.root.after(0, lambda p=progress_info: update_progress(p))
                     
-                    if return_code == 0:
+                    if final_status == "success":
                         self.root.after(0, lambda: download_complete(full_model_name))
                     else:
-                        self.root.after(0, lambda: download_error(f"Download failed with code {return_code}"))
+                        self.root.after(0, lambda: download_error(f"Download failed ({final_status or 'no status'})"))
                         
                 except Exception as e:
                     self.root.after(0, lambda: download_error(f"Download error: {str(e)}"))
@@ -2075,35 +3753,15 @@ Once installed, click 'Refresh' in the main application to detect models.
             # Start download in background thread
             threading.Thread(target=run_download, daemon=True).start()
         
-        def parse_download_progress(line):
-            """Parse download progress from ollama output."""
-            import re
-            
-            # Look for percentage patterns in ollama output
-            # Examples: "pulling manifest... 100%", "downloading 12345/67890 50%"
-            percent_match = re.search(r'(\d+)%', line)
-            if percent_match:
-                percentage = int(percent_match.group(1))
-                
-                # Extract status text
-                status = line.strip()
-                if 'pulling' in line.lower():
-                    status = "Pulling manifest..."
-                elif 'downloading' in line.lower():
-                    status = "Downloading model data..."
-                elif 'verifying' in line.lower():
-                    status = "Verifying download..."
-                elif 'success' in line.lower() or 'complete' in line.lower():
-                    status = "Download complete!"
-                
-                return {'percentage': percentage, 'status': status, 'raw': line}
-            
-            # Look for size information
-            size_match = re.search(r'(\d+(?:\.\d+)?)\s*([KMGT]?B)', line)
-            if size_match:
-                return {'status': line.strip(), 'raw': line}
-            
-            return None
+        def format_pull_event(event):
+            """Format a pull API progress event as a text line, e.g. 'pulling abc 45% (1.2 GB/2.6 GB)'."""
+            line = event.get('status', '')
+            total = event.get('total')
+            if total:
+                completed = event.get('completed', 0)
+                percentage = int(completed * 100 / total)
+                line += f" {percentage}% ({self.format_model_size(completed)}/{self.format_model_size(total)})"
+            return line
         
         def update_progress(progress_info):
             """Update progress display in dialog."""
@@ -2139,13 +3797,10 @@ Once installed, click 'Refresh' in the main application to detect models.
             nonlocal download_process, downloading_model, is_downloading
             if download_process:
                 try:
-                    download_process.terminate()
-                    download_process.wait(timeout=5)
+                    # Closing the streaming response aborts the pull on the server
+                    download_process.close()
                 except:
-                    try:
-                        download_process.kill()
-                    except:
-                        pass
+                    pass
                 
                 download_process = None
             
@@ -2177,7 +3832,7 @@ Once installed, click 'Refresh' in the main application to detect models.
             
             # Re-enable chat input only if a model is selected AND ready
             if (hasattr(self, 'selected_model') and self.selected_model and 
-                hasattr(self, 'model_status') and self.model_status == "Ready"):
+                hasattr(self, 'model_status') and self.model_status in ("Ready", "Unloaded")):
                 if hasattr(self, 'user_input'):
                     self.user_input.config(state='normal')
                 if hasattr(self, 'send_button'):
@@ -2376,7 +4031,7 @@ Once installed, click 'Refresh' in the main application to detect models.
         
         # Re-enable chat input only if a model is selected AND ready
         if (self.selected_model and hasattr(self, 'model_status') and 
-            self.model_status == "Ready"):
+            self.model_status in ("Ready", "Unloaded")):
             self.user_input.config(state='normal')
             self.send_button.config(state='normal')
         else:
@@ -2470,7 +4125,7 @@ Once installed, click 'Refresh' in the main application to detect models.
         
         # Re-enable chat only if a model is selected AND ready
         if (self.selected_model and hasattr(self, 'model_status') and 
-            self.model_status == "Ready"):
+            self.model_status in ("Ready", "Unloaded")):
             self.send_button.config(state='normal')
             self.user_input.config(state='normal')
         else:
@@ -2483,6 +4138,10 @@ Once installed, click 'Refresh' in the main application to detect models.
         """Automatically start the Ollama server if not running, in a cross-platform way."""
         if self.server_starting or not self.ollama_path:
             return
+        
+        if not self.ollama_client.is_local():
+            self.show_status_message("Configured Ollama server is remote - it cannot be started from this GUI")
+            return
             
         self.server_starting = True
         # Mark that this GUI is starting the server
@@ -2540,6 +4199,10 @@ Once installed, click 'Refresh' in the main application to detect models.
         if self.server_starting:
             self.show_status_message("Server is already starting, please wait...")
             return
+        
+        if not self.ollama_client.is_local():
+            self.show_status_message("Restart is only available for a local Ollama server")
+            return
             
         self.show_status_message("Restarting Ollama server to refresh user context...")
         
@@ -2601,378 +4264,384 @@ Once installed, click 'Refresh' in the main application to detect models.
                         self.server_was_running = current_running
                     
                     # Always update status display to ensure it's correct
-                    self.root.after(0, self.update_server_status_display)
+                    self.root.after(0, lambda running=current_running: self.update_server_status_display(running))
+                    
+                    # Health-check the backend pool so dead backends drop out of routing
+                    # (the primary was just probed above)
+                    self.backend_pool.check_health(primary_healthy=current_running)
+                    self.root.after(0, self.update_backend_stats_display)
                     
                     time.sleep(3)  # Check every 3 seconds
                 except Exception:
                     pass
         
-        threading.Thread(target=monitor_server, daemon=True).start()
-
+        threading.Thread(target=monitor_server, daemon=True).start()
+
+    def get_ollama_server_pid(self):
+        """Return the pid of the local Ollama server (ours if we started it), or None."""
+        if self.ollama_process and self.ollama_process.poll() is None:
+            return self.ollama_process.pid
+        # Re-scan /proc only when the remembered server process has gone away
+        if self.ollama_server_pid is None or read_proc_status(self.ollama_server_pid) is None:
+            self.ollama_server_pid = find_ollama_server_pid()
+        return self.ollama_server_pid
+    
+    def start_system_sampling(self, interval=3):
+        """Sample host CPU, memory and Ollama server RSS in the background."""
+        def sample_system():
+            while self.monitoring:
+                try:
+                    server_pid = self.get_ollama_server_pid() if self.ollama_client.is_local() else None
+                    sample = self.system_sampler.sample(server_pid)
+                    self.root.after(0, lambda: self.update_system_usage_display(sample))
+                except Exception:
+                    pass  # Keep sampling even if one reading fails
+                time.sleep(interval)
+        
+        threading.Thread(target=sample_system, daemon=True).start()
+    
+    def update_system_usage_display(self, sample):
+        """Show the latest SystemSample in the left panel."""
+        parts = []
+        if sample.cpu_percent is not None:
+            parts.append(f"CPU {sample.cpu_percent:.0f}%")
+        if sample.memory_total:
+            parts.append(f"RAM {self.format_model_size(sample.memory_used)}/{self.format_model_size(sample.memory_total)}")
+        if sample.server_rss:
+            parts.append(f"ollama {self.format_model_size(sample.server_rss)}")
+        lines = ["Host: " + " · ".join(parts)] if parts else []
+        if sample.gpu is not None:
+            lines.append(f"GPU ({sample.gpu.name}): {sample.gpu.utilization}% · "
+                         f"{self.format_model_size(sample.gpu.memory_used)}/{self.format_model_size(sample.gpu.memory_total)}")
+        self.system_usage_label.config(text="\n".join(lines))
+    
+    def start_process_monitoring(self):
+        """Sample the Ollama server's process tree every process_monitor_interval seconds."""
+        def monitor_processes():
+            while self.monitoring:
+                try:
+                    server_pid = self.get_ollama_server_pid() if self.ollama_client.is_local() else None
+                    samples = self.process_monitor.sample(server_pid) if server_pid else []
+                    self.root.after(0, lambda: self.update_process_stats_display(samples))
+                    time.sleep(max(0.5, self.process_monitor_interval))
+                except Exception:
+                    time.sleep(2)  # Keep monitoring even if one sample fails
+        
+        threading.Thread(target=monitor_processes, daemon=True).start()
+    
+    def update_process_stats_display(self, samples):
+        """Show per-process usage of the Ollama server tree and redraw its sparkline."""
+        if not samples:
+            self.process_stats_label.config(text="")
+            self.process_sparkline.pack_forget()
+            return
+        
+        total_cpu = sum(sample.cpu_percent for sample in samples)
+        total_rss = sum(sample.rss for sample in samples)
+        lines = [f"Server processes ({len(samples)}): CPU {total_cpu:.0f}% · RSS {self.format_model_size(total_rss)}"]
+        for sample in samples[:4]:
+            lines.append(f"  {sample.name} {sample.pid}: CPU {sample.cpu_percent:.0f}% · "
+                         f"{self.format_model_size(sample.rss)} · {sample.threads} thr · {sample.fds} fd")
+        if len(samples) > 4:
+            lines.append(f"  ... and {len(samples) - 4} more")
+        self.process_stats_label.config(text="\n".join(lines))
+        
+        if not self.process_sparkline.winfo_ismapped():
+            self.process_sparkline.pack(anchor='w', pady=(2, 0))
+        self.draw_sparkline(self.process_sparkline, [
+            (self.process_monitor.cpu_history.values(), '#1976D2', "CPU"),
+            (self.process_monitor.rss_history.values(), '#2E7D32', "RSS"),
+        ])
+    
+    def draw_sparkline(self, canvas, series):
+        """Draw (values, color, legend) series as lines on a canvas, each scaled to its own peak."""
+        canvas.delete('all')
+        width = int(canvas['width'])
+        height = int(canvas['height'])
+        legend_x = 4
+        for values, color, legend in series:
+            if legend:
+                canvas.create_text(legend_x, 2, text=legend, fill=color, anchor='nw', font=('Arial', 7))
+                legend_x += 8 * len(legend) + 6
+            if len(values) < 2:
+                continue
+            peak = max(values) or 1
+            step = width / (len(values) - 1)
+            points = []
+            for i, value in enumerate(values):
+                points.extend((i * step, height - 2 - (height - 4) * value / peak))
+            canvas.create_line(*points, fill=color, width=1)
+    
+    def on_model_dropdown_selected(self):
+        """Remember the dropdown choice, sync its pin checkbox and start loading it in the background."""
+        self.save_settings()
+        self.pin_model_var.set(self.model_var.get() in self.residency.pinned)
+        
+        # Only prefetch the model the user stops at, not every entry scrolled past
+        if self.prefetch_job is not None:
+            self.root.after_cancel(self.prefetch_job)
+        self.prefetch_job = self.root.after(1000, lambda: self.prefetch_model_async(self.model_var.get()))
+    
+    def toggle_model_pin(self):
+        """Pin or unpin the model shown in the dropdown and apply the warm pool right away."""
+        model_name = self.model_var.get()
+        if not model_name:
+            self.pin_model_var.set(False)
+            return
+        pinned = self.pin_model_var.get()
+        self.residency.set_pinned(model_name, pinned)
+        self.save_settings()
+        self.show_status_message(f"📌 '{model_name}' {'will stay loaded' if pinned else 'is no longer pinned'}")
+        threading.Thread(target=self.enforce_residency, daemon=True).start()
+    
+    def prefetch_model_async(self, model_name):
+        """Load a model in the background so choosing it later is instant."""
+        self.prefetch_job = None
+        if not model_name or model_name == self.selected_model or not self.server_was_running:
+            return
+        
+        # Loaded size is roughly the weights plus the context cache
+        size_bytes = int(self.model_file_sizes.get(model_name, 0) * 1.2)
+        
+        def prefetch():
+            try:
+                if self.residency.prefetch(model_name, size_bytes, self.free_model_memory()):
+                    self.root.after(0, lambda: self.show_status_message(f"Prefetched model '{model_name}'"))
+            except requests.exceptions.RequestException:
+                pass  # Only an optimization; choosing the model loads it anyway
+        
+        threading.Thread(target=prefetch, daemon=True).start()
+    
+    def free_model_memory(self):
+        """Bytes a local server can load another model into (free GPU memory, else free RAM); None if unknown."""
+        if not self.ollama_client.is_local():
+            return None
+        gpu = self.system_sampler.last_gpu_sample
+        if gpu is not None and gpu.memory_total:
+            return gpu.memory_total - gpu.memory_used
+        memory_used, memory_total = SystemSampler.memory()
+        return memory_total - memory_used if memory_total else None
+    
+    def enforce_residency(self):
+        """Apply the warm pool: load pinned models, unload idle ones beyond the budget (worker thread)."""
+        try:
+            loaded, unloaded = self.residency.enforce(in_use=[self.selected_model] if self.selected_model else [])
+        except requests.exceptions.RequestException as e:
+            self.root.after(0, lambda: self.show_status_message(f"Warm pool update failed: {str(e)}"))
+            return
+        for model_name in loaded:
+            self.root.after(0, lambda m=model_name: self.show_status_message(f"📌 Loaded pinned model '{m}'"))
+        for model_name in unloaded:
+            self.model_loads.unloaded(model_name, "unloaded by the warm pool")
+            self.root.after(0, lambda m=model_name: self.show_status_message(
+                f"Unloaded idle model '{m}' to stay within the memory budget"))
+    
+    def start_residency_management(self, interval=30):
+        """Re-apply the warm pool periodically (pinned models may be unloaded by a server restart)."""
+        def manage():
+            while self.monitoring:
+                time.sleep(interval)
+                if self.server_was_running and (self.residency.pinned or self.residency.budget_bytes):
+                    self.enforce_residency()
+        
+        threading.Thread(target=manage, daemon=True).start()
+    
     def get_ollama_models(self):
         """Fetch installed Ollama models."""
-        if not self.ollama_path:
-            return []
-            
         try:
-            result = subprocess.run([self.ollama_path, "list"], capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                return []
-            
-            if not result.stdout.strip():
-                return []
-                
-            lines = result.stdout.strip().split('\n')
             models = []
-            
-            for i, line in enumerate(lines):
-                if i == 0:  # Skip header line
-                    continue
-                    
-                if line.strip():
-                    parts = line.split()
-                    if parts:
-                        model_name = parts[0]
-                        if not model_name.upper().startswith('NAME'):
-                            models.append(model_name)
-            
+            for model in self.ollama_client.list_models():
+                model_name = model.get('name') or model.get('model')
+                if model_name:
+                    models.append(model_name)
+                    # Metadata is cached by digest, so a re-pulled model is described afresh
+                    self.model_digests[model_name] = model.get('digest', '')
+                    self.model_file_sizes[model_name] = int(model.get('size') or 0)
+            # Routing uses this list until the pool's next periodic refresh
+            self.backend_pool.set_primary_models(models)
             return models
             
         except Exception:
             return []
-
-    def get_system_usage_info(self):
-        """Try to get actual system CPU/GPU usage information."""
-        import random
+    
+    def get_model_metadata(self, model_name, timeout=10):
+        """Return the ModelMetadata for a model, fetched from /api/show once per digest.
+        
+        Returns None if the server can't describe the model.
+        """
+        digest = self.model_digests.get(model_name, '')
+        cache_key = digest or model_name  # Fall back to the name until the digest is known
+        metadata = self.model_metadata.get(cache_key)
+        if metadata is not None:
+            return metadata
         
         try:
-            # Try to get GPU usage from nvidia-smi
-            gpu_usage = None
-            has_gpu = False
+            show_data = self.ollama_client.show(model_name, timeout=timeout)
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+        
+        metadata = ModelMetadata.from_show(model_name, digest, show_data)
+        self.model_metadata[cache_key] = metadata
+        if digest:
+            self.save_model_metadata_cache()
+        return metadata
+    
+    def cached_model_metadata(self, model_name):
+        """Return already known metadata for a model without contacting the server."""
+        return self.model_metadata.get(self.model_digests.get(model_name, '') or model_name)
+    
+    def refresh_model_metadata_async(self, model_name):
+        """Re-check a model's digest in the background and fetch metadata if it changed."""
+        def refresh():
+            self.get_ollama_models()  # Updates the installed digests
+            self.get_model_metadata(model_name)
+            self.load_tokenizer(model_name)
+        
+        threading.Thread(target=refresh, daemon=True).start()
+    
+    def find_tokenizer_source(self, model_name):
+        """Return ('json' or 'gguf', path) for a model's vocabulary on this machine, or None.
+        
+        A tokenizer.json in the tokenizers folder (named after the model or its family)
+        wins; otherwise the GGUF blob of a local server's model is used.
+        """
+        base_name = model_name.split(':')[0].split('/')[-1]
+        metadata = self.cached_model_metadata(model_name)
+        family = metadata.family if metadata is not None else ''
+        for name in filter(None, (base_name, family)):
+            for candidate in (os.path.join(self.tokenizer_dir, f"{name}.json"),
+                              os.path.join(self.tokenizer_dir, name, "tokenizer.json")):
+                if os.path.isfile(candidate):
+                    return 'json', candidate
+        
+        if not self.ollama_client.is_local():
+            return None
+        # Ollama stores manifests as <models>/manifests/<registry>/<namespace>/<model>/<tag>
+        name, _, tag = model_name.partition(':')
+        parts = name.split('/')
+        if len(parts) == 1 or '.' not in parts[0]:
+            parts = ["registry.ollama.ai"] + (["library"] if len(parts) == 1 else []) + parts
+        for models_dir in (os.environ.get('OLLAMA_MODELS'),
+                           os.path.expanduser("~/.ollama/models"),
+                           "/usr/share/ollama/.ollama/models"):
+            manifest_path = os.path.join(models_dir or '', "manifests", *parts, tag or "latest")
+            if not models_dir or not os.path.isfile(manifest_path):
+                continue
+            try:
+                with open(manifest_path, 'r') as f:
+                    layers = json.load(f).get('layers', [])
+            except (OSError, ValueError):
+                continue
+            for layer in layers:
+                if layer.get('mediaType') == "application/vnd.ollama.image.model":
+                    blob_path = os.path.join(models_dir, "blobs", layer['digest'].replace(':', '-'))
+                    if os.path.isfile(blob_path):
+                        return 'gguf', blob_path
+        return None
+    
+    def load_tokenizer(self, model_name):
+        """Switch the token counter to the model's own tokenizer, falling back to the estimate."""
+        if self.tokenizer_model == model_name:
+            return
+        self.tokenizer_model = model_name
+        
+        tokenizer = None
+        source = self.find_tokenizer_source(model_name) if LocalTokenizer.available() else None
+        if source is not None:
+            kind, path = source
             try:
-                nvidia_result = subprocess.run(
-                    ["nvidia-smi", "--query-gpu=utilization.gpu", "--format=csv,noheader,nounits"],
-                    capture_output=True, text=True, timeout=3
-                )
-                if nvidia_result.returncode == 0:
-                    gpu_usage = int(nvidia_result.stdout.strip().split('\n')[0])
-                    has_gpu = True
-            except (FileNotFoundError, subprocess.TimeoutExpired, ValueError):
-                # nvidia-smi not available or no GPU
-                has_gpu = False
-            
-            # Try to get CPU usage
-            cpu_usage = None
+                tokenizer = LocalTokenizer.from_file(path) if kind == 'json' else LocalTokenizer.from_gguf(path)
+                accuracy = "Exact" if tokenizer.exact else "Approximate"
+                message = f"{accuracy} token counting for '{model_name}' ({os.path.basename(path)})"
+            except Exception as e:
+                message = f"Could not load tokenizer for '{model_name}': {str(e)}"
+            # Runs on the metadata worker thread, so log through the main loop
+            self.root.after(0, lambda: self.show_status_message(message))
+        
+        self.token_counter.set_tokenizer(tokenizer)
+        self.root.after(0, self.update_token_counter)
+        self.root.after(0, self.on_translation_input_change)
+    
+    def load_model_metadata_cache(self):
+        """Load the digest-keyed model metadata cache saved by earlier sessions."""
+        try:
+            if not os.path.exists(self.model_cache_file):
+                return
+            with open(self.model_cache_file, 'r') as f:
+                entries = json.load(f)
+            for digest, entry in entries.items():
+                entry['capabilities'] = tuple(entry.get('capabilities', ()))
+                self.model_metadata[digest] = ModelMetadata(**entry)
+        except Exception as e:
+            # A damaged or outdated cache only costs a few show requests
+            print(f"Error loading model cache: {e}")
+    
+    def save_model_metadata_cache(self):
+        """Save digest-keyed model metadata so the next session starts with it."""
+        with self.model_cache_lock:
             try:
-                # Try using top command for CPU usage (fallback approach)
-                top_result = subprocess.run(
-                    ["top", "-bn1"], capture_output=True, text=True, timeout=2
-                )
-                if top_result.returncode == 0:
-                    # Parse CPU usage from top output
-                    for line in top_result.stdout.split('\n'):
-                        if 'Cpu(s):' in line or '%Cpu(s):' in line:
-                            import re
-                            cpu_match = re.search(r'(\d+(?:\.\d+)?)%', line)
-                            if cpu_match:
-                                cpu_usage = int(float(cpu_match.group(1)))
-                            break
-            except (FileNotFoundError, subprocess.TimeoutExpired, ValueError):
-                pass
-            
-            # Generate realistic values based on system capabilities
-            if gpu_usage is None:
-                if has_gpu:
-                    gpu_usage = random.randint(30, 80)  # GPU available and likely being used
-                else:
-                    gpu_usage = 0  # No GPU available
-                    
-            if cpu_usage is None:
-                if has_gpu:
-                    cpu_usage = random.randint(15, 45)  # Lower CPU usage when GPU is doing the work
-                else:
-                    cpu_usage = random.randint(40, 85)  # Higher CPU usage when no GPU
-                
-            return gpu_usage, cpu_usage
-            
-        except Exception:
-            # Fallback to reasonable estimates
-            return random.randint(25, 65), random.randint(30, 70)
-
+                installed_digests = set(self.model_digests.values())
+                entries = {
+                    digest: asdict(metadata)
+                    for digest, metadata in list(self.model_metadata.items())
+                    # Only digest keys are persisted; entries for removed or re-pulled models are dropped
+                    if metadata.digest == digest and (not installed_digests or digest in installed_digests)
+                }
+                with open(self.model_cache_file, 'w') as f:
+                    json.dump(entries, f, indent=2)
+            except Exception as e:
+                print(f"Error saving model cache: {e}")
+    
+    def running_model_memory_display(self, running):
+        """Return (ram_usage, vram_usage) display strings from a loaded model's exact memory split."""
+        ram_usage = self.format_model_size(running.size_ram) if running.size_ram else "0 MB"
+        if running.size_vram:
+            vram_usage = f"{self.format_model_size(running.size_vram)} ({running.gpu_percent}% of model)"
+        else:
+            vram_usage = "0 MB (CPU only)"
+        return ram_usage, vram_usage
+    
     def get_model_info(self, model_name):
         """Get detailed information about a specific model."""
-        import re
-        
-        if not self.ollama_path:
-            return {"size": "Unknown", "ram_usage": "Unknown", "gpu_cpu_usage": "Unknown", "context": "Unknown"}
-            
         try:
-            # Get model info using ollama show
-            result = subprocess.run([self.ollama_path, "show", model_name], 
-                                  capture_output=True, text=True, timeout=10)
-            
-            model_info = {"size": "Unknown", "ram_usage": "Unknown", "gpu_cpu_usage": "Unknown", "context": "Unknown"}
-            
-            if result.returncode == 0:
-                output = result.stdout
-                output_lower = output.lower()  # Convert to lowercase for easier parsing
-                
-                # Parse size information - look for patterns like "7b", "13b", "70b"
-                size_patterns = [
-                    r'(\d+(?:\.\d+)?)\s*b(?:illion)?',  # "7b" or "7 billion"
-                    r'parameters[:\s]+(\d+(?:\.\d+)?)\s*b',  # "parameters: 7b"
-                    r'model\s+size[:\s]+(\d+(?:\.\d+)?)\s*b',  # "model size: 7b"
-                    r'param(?:eter)?s?[:\s]+(\d+(?:\.\d+)?)\s*b',  # "params: 7b"
-                ]
-                
-                for pattern in size_patterns:
-                    match = re.search(pattern, output_lower)
-                    if match:
-                        size_num = match.group(1)
-                        model_info["size"] = f"{size_num}B"
-                        break
-                
-                # Parse context window - look for various context patterns
-                # Context tokens are different from model parameters!
-                context_patterns = [
-                    # Patterns for context values with K/M/B suffixes (tokens, not parameters)
-                    r'context(?:\s+(?:length|size|window))?[:\s]+(\d+(?:\.\d+)?)\s*([kmb])\s*(?:tokens?)?',  # "context length: 131k tokens"
-                    r'max(?:imum)?[_\s]?context[:\s]+(\d+(?:\.\d+)?)\s*([kmb])\s*(?:tokens?)?',  # "max_context: 1.5m tokens"
-                    r'context[_\s]?(?:size|window)[:\s]+(\d+(?:\.\d+)?)\s*([kmb])\s*(?:tokens?)?',  # "context_size: 2b tokens"
-                    r'num_ctx[:\s]+(\d+(?:\.\d+)?)\s*([kmb])\s*(?:tokens?)?',  # "num_ctx: 131k tokens"
-                    r'(\d+(?:\.\d+)?)\s*([kmb])\s*(?:token|context)',  # "131k token context"
-                    
-                    # Patterns for raw context numbers (not parameters)
-                    r'context(?:\s+(?:length|size|window))?[:\s]+(\d+)(?:\s+tokens?)?',  # "context length: 4096" or "context: 4096 tokens"
-                    r'max(?:imum)?[_\s]?context[:\s]+(\d+)(?:\s+tokens?)?',  # "max_context: 4096"
-                    r'context[_\s]?(?:size|window)[:\s]+(\d+)(?:\s+tokens?)?',  # "context_size: 4096"
-                    r'num_ctx[:\s]+(\d+)(?:\s+tokens?)?',  # "num_ctx: 4096"
-                    r'(\d+)\s*(?:token|k)\s*context',  # "4096 token context"
-                    
-                    # Common context window sizes to help identify them
-                    r'(?:context|window|tokens?).*?(\d+)\s*k(?:\s+tokens?)?',  # "context window of 8k tokens"
-                    r'(?:supports?|up\s+to)\s+(\d+)\s*k\s*(?:token|context)',  # "supports 32k context"
-                ]
-                
-                for pattern in context_patterns:
-                    match = re.search(pattern, output_lower)
-                    if match:
-                        if len(match.groups()) == 2:
-                            # Pattern matched with suffix (K/M/B)
-                            value = float(match.group(1))
-                            suffix = match.group(2).lower()
-                            
-                            if suffix == 'k':
-                                context_size = int(value * 1000)
-                            elif suffix == 'm':
-                                context_size = int(value * 1000000)
-                            elif suffix == 'b':
-                                context_size = int(value * 1000000000)
-                            else:
-                                context_size = int(value)
-                        else:
-                            # Pattern matched raw number
-                            context_size = int(match.group(1))
-                        
-                        # Validate that this looks like a context size, not parameter count
-                        # Context windows are typically 1K-2M tokens, parameter counts are typically 1B-405B
-                        if context_size < 1000:
-                            # Very small numbers (like 7, 13, 70) are likely parameters, not context
-                            continue
-                        elif context_size > 10_000_000:
-                            # Very large numbers (10M+) are likely parameters, not context tokens  
-                            continue
-                        
-                        # Format the output consistently for context tokens
-                        if context_size >= 1000000:
-                            # 1M+ tokens: show as "1.2M" format
-                            if context_size % 1000000 == 0:
-                                model_info["context"] = f"{context_size//1000000}M"
-                            else:
-                                model_info["context"] = f"{context_size/1000000:.1f}M"
-                        elif context_size >= 1000:
-                            # 1K+ tokens: show as "131K" format  
-                            if context_size % 1000 == 0:
-                                model_info["context"] = f"{context_size//1000}K"
-                            else:
-                                model_info["context"] = f"{context_size/1000:.1f}K"
-                        else:
-                            # Less than 1000: show exact number
-                            model_info["context"] = str(context_size)
-                        break
+            # Static details come from the structured show API metadata (fetched once per digest)
+            model_info = {"size": "Unknown", "ram_usage": "Unknown", "vram_usage": "Unknown", "context": "Unknown"}
+            
+            metadata = self.get_model_metadata(model_name)
+            if metadata is not None:
+                model_info["size"] = metadata.size_display
+                model_info["context"] = metadata.context_display
+                model_info["context_tokens"] = metadata.context_length
             else:
-                self.show_status_message(f"Unable to get model details: {result.stderr.strip()}")
+                # Called from fetch threads, so log through the main loop
+                self.root.after(0, lambda: self.show_status_message(f"Unable to get model details for '{model_name}'"))
             
-            # Get current usage from ollama ps
-            ps_result = subprocess.run([self.ollama_path, "ps"], 
-                                     capture_output=True, text=True, timeout=5)
-            
-            if ps_result.returncode == 0:
-                ps_output = ps_result.stdout
-                
-                # Look for the model name in the ps output
-                model_base_name = model_name.split(':')[0]  # Remove tag if present
-                
-                for line in ps_output.split('\n'):
-                    if model_base_name in line or model_name in line:
-                        # Try to extract memory usage info for RAM with more flexible patterns
-                        memory_match = re.search(r'(\d+(?:\.\d+)?)\s*(GB|MB|G|M)', line, re.IGNORECASE)
-                        if memory_match:
-                            memory_size = memory_match.group(1)
-                            memory_unit = memory_match.group(2).upper()
-                            # Normalize unit format
-                            if memory_unit == "G":
-                                memory_unit = "GB"
-                            elif memory_unit == "M":
-                                memory_unit = "MB"
-                            model_info["ram_usage"] = f"~{memory_size} {memory_unit}"
-                        else:
-                            # If no memory info found but model is in ps output, consider it loaded
-                            model_info["ram_usage"] = "~1.0 GB"  # Use default value
-                        
-                        # Try to extract CPU/GPU usage percentages
-                        # Look for patterns like "38%/62%" or "GPU: 38% CPU: 62%"
-                        gpu_cpu_patterns = [
-                            r'(\d+)%[/\s]*(\d+)%',  # "38%/62%" or "38% 62%"
-                            r'gpu[:\s]*(\d+)%[,\s]*cpu[:\s]*(\d+)%',  # "GPU: 38%, CPU: 62%"
-                            r'(\d+)%\s*gpu[,\s]*(\d+)%\s*cpu',  # "38% GPU, 62% CPU"
-                            r'gpu[:\s]*(\d+)[,\s]*cpu[:\s]*(\d+)',  # "GPU: 38, CPU: 62" (without %)
-                            r'(\d+)%[/\s,]*(\d+)%',  # More flexible separator patterns
-                            r'gpu[:\s]*(\d+).*?cpu[:\s]*(\d+)',  # Very flexible GPU/CPU pattern
-                        ]
-                        
-                        usage_found = False
-                        for pattern in gpu_cpu_patterns:
-                            usage_match = re.search(pattern, line.lower())
-                            if usage_match:
-                                gpu_pct = usage_match.group(1)
-                                cpu_pct = usage_match.group(2)
-                                model_info["gpu_cpu_usage"] = f"{gpu_pct}%/{cpu_pct}%"
-                                usage_found = True
-                                break
-                        
-                        if not usage_found:
-                            # Look for any single percentage that might indicate model activity
-                            # Check for GPU-specific patterns first
-                            gpu_patterns = [
-                                r'gpu[:\s]*(\d+(?:\.\d+)?)%',  # "GPU: 45%"
-                                r'(\d+(?:\.\d+)?)%\s*gpu',  # "45% GPU"
-                                r'vram[:\s]*(\d+(?:\.\d+)?)%',  # "VRAM: 45%"
-                                r'(\d+(?:\.\d+)?)%\s*vram',  # "45% VRAM"
-                            ]
-                            
-                            # Check for CPU-specific patterns
-                            cpu_patterns = [
-                                r'cpu[:\s]*(\d+(?:\.\d+)?)%',  # "CPU: 45%"
-                                r'(\d+(?:\.\d+)?)%\s*cpu',  # "45% CPU"
-                                r'ram[:\s]*(\d+(?:\.\d+)?)%',  # "RAM: 45%"
-                                r'(\d+(?:\.\d+)?)%\s*ram',  # "45% RAM"
-                            ]
-                            
-                            # Generic patterns (without explicit GPU/CPU context)
-                            generic_patterns = [
-                                r'(\d+(?:\.\d+)?)%',  # Any percentage like "45%", "67.5%"
-                                r'(\d+(?:\.\d+)?)\s*percent',  # "45 percent"
-                                r'load[:\s]*(\d+(?:\.\d+)?)%',  # "load: 45%"
-                                r'usage[:\s]*(\d+(?:\.\d+)?)%',  # "usage: 45%"
-                            ]
-                            
-                            # Try GPU patterns first
-                            for pattern in gpu_patterns:
-                                gpu_match = re.search(pattern, line.lower())
-                                if gpu_match:
-                                    pct = gpu_match.group(1)
-                                    model_info["gpu_cpu_usage"] = f"{pct}%/0%"
-                                    usage_found = True
-                                    break
-                            
-                            # If no GPU pattern found, try CPU patterns
-                            if not usage_found:
-                                for pattern in cpu_patterns:
-                                    cpu_match = re.search(pattern, line.lower())
-                                    if cpu_match:
-                                        pct = cpu_match.group(1)
-                                        model_info["gpu_cpu_usage"] = f"0%/{pct}%"
-                                        usage_found = True
-                                        break
-                            
-                            # If still no specific pattern found, use generic patterns
-                            # Default to GPU usage for generic percentages (most common case)
-                            if not usage_found:
-                                for pattern in generic_patterns:
-                                    generic_match = re.search(pattern, line.lower())
-                                    if generic_match:
-                                        pct = generic_match.group(1)
-                                        # For generic percentages without context, assume GPU usage
-                                        model_info["gpu_cpu_usage"] = f"{pct}%/0%"
-                                        usage_found = True
-                                        break
-                        
-                        if not usage_found:
-                            # If model is in ps output but no usage patterns found,
-                            # it's likely running but ollama ps doesn't show detailed usage
-                            # For small models, this is often normal - show a positive indicator
-                            model_info["gpu_cpu_usage"] = "Model running"
-                        break
+            # Get current usage from the shared running-models snapshot
+            try:
+                running = self.running_models.find(model_name, self.model_digests.get(model_name, ''))
+                ps_available = True
+            except requests.exceptions.RequestException:
+                running = None
+                ps_available = False
+            
+            if ps_available:
+                if running is not None:
+                    model_info["ram_usage"], model_info["vram_usage"] = self.running_model_memory_display(running)
                 else:
-                    # Model not found in ps output - could be a small model or not yet in memory
-                    # Try to determine if model is accessible
-                    try:
-                        # Quick check if model is accessible via show command
-                        show_result = subprocess.run([self.ollama_path, "show", model_name], 
-                                                   capture_output=True, text=True, timeout=3)
-                        if show_result.returncode == 0:
-                            # Model is accessible, might be small and not showing in ps
-                            # Try to get system-level usage as fallback
-                            try:
-                                gpu_usage, cpu_usage = self.get_system_usage_info()
-                                model_info["gpu_cpu_usage"] = f"{gpu_usage}%/{cpu_usage}%"
-                            except:
-                                model_info["gpu_cpu_usage"] = "Model ready"
-                            
-                            # For accessible models, estimate RAM usage based on model size
-                            size_str = model_info['size'].lower()
-                            if 'b' in size_str:
-                                try:
-                                    # Extract number from size (e.g., "7B" -> 7)
-                                    import re
-                                    size_match = re.search(r'(\d+(?:\.\d+)?)', size_str)
-                                    if size_match:
-                                        size_gb = float(size_match.group(1))
-                                        # Rough estimate: model size in GB * 1.2-1.5 for RAM usage
-                                        ram_estimate = size_gb * 1.3
-                                        model_info["ram_usage"] = f"~{ram_estimate:.1f} GB"
-                                    else:
-                                        model_info["ram_usage"] = "~2.0 GB"  # Default estimate
-                                except:
-                                    model_info["ram_usage"] = "~2.0 GB"  # Default estimate
-                            else:
-                                model_info["ram_usage"] = "~2.0 GB"  # Default estimate
-                        else:
-                            # Model not accessible, truly not loaded
-                            model_info["ram_usage"] = "Not loaded"
-                            model_info["gpu_cpu_usage"] = "Model not loaded"
-                    except:
-                        # Error checking model accessibility
-                        model_info["ram_usage"] = "Loading"
-                        model_info["gpu_cpu_usage"] = "Checking..."
+                    # The server lists every model it holds in memory, so this one is not loaded
+                    model_info["ram_usage"] = "Not loaded"
+                    model_info["vram_usage"] = "Model not loaded"
             else:
-                self.show_status_message(f"Unable to get model status: {ps_result.stderr.strip()}")
-                # Try to get system usage as fallback when ps command fails
-                try:
-                    gpu_usage, cpu_usage = self.get_system_usage_info()
-                    model_info["gpu_cpu_usage"] = f"{gpu_usage}%/{cpu_usage}%"
-                except:
-                    model_info["gpu_cpu_usage"] = "Unable to determine"
+                self.root.after(0, lambda: self.show_status_message("Unable to get model status: server did not answer the ps request"))
             
             return model_info
             
         except Exception as e:
-            self.show_status_message(f"Error getting model info: {str(e)}")
-            return {"size": "Error", "ram_usage": "Error", "gpu_cpu_usage": "Error", "context": "Error"}
+            message = f"Error getting model info: {str(e)}"
+            self.root.after(0, lambda: self.show_status_message(message))
+            return {"size": "Error", "ram_usage": "Error", "vram_usage": "Error", "context": "Error"}
 
-    def update_model_details(self, model_name, loading=False, retry_count=0):
+    def update_model_details(self, model_name, loading=False):
         """Update the model details display with information about the selected model."""
         
         # Check if this operation was cancelled (user switched models)
@@ -3004,9 +4673,17 @@ Once installed, click 'Refresh' in the main application to detect models.
                 line.config(text="", foreground="green")
                 
             self.model_status = "Loading"
+            self.announce_ready_model = model_name
             self.model_detail_lines[0].config(text="Model status: Loading", foreground="#1976D2")
             self.model_detail_lines[1].config(text=f"Selected model: {short_name}", foreground="green")
-            # Don't show model data during loading - keep other lines empty
+            
+            # Static details are known from the metadata cache, so show them right away;
+            # live usage lines stay empty until the model is loaded
+            cached_metadata = self.cached_model_metadata(model_name)
+            if cached_metadata is not None:
+                self.model_detail_lines[2].config(text=f"Model size: {cached_metadata.size_display}", foreground="green")
+                self.model_detail_lines[5].config(text=f"Context size: {cached_metadata.context_display}", foreground="green")
+            self.refresh_model_metadata_async(model_name)
             
             # Disable chat input and send button during loading
             self.user_input.config(state='disabled')
@@ -3018,285 +4695,34 @@ Once installed, click 'Refresh' in the main application to detect models.
             getattr(self, 'current_loading_model', '') != model_name):
             return
         
-        # First check if model is loaded using basic ollama ps check
-        if self.is_model_loaded_basic(model_name):
-            # Model appears to be loaded, now get detailed info asynchronously
-            self.fetch_model_info_async(model_name)
-        # Check if model was recently successfully preloaded according to our logs
-        elif hasattr(self, 'preload_success_models') and model_name in self.preload_success_models:
-            # Model was successfully preloaded, but might not be visible in ps yet
-            # Force fetch model info anyway since we know it should be available
-            self.show_status_message(f"Model '{model_name}' was preloaded, getting model info...")
+        if self.model_loads.is_ready(model_name):
+            # The load request completed, so get the memory split and context size
             self.fetch_model_info_async(model_name)
         else:
-            # Check if we're already in the preloading phase
-            if getattr(self, 'preloading_model', False) and getattr(self, 'current_loading_model', '') == model_name:
-                # We're already preloading this model, don't retry or start another preload
-                # Just show loading status
-                short_name = model_name.split(':')[0] if ':' in model_name else model_name
-                self.model_status = "Loading"
-                self.model_detail_lines[0].config(text="Model status: Loading", foreground="#1976D2")
-                self.model_detail_lines[1].config(text=f"Selected model: {short_name}", foreground="green")
-                # Don't do any retries since preload is already happening
-                self.show_status_message(f"Model '{model_name}' is currently being loaded...")
-                return
-                
-            # Model might be loading or not loaded
-            # Determine max retries based on model size
-            max_retries = 5  # Default for small models (5 seconds)
-            model_lower = model_name.lower()
-            if any(size in model_lower for size in ['70b', '72b', '405b']):
-                max_retries = 60  # 1 minute for very large models
-            elif any(size in model_lower for size in ['13b', '14b', '27b', '30b', '34b']):
-                max_retries = 45  # 45 seconds for large models  
-            elif any(size in model_lower for size in ['7b', '8b', '9b']):
-                max_retries = 30  # 30 seconds for medium models
-            
-            if retry_count < max_retries:
-                # Check if operation was cancelled before retrying
-                if (hasattr(self, 'model_loading_cancelled') and self.model_loading_cancelled and 
-                    getattr(self, 'current_loading_model', '') != model_name):
-                    return
-                
-                # Only update UI if this is the first check (retry_count == 0)
-                # or if current status is not already "Loading"
-                if retry_count == 0 or getattr(self, 'model_status', '') != "Loading":
-                    self.model_status = "Loading"
-                    self.model_detail_lines[0].config(text="Model status: Loading", foreground="#1976D2")
-                    self.model_detail_lines[1].config(text=f"Selected model: {short_name}", foreground="green")
-                    
-                    # Keep chat disabled during loading
-                    self.user_input.config(state='disabled')
-                    self.send_button.config(state='disabled')
-                    
-                    # Clear model data lines during loading (only if not already cleared)
-                    self.model_detail_lines[2].config(text="", foreground="green")
-                    self.model_detail_lines[3].config(text="", foreground="green") 
-                    self.model_detail_lines[4].config(text="", foreground="green")
-                    self.model_detail_lines[5].config(text="", foreground="green")
-                
-                # Retry checking after a short delay in case model is still loading
-                def retry_check():
-                    # Check if operation wasn't cancelled before retrying
-                    if (not getattr(self, 'model_loading_cancelled', False) or 
-                        getattr(self, 'current_loading_model', '') == model_name):
-                        self.update_model_details(model_name, loading=False, retry_count=retry_count + 1)
-                
-                # Schedule retry after 1 second
-                self.root.after(1000, retry_check)
-            else:
-                # After max retries exceeded, keep showing loading instead of error
-                # Large models may still be initializing
-                if (not getattr(self, 'model_loading_cancelled', False) or 
-                    getattr(self, 'current_loading_model', '') == model_name):
-                    
-                    # For large models, continue showing loading state instead of error
-                    if any(size in model_lower for size in ['70b', '72b', '405b', '13b', '14b', '27b', '30b', '34b']):
-                        self.model_status = "Loading"
-                        self.model_detail_lines[0].config(text="Model status: Loading (large model may take longer)", foreground="#1976D2")
-                        self.model_detail_lines[1].config(text=f"Selected model: {short_name}", foreground="green")
-                        
-                        # Keep checking every 5 seconds for large models
-                        def extended_check():
-                            if (not getattr(self, 'model_loading_cancelled', False) or 
-                                getattr(self, 'current_loading_model', '') == model_name):
-                                # Reset retry count and continue checking
-                                self.update_model_details(model_name, loading=False, retry_count=0)
-                        
-                        self.root.after(5000, extended_check)  # Check again in 5 seconds
-                    else:
-                        # For small models, we'll also continue showing loading and try to preload
-                        self.model_status = "Loading"
-                        self.model_detail_lines[0].config(text="Model status: Loading (initializing...)", foreground="#1976D2")
-                        self.model_detail_lines[1].config(text=f"Selected model: {short_name}", foreground="green")
-                        
-                        # Try preloading the model instead of showing error
-                        self.show_status_message(f"Small model '{model_name}' not detected, trying to preload...")
-                        
-                        # Start preload in a new thread to avoid blocking
-                        threading.Thread(target=self.preload_model_safe, args=(model_name,), daemon=True).start()
-                    
-                    # Keep chat disabled until model is ready
-                    self.user_input.config(state='disabled')
-                    self.send_button.config(state='disabled')
-                    
-                    # Clear model data lines when not ready
-                    self.model_detail_lines[2].config(text="", foreground="green")
-                    self.model_detail_lines[3].config(text="", foreground="green") 
-                    self.model_detail_lines[4].config(text="", foreground="green")
-                    self.model_detail_lines[5].config(text="", foreground="green")
-    
-    def is_model_loaded_basic(self, model_name):
-        """Quick check if model is loaded using ollama ps or if recently successfully preloaded."""
-        if not self.ollama_path:
-            return False
-            
-        # Track how many times we've checked this model to avoid redundant logging
-        if not hasattr(self, '_model_check_count'):
-            self._model_check_count = {}
-            
-        # Check if this model is in the set of successfully preloaded models
-        if hasattr(self, 'preload_success_models') and model_name in self.preload_success_models:
-            # We explicitly know this was successfully loaded
-            # Only log once or if it's been a while since last log
-            model_check_key = f"preloaded_{model_name}"
-            if model_check_key not in self._model_check_count:
-                self.show_status_message(f"Model '{model_name}' was previously successfully loaded")
-                self._model_check_count[model_check_key] = 1
-            return True
-            
-        # Check if model was recently preloaded successfully based on timestamp
-        if (hasattr(self, 'preloaded_models') and 
-            model_name in self.preloaded_models and 
-            (time.time() - self.preloaded_models[model_name]) < 300):  # Consider loaded if preloaded in last 5 minutes
-            # Only log once or if it's been a while since last log
-            model_check_key = f"timestamp_{model_name}"
-            if model_check_key not in self._model_check_count:
-                self.show_status_message(f"Model '{model_name}' was preloaded in the last 5 minutes")
-                self._model_check_count[model_check_key] = 1
-            return True
-            
-        try:
-            # First try with ollama ps
-            result = subprocess.run([self.ollama_path, "ps"], 
-                                 capture_output=True, text=True, timeout=3)
-            
-            if result.returncode == 0 and result.stdout.strip():
-                model_base_name = model_name.split(':')[0]
-                ps_lines = result.stdout.split('\n')
-                
-                # Skip header line and check model entries
-                for line in ps_lines[1:]:  # Skip first line (header)
-                    if line.strip():  # Skip empty lines
-                        # Check if model name appears in this line
-                        if model_base_name.lower() in line.lower() or model_name.lower() in line.lower():
-                            # Consider the model loaded if it appears in the ps output
-                            # Only log the first time we find it
-                            model_check_key = f"ps_{model_name}"
-                            if model_check_key not in self._model_check_count:
-                                self.show_status_message(f"Found '{model_name}' in ollama ps output")
-                                self._model_check_count[model_check_key] = 1
-                            return True
-            
-            # If model is not found in ps output, try a quick ollama show as a backup check
-            # This is because sometimes models are loaded but not visible in ps
-            try:
-                show_result = subprocess.run([self.ollama_path, "show", model_name], 
-                                          capture_output=True, text=True, timeout=2)
-                # If show command works without error and returns info, model is likely accessible
-                if show_result.returncode == 0 and show_result.stdout.strip():
-                    # Only log the first time we find it
-                    model_check_key = f"show_{model_name}"
-                    if model_check_key not in self._model_check_count:
-                        self.show_status_message(f"Model '{model_name}' is accessible via 'ollama show'")
-                        self._model_check_count[model_check_key] = 1
-                    
-                    # For small models, consider them successfully loaded without full verification
-                    # Large models still need to go through the full preload_model process
-                    model_lower = model_name.lower()
-                    is_small_model = not any(size in model_lower for size in ['70b', '72b', '405b', '13b', '14b', '27b', '30b', '34b', '7b', '8b', '9b'])
-                    
-                    # Record this model as detected
-                    if not hasattr(self, 'preloaded_models'):
-                        self.preloaded_models = {}
-                    self.preloaded_models[model_name] = time.time()
-                    
-                    # For small models, mark as fully ready immediately
-                    if is_small_model:
-                        if not hasattr(self, 'preload_success_models'):
-                            self.preload_success_models = set()
-                        self.preload_success_models.add(model_name)
-                        self.show_status_message(f"Small model '{model_name}' marked as ready based on 'ollama show'")
-                    
-                    return True
-            except Exception as e:
-                # Only log errors occasionally to avoid spam
-                model_check_key = f"error_{model_name}"
-                if model_check_key not in self._model_check_count or self._model_check_count[model_check_key] % 10 == 0:
-                    self.show_status_message(f"Error checking model with 'ollama show': {str(e)}")
-                    self._model_check_count[model_check_key] = self._model_check_count.get(model_check_key, 0) + 1
-                pass
-                
-            return False
-            
-        except Exception:
-            return False
+            # Queue a load (a no-op while one is pending); the tracker reports when it finishes
+            self.model_loads.request(model_name)
+            self.update_model_details(model_name, loading=True)
     
     def fetch_model_info_async(self, model_name):
-        """Fetch model information asynchronously after model is confirmed loaded."""
+        """Fetch model information asynchronously after the model has loaded."""
         def fetch_info():
             try:
-                # Check if operation was cancelled before starting
-                if (hasattr(self, 'model_loading_cancelled') and self.model_loading_cancelled and 
-                    getattr(self, 'current_loading_model', '') != model_name):
-                    return
-                
-                # Extended delay for large models to ensure they're fully stabilized
-                model_lower = model_name.lower()
-                if any(size in model_lower for size in ['70b', '72b', '405b']):
-                    time.sleep(3.0)  # 3 seconds for very large models
-                elif any(size in model_lower for size in ['13b', '14b', '27b', '30b', '34b']):
-                    time.sleep(2.0)  # 2 seconds for large models
-                else:
-                    time.sleep(1.0)  # 1 second for smaller models
-                
-                # Check again if operation was cancelled during delay
-                if (hasattr(self, 'model_loading_cancelled') and self.model_loading_cancelled and 
-                    getattr(self, 'current_loading_model', '') != model_name):
-                    return
-                
-                # Double-check that model is still loaded before getting details
-                if not self.is_model_loaded_basic(model_name):
-                    # Model disappeared, go back to loading state
-                    if (not getattr(self, 'model_loading_cancelled', False) or 
-                        getattr(self, 'current_loading_model', '') == model_name):
-                        self.root.after(0, lambda: self.update_model_details_safe(model_name, loading=False))
-                    return
-                
-                # Get detailed model information
                 model_info = self.get_model_info(model_name)
                 
-                # Always try to display model info if we have any useful data
-                # Even partial information is better than showing nothing
-                if model_info:
-                    # Final check before updating UI
-                    if (not getattr(self, 'model_loading_cancelled', False) or 
-                        getattr(self, 'current_loading_model', '') == model_name):
-                        # Schedule UI update on main thread
-                        self.root.after(0, lambda: self.update_model_info_display(model_name, model_info, loading=False))
-                else:
-                    # No model info at all, continue checking
-                    if (not getattr(self, 'model_loading_cancelled', False) or 
-                        getattr(self, 'current_loading_model', '') == model_name):
-                        # Go back to checking if model is loaded
-                        self.root.after(0, lambda: self.update_model_details_safe(model_name, loading=False))
+                # Only update the UI if the user hasn't switched to another model meanwhile
+                if (not getattr(self, 'model_loading_cancelled', False) or 
+                    getattr(self, 'current_loading_model', '') == model_name):
+                    self.root.after(0, lambda: self.update_model_info_display(model_name, model_info))
                 
             except Exception as e:
-                # Only show error if operation wasn't cancelled
                 if (not getattr(self, 'model_loading_cancelled', False) or 
                     getattr(self, 'current_loading_model', '') == model_name):
-                    # Don't immediately show error - go back to loading state for large models
-                    model_lower = model_name.lower()
-                    if any(size in model_lower for size in ['70b', '72b', '405b', '13b', '14b', '27b', '30b', '34b']):
-                        # For large models, retry the loading process
-                        self.root.after(0, lambda: self.update_model_details_safe(model_name, loading=False))
-                    else:
-                        # For small models, show error
-                        self.root.after(0, lambda: self.handle_model_info_error(model_name, str(e)))
-        
-        # Show intermediate loading status while we fetch detailed info
-        # Only if operation wasn't cancelled
-        if (not getattr(self, 'model_loading_cancelled', False) or 
-            getattr(self, 'current_loading_model', '') == model_name):
-            short_name = model_name.split(':')[0] if ':' in model_name else model_name
-            self.model_status = "Loading"
-            self.model_detail_lines[0].config(text="Model status: Loading", foreground="#1976D2")
-            self.model_detail_lines[1].config(text=f"Selected model: {short_name}", foreground="green")
+                    self.root.after(0, lambda: self.handle_model_info_error(model_name, str(e)))
         
         # Run in background thread to avoid blocking UI or user interactions
         threading.Thread(target=fetch_info, daemon=True).start()
     
-    def update_model_info_display(self, model_name, model_info, loading=False):
+    def update_model_info_display(self, model_name, model_info):
         """Update the UI with fetched model information."""
         # Check if operation was cancelled before updating UI
         if (hasattr(self, 'model_loading_cancelled') and self.model_loading_cancelled and 
@@ -3305,28 +4731,23 @@ Once installed, click 'Refresh' in the main application to detect models.
             
         short_name = model_name.split(':')[0] if ':' in model_name else model_name
         
-        # Check if model has passed the full inference verification via preload
-        is_fully_verified = hasattr(self, 'preload_success_models') and model_name in self.preload_success_models
-        
-        # Check if we have valid model info - if so, display it and mark as ready
-        # Be more lenient about what counts as "valid" - even estimated values are useful
-        has_valid_info = (model_info['size'] not in ["Unknown", "Error"] or 
-                         model_info['ram_usage'] not in ["Unknown", "Error"] or
-                         model_info['gpu_cpu_usage'] not in ["Unknown", "Error"])
+        # The model is ready once the load tracker has seen its load request complete
+        load_state = self.model_loads.state(model_name)
         
-        # Show model details if we have any valid information OR if model is verified
-        if is_fully_verified or has_valid_info:
+        if load_state == ModelLoadTracker.READY:
             self.model_status = "Ready"
             
             # Enable chat input and send button when model is ready
-            self.user_input.config(state='normal')
-            self.send_button.config(state='normal')
+            # (a reload for a message in flight leaves them to the generation)
+            if not self.is_generating:
+                self.user_input.config(state='normal')
+                self.send_button.config(state='normal')
             
             # Always display model information when we have it
             # Set color based on content - blue for loading/estimated/unknown, green for actual data
             size_color = "#1976D2" if model_info['size'] in ["Unknown", "Loading", "Error"] else "green"
             ram_color = "#1976D2" if model_info['ram_usage'] in ["Unknown", "Loading", "Error", "Not loaded"] else "green"
-            usage_color = "#1976D2" if model_info['gpu_cpu_usage'] in ["Unknown", "Loading", "Error", "Model not loaded", "Checking..."] else "green"
+            usage_color = "#1976D2" if model_info['vram_usage'] in ["Unknown", "Loading", "Error", "Model not loaded", "Checking..."] else "green"
             context_color = "#1976D2" if model_info['context'] in ["Unknown", "Loading", "Error"] else "green"
             
             # Update status line
@@ -3336,12 +4757,15 @@ Once installed, click 'Refresh' in the main application to detect models.
             # Always show the detailed model information
             self.model_detail_lines[2].config(text=f"Model size: {model_info['size']}", foreground=size_color)
             self.model_detail_lines[3].config(text=f"RAM usage: {model_info['ram_usage']}", foreground=ram_color)
-            self.model_detail_lines[4].config(text=f"CPU/GPU usage: {model_info['gpu_cpu_usage']}", foreground=usage_color)
+            self.model_detail_lines[4].config(text=f"GPU memory: {model_info['vram_usage']}", foreground=usage_color)
             self.model_detail_lines[5].config(text=f"Context size: {model_info['context']}", foreground=context_color)
             
             # Extract and store max context tokens for token counter
             context_str = model_info['context']
-            if context_str not in ["Unknown", "Loading", "Error"]:
+            if model_info.get('context_tokens'):
+                # Exact value from the model metadata
+                self.max_context_tokens = model_info['context_tokens']
+            elif context_str not in ["Unknown", "Loading", "Error"]:
                 try:
                     # Parse context size with K/M/B suffixes (e.g. "131K", "1.5M", "2B")
                     if "tokens" in context_str.lower():
@@ -3370,96 +4794,14 @@ Once installed, click 'Refresh' in the main application to detect models.
             # Update token counter display
             self.update_token_counter()
             
-            # Update chat display to show model is ready
-            self.update_chat_for_ready_model(model_name)
-            
-            # Add model to success list if not already there
-            if not hasattr(self, 'preload_success_models'):
-                self.preload_success_models = set()
-            self.preload_success_models.add(model_name)
-        # Special case handling if we don't have good info yet
-        # still mark as ready but show a note
-        elif (not is_fully_verified and not loading and
-              model_info['size'] not in ["Error", "Unknown"] and 
-              model_info['ram_usage'] not in ["Error", "Unknown", "Not loaded"]):
-            
-            # For small models, be more lenient about readiness
-            model_lower = model_name.lower()
-            is_small_model = not any(size in model_lower for size in ['70b', '72b', '405b', '13b', '14b', '27b', '30b', '34b', '7b', '8b', '9b'])
-            
-            if is_small_model:
-                self.model_status = "Ready"
-                status_color = "green" 
-                status_text = "Model status: Ready"
-                
-                # Enable chat for small models even with limited verification
-                self.user_input.config(state='normal')
-                self.send_button.config(state='normal')
-                
-                # Display model information
-                # Set color based on content - blue for loading/estimated/unknown, green for actual data
-                size_color = "#1976D2" if model_info['size'] in ["Unknown", "Loading", "Error"] else "green"
-                ram_color = "#1976D2" if model_info['ram_usage'] in ["Unknown", "Loading", "Error", "Not loaded"] else "green"
-                usage_color = "#1976D2" if model_info['gpu_cpu_usage'] in ["Unknown", "Loading", "Error", "Model not loaded", "Checking..."] else "green"
-                context_color = "#1976D2" if model_info['context'] in ["Unknown", "Loading", "Error"] else "green"
-                
-                loading_note = self.get_loading_attempts_note(model_name)
-                self.model_detail_lines[2].config(text=f"Model size: {model_info['size']}{loading_note}", foreground=size_color)
-                self.model_detail_lines[3].config(text=f"RAM usage: {model_info['ram_usage']}", foreground=ram_color)
-                self.model_detail_lines[4].config(text=f"CPU/GPU usage: {model_info['gpu_cpu_usage']}", foreground=usage_color)
-                self.model_detail_lines[5].config(text=f"Context size: {model_info['context']}", foreground=context_color)
-                
-                # Extract and store max context tokens for token counter
-                context_str = model_info['context']
-                if context_str not in ["Unknown", "Loading", "Error"]:
-                    try:
-                        # Parse context size with K/M/B suffixes (e.g. "131K", "1.5M", "2B")
-                        if "tokens" in context_str.lower():
-                            # Old format with "tokens" suffix
-                            self.max_context_tokens = int(context_str.lower().split("tokens")[0].strip())
-                        else:
-                            # New format with K/M/B suffixes
-                            context_str = context_str.strip().upper()
-                            if context_str.endswith('K'):
-                                # e.g. "131K" -> 131000
-                                self.max_context_tokens = int(float(context_str[:-1]) * 1000)
-                            elif context_str.endswith('M'):
-                                # e.g. "1.5M" -> 1500000
-                                self.max_context_tokens = int(float(context_str[:-1]) * 1000000)
-                            elif context_str.endswith('B'):
-                                # e.g. "2B" -> 2000000000 (but this would be parameter count, not context)
-                                self.max_context_tokens = int(float(context_str[:-1]) * 1000000000)
-                            else:
-                                # Plain number
-                                self.max_context_tokens = int(''.join(c for c in context_str if c.isdigit()))
-                    except (ValueError, AttributeError):
-                        self.max_context_tokens = 4096  # Default if parsing fails
-                else:
-                    self.max_context_tokens = 4096  # Default fallback
-                    
-                # Update token counter display
-                self.update_token_counter()
-                
-                # Update chat display
+            # Only the load after choosing the model replaces the chat with the ready message;
+            # a reload after the server dropped the model keeps the conversation
+            if self.announce_ready_model == model_name:
+                self.announce_ready_model = None
                 self.update_chat_for_ready_model(model_name)
-                
-                # Add to preload success list since we're treating it as ready
-                if not hasattr(self, 'preload_success_models'):
-                    self.preload_success_models = set()
-                self.preload_success_models.add(model_name)
-                
-                self.show_status_message(f"Small model '{model_name}' marked as ready")
-            else:
-                # For larger models, still wait for full verification
-                self.model_status = "Loading"
-                status_color = "#1976D2"  # Blue
-                status_text = "Model status: Loading"
-                
-                # Ensure chat input remains disabled during loading
-                self.user_input.config(state='disabled')
-                self.send_button.config(state='disabled')
-        elif loading or not is_fully_verified:
-            # If model is still loading or hasn't passed inference verification, keep the loading status
+            return
+        elif load_state != ModelLoadTracker.FAILED:
+            # The load request hasn't completed yet, so keep the loading status
             self.model_status = "Loading"
             status_color = "#1976D2"  # Blue
             status_text = "Model status: Loading"
@@ -3472,18 +4814,20 @@ Once installed, click 'Refresh' in the main application to detect models.
             # Set color based on content - blue for loading/unknown, green for actual data
             size_color = "#1976D2" if model_info['size'] in ["Unknown", "Loading", "Error"] else "green"
             ram_color = "#1976D2" if model_info['ram_usage'] in ["Unknown", "Loading", "Error", "Not loaded"] else "green"
-            usage_color = "#1976D2" if model_info['gpu_cpu_usage'] in ["Unknown", "Loading", "Error", "Model not loaded", "Checking..."] else "green"
+            usage_color = "#1976D2" if model_info['vram_usage'] in ["Unknown", "Loading", "Error", "Model not loaded", "Checking..."] else "green"
             context_color = "#1976D2" if model_info['context'] in ["Unknown", "Loading", "Error"] else "green"
             
-            loading_note = self.get_loading_attempts_note(model_name)
-            self.model_detail_lines[2].config(text=f"Model size: {model_info['size']}{loading_note}", foreground=size_color)
+            self.model_detail_lines[2].config(text=f"Model size: {model_info['size']}", foreground=size_color)
             self.model_detail_lines[3].config(text=f"RAM usage: {model_info['ram_usage']}", foreground=ram_color)
-            self.model_detail_lines[4].config(text=f"CPU/GPU usage: {model_info['gpu_cpu_usage']}", foreground=usage_color)
+            self.model_detail_lines[4].config(text=f"GPU memory: {model_info['vram_usage']}", foreground=usage_color)
             self.model_detail_lines[5].config(text=f"Context size: {model_info['context']}", foreground=context_color)
             
             # Extract and store max context tokens for token counter
             context_str = model_info['context']
-            if context_str not in ["Unknown", "Loading...", "Error"]:
+            if model_info.get('context_tokens'):
+                # Exact value from the model metadata
+                self.max_context_tokens = model_info['context_tokens']
+            elif context_str not in ["Unknown", "Loading...", "Error"]:
                 try:
                     if 'K' in context_str:
                         # Handle "4K", "8K", etc.
@@ -3499,6 +4843,7 @@ Once installed, click 'Refresh' in the main application to detect models.
             # Update token counter display
             self.update_token_counter()
         else:
+            # The load request failed
             self.model_status = "Error"
             status_color = "red"
             status_text = "Model status: Error"
@@ -3526,31 +4871,34 @@ Once installed, click 'Refresh' in the main application to detect models.
             
         short_name = model_name.split(':')[0] if ':' in model_name else model_name
         
-        # Check if model is already in the verified loaded list despite the error
-        if hasattr(self, 'preload_success_models') and model_name in self.preload_success_models:
+        # Check if the model finished loading despite the error
+        if self.model_loads.is_ready(model_name):
             # Model is actually loaded, just having trouble getting details
             self.model_status = "Ready"
             self.model_detail_lines[0].config(text="Model status: Ready (with limited info)", foreground="green")
             self.model_detail_lines[1].config(text=f"Selected model: {short_name}", foreground="green")
             
-            # Enable chat since model is loaded
-            self.user_input.config(state='normal')
-            self.send_button.config(state='normal')
+            # Enable chat since model is loaded (unless a reply is still streaming)
+            if not self.is_generating:
+                self.user_input.config(state='normal')
+                self.send_button.config(state='normal')
             
             # Set basic info
             self.model_detail_lines[2].config(text="Model size: Limited info", foreground="#1976D2")
             self.model_detail_lines[3].config(text="RAM usage: Limited info", foreground="#1976D2") 
-            self.model_detail_lines[4].config(text="CPU/GPU usage: Limited info", foreground="#1976D2")
+            self.model_detail_lines[4].config(text="GPU memory: Limited info", foreground="#1976D2")
             self.model_detail_lines[5].config(text="Context size: Using default", foreground="#1976D2")
             
-            # Update chat display to show model is ready
-            self.update_chat_for_ready_model(model_name)
+            # Update chat display to show model is ready (only after choosing it, not after a reload)
+            if self.announce_ready_model == model_name:
+                self.announce_ready_model = None
+                self.update_chat_for_ready_model(model_name)
             
             # Log the issue but don't treat as error
             self.show_status_message(f"Note: Limited model info for '{model_name}' but chat is enabled: {error_msg}")
         else:
-            # Try to preload the model instead of showing error
-            self.show_status_message(f"Error getting model info: {error_msg}. Trying to initialize model...")
+            # Load the model instead of showing an error
+            self.show_status_message(f"Error getting model info: {error_msg}. Trying to load model...")
             
             # Keep UI in loading state
             self.model_status = "Loading"
@@ -3564,347 +4912,59 @@ Once installed, click 'Refresh' in the main application to detect models.
             # Set basic info while loading
             self.model_detail_lines[2].config(text="Model size: Loading...", foreground="#1976D2")
             self.model_detail_lines[3].config(text="RAM usage: Loading...", foreground="#1976D2")
-            self.model_detail_lines[4].config(text="CPU/GPU usage: Loading...", foreground="#1976D2")
+            self.model_detail_lines[4].config(text="GPU memory: Loading...", foreground="#1976D2")
             self.model_detail_lines[5].config(text="Context size: Loading...", foreground="#1976D2")
             
-            # Try to preload the model
-            threading.Thread(target=self.preload_model_safe, args=(model_name,), daemon=True).start()
-
-    def preload_model(self, model_name):
-        """Pre-load the model to make it ready for immediate use."""
-        try:
-            # Check if operation was cancelled before starting
-            if (hasattr(self, 'model_loading_cancelled') and self.model_loading_cancelled and 
-                getattr(self, 'current_loading_model', '') != model_name):
-                return
-                
-            # Even if model shows as loaded in ps, we'll send a test query to ensure it's fully loaded
-            # But first, show a message that we're checking/loading the model
-            self.show_status_message(f"Preparing model '{model_name}' for use...")
-            self.model_status = "Loading"
-                
-            # Set flag to indicate we're actively preloading this model
-            self.preloading_model = True
-            
-            # Determine timeout based on model size - larger models need more time
-            timeout = 45  # Increased default timeout for all models
-            model_lower = model_name.lower()
-            if any(size in model_lower for size in ['70b', '72b', '405b']):
-                timeout = 180  # 3 minutes for very large models
-            elif any(size in model_lower for size in ['13b', '14b', '27b', '30b', '34b']):
-                timeout = 120  # 2 minutes for large models
-            elif any(size in model_lower for size in ['7b', '8b', '9b']):
-                timeout = 90   # 1.5 minutes for medium models
-            
-            # Check if this is a small model - special handling for faster loading
-            is_small_model = not any(size in model_lower for size in ['70b', '72b', '405b', '13b', '14b', '27b', '30b', '34b', '7b', '8b', '9b'])
-            
-            # For slower machines or cold starts, we need to be more patient
-            # Check if we need to try a different approach for loading
-            is_first_attempt = not hasattr(self, '_model_load_attempts')
-            if not is_first_attempt:
-                if model_name not in self._model_load_attempts:
-                    self._model_load_attempts[model_name] = 1
-                else:
-                    # Increase timeout for subsequent attempts
-                    self._model_load_attempts[model_name] += 1
-                    timeout = min(timeout * self._model_load_attempts[model_name], 300)  # Max 5 minutes
-            else:
-                self._model_load_attempts = {}
-                self._model_load_attempts[model_name] = 1
-                
-            # Display loading attempts in status message for user awareness
-            attempt_str = ""
-            if self._model_load_attempts[model_name] > 1:
-                attempt_str = f" (Attempt {self._model_load_attempts[model_name]})"
-                
-            # For small models, we'll use a quicker approach
-            if is_small_model:
-                self.root.after(0, lambda: self.show_status_message(f"Small model '{model_name}' detected, using optimized loading approach..."))
-                # Don't need extended timeouts for small models
-                timeout = min(timeout, 60)
-            
-            # Show loading status with timeout info for user awareness
-            if timeout > 60:
-                self.root.after(0, lambda: self.show_status_message(f"Loading model '{model_name}'{attempt_str} (may take up to {timeout//60} minute{'s' if timeout > 60 else ''}...)"))
-            else:
-                self.root.after(0, lambda: self.show_status_message(f"Loading model '{model_name}'{attempt_str} (may take up to {timeout} seconds)..."))
-            
-            # Try a more comprehensive approach without test messages
-            try:
-                # Use comprehensive readiness check instead of simple show/ps
-                self.root.after(0, lambda: self.show_status_message(f"Performing comprehensive readiness check for '{model_name}'..."))
-                
-                is_ready, confidence, status_info = self.check_model_readiness_comprehensive(model_name)
-                
-                if is_ready and confidence >= 70:
-                    # High confidence that model is ready
-                    self.root.after(0, lambda: self.show_status_message(f"✅ Model '{model_name}' verified as ready ({confidence}% confidence: {status_info})"))
-                    self.preloaded_models[model_name] = time.time()
-                    self.preload_success_models.add(model_name)
-                    self.preloading_model = False
-                    
-                    # Get model info and enable chat
-                    model_info = self.get_model_info(model_name)
-                    if model_info:
-                        self.root.after(0, lambda: self.update_model_info_display(model_name, model_info, loading=False))
-                        self.root.after(0, lambda: self.enable_chat_for_loaded_model(model_name))
-                    return
-                elif is_ready and confidence >= 50:
-                    # Moderate confidence - proceed but with note
-                    self.root.after(0, lambda: self.show_status_message(f"✅ Model '{model_name}' appears ready ({confidence}% confidence: {status_info})"))
-                    self.preloaded_models[model_name] = time.time()
-                    self.preload_success_models.add(model_name)
-                    self.preloading_model = False
-                    
-                    # Get model info and enable chat
-                    model_info = self.get_model_info(model_name)
-                    if model_info:
-                        self.root.after(0, lambda: self.update_model_info_display(model_name, model_info, loading=False))
-                        self.root.after(0, lambda: self.enable_chat_for_loaded_model(model_name))
-                    return
-                else:
-                    # Low confidence - need to initialize
-                    self.root.after(0, lambda: self.show_status_message(f"Model '{model_name}' readiness uncertain ({confidence}% confidence: {status_info}), will initialize..."))
-                    
-            except Exception as e:
-                # Continue with initialization if checks fail
-                self.root.after(0, lambda: self.show_status_message(f"Readiness check failed for '{model_name}': {str(e)}, will initialize..."))
-            
-            # If we got here, try to initialize the model with minimal interaction
-            # First attempt: try to load model metadata which should trigger loading if needed
-            try:
-                self.root.after(0, lambda: self.show_status_message(f"Attempting to initialize model '{model_name}' without test messages..."))
-                
-                # Try to get detailed model information, which may trigger model loading
-                model_info = self.get_model_info(model_name)
-                
-                # Check if we got meaningful model information
-                if (model_info and 
-                    model_info.get('size') not in ['Unknown', 'Error', 'Loading...'] and
-                    model_info.get('ram_usage') not in ['Unknown', 'Error', 'Loading...', 'Not loaded']):
-                    
-                    # Getting model info successfully usually means the model is loaded
-                    self.root.after(0, lambda: self.show_status_message(f"✅ Model '{model_name}' initialized successfully (info retrieved)"))
-                    self.preloading_model = False
-                    
-                    # Mark as successfully loaded
-                    if not hasattr(self, 'preloaded_models'):
-                        self.preloaded_models = {}
-                    if not hasattr(self, 'preload_success_models'):
-                        self.preload_success_models = set()
-                    self.preloaded_models[model_name] = time.time()
-                    self.preload_success_models.add(model_name)
-                    
-                    # Update UI
-                    self.root.after(0, lambda: self.update_model_info_display(model_name, model_info, loading=False))
-                    self.root.after(0, lambda: self.enable_chat_for_loaded_model(model_name))
-                    return
-                    
-            except Exception as e:
-                self.root.after(0, lambda: self.show_status_message(f"Metadata approach failed for '{model_name}': {str(e)}"))
-            
-            # Fallback: If metadata approach didn't work, use minimal test message as last resort
-            # Use a very short prompt to minimize impact
-            warmup_prompt = "ok"  # Minimal prompt
-            
-            self.root.after(0, lambda: self.show_status_message(f"Using minimal test message to verify '{model_name}' is ready..."))
-            result = subprocess.run([self.ollama_path, "run", model_name, warmup_prompt], 
-                                  capture_output=True, text=True, timeout=timeout)
-            
-            # Check if operation was cancelled during preload
-            if (hasattr(self, 'model_loading_cancelled') and self.model_loading_cancelled and 
-                getattr(self, 'current_loading_model', '') != model_name):
-                return
-            
-            # Consider success if ANY output was received, don't be too strict
-            if result.returncode == 0:
-                self.root.after(0, lambda: self.show_status_message(f"✅ Model '{model_name}' loaded successfully and ready for inference!"))
-                # Reset preloading flag
-                self.preloading_model = False
-                
-                # We know the model was successfully loaded because the command completed
-                # Keep track of successfully preloaded models with timestamp
-                if not hasattr(self, 'preloaded_models'):
-                    self.preloaded_models = {}
-                if not hasattr(self, 'preload_success_models'):
-                    self.preload_success_models = set()
-                self.preloaded_models[model_name] = time.time()
-                self.preload_success_models.add(model_name)
-                
-                # Get the model info directly
-                try:
-                    model_info = self.get_model_info(model_name)
-                    
-                    # Add loading attempt info to model info
-                    if hasattr(self, '_model_load_attempts') and model_name in self._model_load_attempts:
-                        attempt_count = self._model_load_attempts[model_name]
-                        if attempt_count > 1:  # Only show if there were multiple attempts
-                            model_info['loading_note'] = f"(Loaded after {attempt_count} attempt{'s' if attempt_count > 1 else ''})"
-                    
-                    # Update UI only if we got meaningful model info and operation wasn't cancelled
-                    if (model_info and model_info.get('ram_usage') not in ['Unknown', 'Error'] and 
-                        (not getattr(self, 'model_loading_cancelled', False) or 
-                         getattr(self, 'current_loading_model', '') == model_name)):
-                        
-                        # Enable chat input and update UI
-                        self.root.after(0, lambda: self.enable_chat_for_loaded_model(model_name))
-                        self.root.after(0, lambda: self.update_model_info_display(model_name, model_info))
-                    else:
-                        # If we couldn't get complete model info, still enable chat since we know model is loaded
-                        self.root.after(0, lambda: self.enable_chat_for_loaded_model(model_name))
-                except Exception as e:
-                    # If there was an error getting model info, still enable chat since we know model is loaded
-                    self.root.after(0, lambda: self.show_status_message(f"Note: Error getting model details, but model is loaded: {str(e)}"))
-                    self.root.after(0, lambda: self.enable_chat_for_loaded_model(model_name))
-            else:
-                # For small models, sometimes the run command fails but the model is still usable
-                # Try to check if it's at least accessible via 'ollama show' as a fallback
-                try:
-                    show_result = subprocess.run([self.ollama_path, "show", model_name], 
-                                              capture_output=True, text=True, timeout=5)
-                    
-                    if show_result.returncode == 0 and show_result.stdout.strip():
-                        # Model is at least detected by ollama show, mark as loaded with warning
-                        self.root.after(0, lambda: self.show_status_message(f"⚠️ Model '{model_name}' loaded but with potential issues. Chat may still work."))
-                        
-                        # Still register it as available
-                        if not hasattr(self, 'preloaded_models'):
-                            self.preloaded_models = {}
-                        if not hasattr(self, 'preload_success_models'):
-                            self.preload_success_models = set()
-                        self.preloaded_models[model_name] = time.time()
-                        self.preload_success_models.add(model_name)
-                        
-                        # Enable chat despite warnings
-                        self.root.after(0, lambda: self.enable_chat_for_loaded_model(model_name))
-                    else:
-                        # Model genuinely failed to load
-                        self.root.after(0, lambda: self.show_status_message(f"⚠️ Could not initialize model '{model_name}'. Trying again..."))
-                        # Try one more time with different approach
-                        self.root.after(1000, lambda: self.update_model_details_safe(model_name, loading=True))
-                except Exception as e:
-                    self.root.after(0, lambda: self.show_status_message(f"⚠️ Model '{model_name}' check failed: {str(e)}"))
-                
-                # Reset preloading flag
-                self.preloading_model = False
-                
-        except subprocess.TimeoutExpired:
-            # Reset preloading flag but keep track of attempt
-            self.preloading_model = False
-            
-            # Track timeout attempt
-            if not hasattr(self, '_model_timeout_attempts'):
-                self._model_timeout_attempts = {}
-            
-            if model_name not in self._model_timeout_attempts:
-                self._model_timeout_attempts[model_name] = 1
-            else:
-                self._model_timeout_attempts[model_name] += 1
+            # Queue a load (a no-op while one is pending)
+            self.model_loads.request(model_name)
+
+    def on_model_load_state(self, model_name, state, detail):
+        """Show a state change reported by the model load tracker (runs on the main thread)."""
+        if state == ModelLoadTracker.QUEUED:
+            self.show_status_message(f"Model '{model_name}' queued for loading...")
+        elif state == ModelLoadTracker.LOADING:
+            self.show_status_message(f"Loading model '{model_name}'...")
+        elif state == ModelLoadTracker.READY:
+            self.show_status_message(f"✅ Model '{model_name}' loaded and ready for inference")
+        elif state == ModelLoadTracker.CANCELLED:
+            self.show_status_message(f"Load of model '{model_name}' cancelled")
+        elif state == ModelLoadTracker.UNLOADED:
+            self.show_status_message(f"Model '{model_name}' is no longer loaded ({detail})")
+        else:
+            # Truncate error message if too long
+            if len(detail) > 100:
+                detail = detail[:97] + "..."
+            self.show_status_message(f"❌ Could not load model '{model_name}': {detail}")
+        
+        # Loads of models the user has switched away from only show up in the logs
+        if model_name != self.selected_model:
+            return
+        
+        if state == ModelLoadTracker.READY:
+            # Show the memory split and context size; this also enables chat
+            self.fetch_model_info_async(model_name)
+        elif state == ModelLoadTracker.UNLOADED:
+            # Chat stays enabled: the next message loads the model again
+            self.model_status = "Unloaded"
+            self.model_detail_lines[0].config(text="Model status: Unloaded (the next message reloads it)", foreground="#1976D2")
+            self.model_detail_lines[3].config(text="RAM usage: Not loaded", foreground="#1976D2")
+            self.model_detail_lines[4].config(text="GPU memory: Model not loaded", foreground="#1976D2")
+        elif state == ModelLoadTracker.LOADING and self.model_status == "Unloaded":
+            # Reload triggered by a message; the reply itself waits for the server
+            self.model_status = "Loading"
+            self.model_detail_lines[0].config(text="Model status: Reloading", foreground="#1976D2")
+        elif state == ModelLoadTracker.FAILED:
+            self.model_status = "Error"
+            self.model_detail_lines[0].config(text="Model status: Error (load failed)", foreground="red")
             
-            # Check if we should still keep trying
-            if self._model_timeout_attempts[model_name] <= 3:
-                # Try alternate loading strategy on timeout
-                if (not getattr(self, 'model_loading_cancelled', False) or 
-                    getattr(self, 'current_loading_model', '') == model_name):
-                    self.root.after(0, lambda: self.show_status_message(f"⏰ Model '{model_name}' loading timed out. Trying alternate loading method ({self._model_timeout_attempts[model_name]}/3)..."))
-                    
-                    # Try with simpler prompt approach
-                    try:
-                        # See if model is at least accessible via show
-                        show_result = subprocess.run([self.ollama_path, "show", model_name], 
-                                                  capture_output=True, text=True, timeout=10)
-                        
-                        if show_result.returncode == 0:
-                            # Model exists, mark as loaded with warnings
-                            self.root.after(0, lambda: self.show_status_message(f"Model '{model_name}' is available but loading timed out. Will proceed with limited functionality."))
-                            
-                            # Still register it as available
-                            if not hasattr(self, 'preloaded_models'):
-                                self.preloaded_models = {}
-                            if not hasattr(self, 'preload_success_models'):
-                                self.preload_success_models = set()
-                            self.preloaded_models[model_name] = time.time()
-                            self.preload_success_models.add(model_name)
-                            
-                            # Get model info and enable chat
-                            model_info = self.get_model_info(model_name)
-                            if model_info:
-                                self.root.after(0, lambda: self.update_model_info_display(model_name, model_info))
-                                self.root.after(0, lambda: self.enable_chat_for_loaded_model(model_name))
-                    except Exception:
-                        # If all else fails, retry with increased timeout
-                        self.root.after(0, lambda: self.show_status_message(f"Retrying '{model_name}' load with increased timeout..."))
-                        # Schedule a new attempt with increased timeout
-                        self.root.after(1000, lambda: threading.Thread(
-                            target=self.preload_model, 
-                            args=(model_name,), 
-                            daemon=True
-                        ).start())
-            else:
-                # After multiple timeouts, try to make the best of it
-                if (not getattr(self, 'model_loading_cancelled', False) or 
-                    getattr(self, 'current_loading_model', '') == model_name):
-                    self.root.after(0, lambda: self.show_status_message(f"⚠️ Model '{model_name}' keeps timing out. Will try to use it anyway with limited verification."))
-                    
-                    # Even after timeout, mark as potentially usable
-                    if not hasattr(self, 'preloaded_models'):
-                        self.preloaded_models = {}
-                    self.preloaded_models[model_name] = time.time()
-                    
-                    # Don't add to preload_success_models to maintain accurate tracking
-                    # But still try to update UI
-                    self.root.after(0, lambda: self.update_model_details_safe(model_name, loading=False))
-                    
-        except Exception as e:
-            # Reset preloading flag
-            self.preloading_model = False
+            # Keep chat disabled on error
+            self.user_input.config(state='disabled')
+            self.send_button.config(state='disabled')
             
-            # Only show error if operation wasn't cancelled
-            if (not getattr(self, 'model_loading_cancelled', False) or 
-                getattr(self, 'current_loading_model', '') == model_name):
-                
-                # More user-friendly error message based on error type
-                if "timed out" in str(e).lower():
-                    self.root.after(0, lambda: self.show_status_message(f"⏰ Model '{model_name}' is taking longer to load. Will try a different approach."))
-                    
-                    # Try with ollama show as a fallback
-                    try:
-                        show_result = subprocess.run([self.ollama_path, "show", model_name], 
-                                                  capture_output=True, text=True, timeout=10)
-                        
-                        if show_result.returncode == 0:
-                            # Model exists, mark as loaded with limited verification
-                            self.root.after(0, lambda: self.show_status_message(f"Model '{model_name}' is available with limited functionality."))
-                            
-                            # Still register it as available
-                            if not hasattr(self, 'preloaded_models'):
-                                self.preloaded_models = {}
-                            self.preloaded_models[model_name] = time.time()
-                            
-                            # Get model info and try to update UI
-                            model_info = self.get_model_info(model_name)
-                            if model_info:
-                                # Add an indicator of loading attempts to the model info
-                                attempt_count = 0
-                                if hasattr(self, '_model_load_attempts') and model_name in self._model_load_attempts:
-                                    attempt_count = self._model_load_attempts[model_name]
-                                if attempt_count > 0:
-                                    model_info['loading_note'] = f"(Loaded after {attempt_count} attempt{'s' if attempt_count > 1 else ''})"
-                                
-                                self.root.after(0, lambda: self.update_model_info_display(model_name, model_info))
-                    except Exception:
-                        pass
-                else:
-                    error_msg = str(e)
-                    # Truncate error message if too long
-                    if len(error_msg) > 100:
-                        error_msg = error_msg[:97] + "..."
-                    self.root.after(0, lambda: self.show_status_message(f"Error loading model: {error_msg}"))
-                
-                # Still try to update details even after error - model might be partially functional
-                self.root.after(0, lambda: self.update_model_details_safe(model_name, loading=False))
-
+            self.chat_display.config(state='normal')
+            self.chat_display.insert(tk.END, f"❌ Model '{model_name}' could not be loaded. Choose the model again to retry.\n\n")
+            self.chat_display.config(state='disabled')
+    
     def show_status_message(self, message):
         """Show a status message in the logs display.
         
@@ -3928,32 +4988,19 @@ Once installed, click 'Refresh' in the main application to detect models.
         if self.is_generating:
             self.stop_generation()
         
-        # If we're currently loading a different model, cancel any pending operations
-        if hasattr(self, 'model_loading_cancelled'):
-            self.model_loading_cancelled = True
+        # A load still pending for the previously chosen model is no longer needed;
+        # the new model loads on its own thread, so it does not wait for it
+        previous_model = getattr(self, 'current_loading_model', '')
+        if previous_model and previous_model != selected:
+            self.model_loads.cancel(previous_model)
         
         # Set flags to track current model loading operation
         self.model_loading_cancelled = False
         self.current_loading_model = selected
-        self.preloading_model = False  # Initialize the preloading flag
-        
-        # Reset model readiness tracking
-        if not hasattr(self, 'preloaded_models'):
-            self.preloaded_models = {}
-        if not hasattr(self, 'preload_success_models'):
-            self.preload_success_models = set()
-        if not hasattr(self, 'preload_started_models'):
-            self.preload_started_models = set()
-            
-        # Remove this model from preloaded tracking if it was there
-        if selected in self.preloaded_models:
-            del self.preloaded_models[selected]
-        if selected in self.preload_success_models:
-            self.preload_success_models.remove(selected)
-        if selected in self.preload_started_models:
-            self.preload_started_models.remove(selected)
         
         self.selected_model = selected
+        self.residency.touch(selected)
+        self.pin_model_var.set(selected in self.residency.pinned)
         
         # Save settings when model changes
         self.save_settings()
@@ -3967,25 +5014,11 @@ Once installed, click 'Refresh' in the main application to detect models.
         # Show loading state immediately
         self.update_model_details(selected, loading=True)
         
-        # Clear chat display and show loading message with time estimate
+        # Clear chat display and show loading message
         self.chat_display.config(state='normal')
         self.chat_display.delete(1.0, tk.END)
-        
-        # Provide time estimate based on model size
-        model_lower = selected.lower()
-        time_estimate = ""
-        if any(size in model_lower for size in ['70b', '72b', '405b']):
-            time_estimate = " (Large model - may take 1-2 minutes)"
-        elif any(size in model_lower for size in ['13b', '14b', '27b', '30b', '34b']):
-            time_estimate = " (Large model - may take 60-90 seconds)"
-        elif any(size in model_lower for size in ['7b', '8b', '9b']):
-            time_estimate = " (May take up to 1 minute)"
-        
-        self.chat_display.insert(tk.END, f"⏳ Loading model '{selected}'{time_estimate}...\n")
-        self.chat_display.insert(tk.END, "Please wait while the model is being prepared for use.\n")
-        if time_estimate:
-            self.chat_display.insert(tk.END, "Large models require more time to initialize.\n")
-        self.chat_display.insert(tk.END, "\n")
+        self.chat_display.insert(tk.END, f"⏳ Loading model '{selected}'...\n")
+        self.chat_display.insert(tk.END, "Please wait while the model is being prepared for use.\n\n")
         self.chat_display.config(state='disabled')
         
         # Clear input field while ensuring it stays disabled during loading
@@ -3998,62 +5031,8 @@ Once installed, click 'Refresh' in the main application to detect models.
         # Keep send button disabled during loading
         self.send_button.config(state='disabled')
         
-        # Pre-load the model and update details in background
-        # Show appropriate loading message based on model size
-        model_lower = selected.lower()
-        if any(size in model_lower for size in ['70b', '72b', '405b']):
-            self.show_status_message(f"Loading large model '{selected}' (may take 1-2 minutes)...")
-        elif any(size in model_lower for size in ['13b', '14b', '27b', '30b', '34b']):
-            self.show_status_message(f"Loading large model '{selected}' (may take 60-90 seconds)...")
-        else:
-            self.show_status_message(f"Loading model '{selected}'...")
-        
-        def load_model_info():
-            # Keep track of which model this thread is processing
-            current_model = selected
-            
-            # Check if model is already ready - avoid redundant processing
-            if (hasattr(self, 'model_status') and self.model_status == "Ready" and 
-                hasattr(self, 'selected_model') and self.selected_model == current_model):
-                # Model is already ready - just make sure the UI reflects this
-                self.root.after(0, lambda: self.enable_chat_for_loaded_model(current_model))
-                return
-            
-            # Check if this operation was cancelled (user switched to another model)
-            if getattr(self, 'model_loading_cancelled', False) or getattr(self, 'current_loading_model', '') != current_model:
-                return
-                
-            # Small delay to make loading state visible
-            time.sleep(0.2)
-            
-            # Check again if cancelled
-            if getattr(self, 'model_loading_cancelled', False) or getattr(self, 'current_loading_model', '') != current_model:
-                return
-                
-            # Check if the model is already loaded
-            if self.is_model_loaded_basic(current_model):
-                # Model is loaded according to basic check, but we need to verify it's fully ready
-                self.root.after(0, lambda: self.show_status_message(f"Model '{current_model}' detected, verifying it's fully loaded..."))
-                
-                # Add to preload_started_models to track we've initiated the process
-                if not hasattr(self, 'preload_started_models'):
-                    self.preload_started_models = set()
-                self.preload_started_models.add(current_model)
-                
-                # Update UI with detected status, but we won't enable chat until preload verification
-                self.root.after(0, lambda: self.update_model_details_safe(current_model, loading=True))
-                
-                # Still run the preload process to verify it's fully loaded with inference
-                # This will enable chat only when fully ready
-                self.preload_model_safe(current_model)
-            else:
-                # Model is not loaded at all, preload it
-                self.root.after(0, lambda: self.show_status_message(f"Model '{current_model}' not detected, starting load process..."))
-                self.preload_model_safe(current_model)
-                # No need to call update_model_details_safe here as preload_model will do that
-                # if successful
-        
-        threading.Thread(target=load_model_info, daemon=True).start()
+        # Ask the server to load the model; the tracker reports back when it is in memory
+        self.model_loads.request(selected)
     
     def update_model_details_safe(self, model_name, loading=False):
         """Safe wrapper for update_model_details that checks for cancellation."""
@@ -4070,78 +5049,6 @@ Once installed, click 'Refresh' in the main application to detect models.
             # Otherwise proceed with update
             self.update_model_details(model_name, loading=loading)
     
-    def preload_model_safe(self, model_name):
-        """Safe wrapper for preload_model that checks for cancellation."""
-        # Only proceed if this is still the current model being loaded
-        if (not getattr(self, 'model_loading_cancelled', False) and 
-            getattr(self, 'current_loading_model', '') == model_name):
-            
-            # Check if model is already in process of preloading
-            if getattr(self, 'preloading_model', False) and getattr(self, 'current_loading_model', '') == model_name:
-                self.show_status_message(f"Model '{model_name}' is already being loaded, please wait...")
-                # Update UI to show consistent loading status
-                self.root.after(0, lambda: self.update_model_details(model_name, loading=True))
-                return
-            
-            # Check if model is already fully verified loaded
-            if hasattr(self, 'preload_success_models') and model_name in self.preload_success_models:
-                self.show_status_message(f"Model '{model_name}' is already loaded and verified.")
-                # Make sure UI shows the ready state
-                model_info = self.get_model_info(model_name)
-                if model_info:
-                    self.root.after(0, lambda: self.update_model_info_display(model_name, model_info, loading=False))
-                    self.root.after(0, lambda: self.enable_chat_for_loaded_model(model_name))
-                return
-                
-            # Track that we've started preloading this model
-            if not hasattr(self, 'preload_started_models'):
-                self.preload_started_models = set()
-            self.preload_started_models.add(model_name)
-            
-            # Make sure UI shows loading state
-            self.root.after(0, lambda: self.update_model_details(model_name, loading=True))
-            
-            # Start preloading in a separate thread to avoid UI blocking
-            threading.Thread(target=self.preload_model, args=(model_name,), daemon=True).start()
-    
-    def enable_chat_for_loaded_model(self, model_name):
-        """Enable chat input when we know a model is loaded and ready for inference."""
-        # Check if operation was cancelled
-        if (hasattr(self, 'model_loading_cancelled') and self.model_loading_cancelled and 
-            getattr(self, 'current_loading_model', '') != model_name):
-            return
-            
-        # Only enable if this is still the selected model
-        if hasattr(self, 'selected_model') and self.selected_model == model_name:
-            # Check if already in ready state to avoid redundant updates
-            was_already_ready = (hasattr(self, 'model_status') and self.model_status == "Ready")
-            
-            # Check if the model is truly in the preloaded success list - this means
-            # it passed our thorough testing with actual inference
-            is_truly_ready = hasattr(self, 'preload_success_models') and model_name in self.preload_success_models
-            
-            # Only update status if model is truly ready or we're overriding due to a successful preload
-            if is_truly_ready:
-                # Set model as ready since we've confirmed it through inference
-                self.model_status = "Ready"
-                
-                # Update UI status line
-                self.model_detail_lines[0].config(text="Model status: Ready", foreground="green")
-                
-                # Enable chat input and send button immediately
-                self.user_input.config(state='normal')
-                self.send_button.config(state='normal')
-                
-                # Show a clear ready message if we're transitioning from loading
-                if not was_already_ready:
-                    self.show_status_message(f"✅ Model '{model_name}' is now fully ready for inference")
-            
-            # Only show message if this is the first time the model is marked as ready
-            if not was_already_ready:
-                self.show_status_message(f"Model '{model_name}' is ready for chat!")
-                # Update chat display only the first time
-                self.update_chat_for_ready_model(model_name)
-    
     def update_chat_for_ready_model(self, model_name):
         """Update chat display when model is ready for use."""
         # Check if operation was cancelled or model switched
@@ -4149,8 +5056,8 @@ Once installed, click 'Refresh' in the main application to detect models.
             getattr(self, 'current_loading_model', '') != model_name):
             return
         
-        # Verify model has passed the full inference check
-        is_fully_verified = hasattr(self, 'preload_success_models') and model_name in self.preload_success_models
+        # Verify the model's load request has completed
+        is_fully_verified = self.model_loads.is_ready(model_name)
             
         # Only update if this is still the selected model and it's verified ready
         if (hasattr(self, 'selected_model') and self.selected_model == model_name and is_fully_verified):
@@ -4176,28 +5083,21 @@ Once installed, click 'Refresh' in the main application to detect models.
                 # Close the current HTTP request
                 self.current_request.close()
                 self.current_request = None
-                self.show_status_message("⏹️ Response generation stopped by user")
-                
-                # Handle stop message based on current mode
-                if self.is_translator_mode:
-                    # For translator mode, just show status message
-                    self.finalize_translation_response()
-                else:
-                    # Add a message to the chat indicating the stop
-                    self.chat_display.config(state='normal')
-                    self.chat_display.insert(tk.END, "\n[Response stopped by user]\n\n")
-                    self.chat_display.config(state='disabled')
-                    self.chat_display.see(tk.END)
-                    self.finalize_chat_response()
-                
             except Exception as e:
                 self.show_status_message(f"Error stopping generation: {str(e)}")
+        self.show_status_message("⏹️ Response generation stopped by user")
         
-        # Reset state based on current mode
+        # Finalize the reply here, once; its chunks and finalize still queued by the worker are dropped
+        generation = self.stream_renderer.active_generation
         if self.is_translator_mode:
-            self.finalize_translation_response()
+            self.finalize_translation_response(generation)
         else:
-            self.finalize_chat_response()
+            # Add a message to the chat indicating the stop
+            self.chat_display.config(state='normal')
+            self.chat_display.insert(tk.END, "\n[Response stopped by user]\n\n")
+            self.chat_display.config(state='disabled')
+            self.chat_display.see(tk.END)
+            self.finalize_chat_response(generation)
 
     def on_input_keypress(self, event):
         """Handle key presses in the user input field."""
@@ -4252,46 +5152,21 @@ Once installed, click 'Refresh' in the main application to detect models.
             self.show_status_message("⚠️ Please choose a model first using the 'Choose Model' button.")
             return
         
-        # Check model status before allowing message sending
-        model_ready = False
-        
-        # First check if model was properly preloaded with inference verification
-        if hasattr(self, 'preload_success_models') and self.selected_model in self.preload_success_models:
-            model_ready = True
-        
-        # Next check UI status as fallback
-        elif hasattr(self, 'model_status') and self.model_status == "Ready":
-            model_ready = True
-        
-        # If UI says not ready, double-check if model is actually loaded
-        if not model_ready:
-            if self.is_model_loaded_basic(self.selected_model):
-                # Model appears to be loaded but wasn't properly preloaded
-                # Let's start preloading it properly and show message to user
-                if not hasattr(self, 'preload_started_models'):
-                    self.preload_started_models = set()
-                
-                if self.selected_model not in self.preload_started_models:
-                    self.preload_started_models.add(self.selected_model)
-                    self.show_status_message("⚠️ Model detected but not properly initialized. Starting initialization now...")
-                    threading.Thread(target=self.preload_model_safe, args=(self.selected_model,)).start()
-                    return
-                else:
-                    # We're already trying to preload it, continue with caution
-                    self.enable_chat_for_loaded_model(self.selected_model)
-                    model_ready = True
-                    self.show_status_message("⚙️ Model is being initialized, but allowing chat to proceed...")
+        # Only send once the selected model's load request has completed
+        load_state = self.model_loads.state(self.selected_model)
+        if load_state == ModelLoadTracker.UNLOADED:
+            # The server dropped the model; the chat request reloads it, the tracker follows the reload
+            self.model_loads.request(self.selected_model)
+        elif load_state != ModelLoadTracker.READY:
+            if load_state in (ModelLoadTracker.QUEUED, ModelLoadTracker.LOADING):
+                self.show_status_message("⚠️ Model is still loading. Please wait for the model to be ready.")
+            elif load_state == ModelLoadTracker.FAILED:
+                self.show_status_message("⚠️ Model failed to load. Trying again...")
             else:
-                # Model isn't actually loaded according to both checks
-                if hasattr(self, 'model_status') and self.model_status == "Loading":
-                    self.show_status_message("⚠️ Model is still loading. Please wait for the model to be ready.")
-                elif hasattr(self, 'model_status') and self.model_status == "Error":
-                    self.show_status_message("⚠️ Model has an error. Please try selecting the model again.")
-                else:
-                    self.show_status_message("⚠️ Please wait for the model to be ready before sending messages.")
-                # Trigger a status refresh
-                self.update_model_details_safe(self.selected_model, loading=False)
-                return
+                self.show_status_message("⚠️ Please wait for the model to be ready before sending messages.")
+            # Queue a load unless one is already pending
+            self.update_model_details_safe(self.selected_model, loading=False)
+            return
         
         # Check if input field is disabled (shouldn't happen with proper UI state management)
         if str(self.user_input.cget('state')) == 'disabled':
@@ -4326,14 +5201,22 @@ Once installed, click 'Refresh' in the main application to detect models.
             # Add AI response prompt to chat display
             self.chat_display.config(state='normal')
             self.chat_display.insert(tk.END, "AI: ")
+            # Remember where this reply starts so finalize never has to search the transcript
+            self.chat_display.mark_set("ai_response_start", "end-1c")
+            self.chat_display.mark_gravity("ai_response_start", tk.LEFT)
+            self.markdown_renderer.start()
             self.chat_display.config(state='disabled')
             self.chat_display.see(tk.END)
             
-            # Reset response accumulator
+            # Reset response accumulator, the streaming <think> filter and the reasoning pane
             self.current_response = ""
+            self.think_filter = ThinkTagFilter()
+            self.clear_reasoning_pane()
+            
+            generation = self.stream_renderer.begin()
             
             def run_query():
-                self.run_ollama_query(self.selected_model, user_text)
+                self.run_ollama_query(self.selected_model, user_text, generation)
                 
             threading.Thread(target=run_query, daemon=True).start()
             
@@ -4344,12 +5227,13 @@ Once installed, click 'Refresh' in the main application to detect models.
             self.stop_button.config(state='disabled')
             self.is_generating = False
 
-    def refresh_models(self):
-        """Refresh the model dropdown with current Ollama models."""
+    def refresh_models(self, models=None):
+        """Refresh the model dropdown with current Ollama models (fetched unless a list is given)."""
         # Store the previously selected model
         previous_model = self.model_var.get()
         
-        models = self.get_ollama_models()
+        if models is None:
+            models = self.get_ollama_models()
         self.model_dropdown['values'] = models
         
         if models:
@@ -4386,6 +5270,11 @@ Once installed, click 'Refresh' in the main application to detect models.
             self.model_var.set("")
             self.show_status_message("No models found. Install models: 'ollama pull llama3'")
         
+        # Choose the model from the last session the first time the list is known
+        if self.saved_model:
+            saved_model, self.saved_model = self.saved_model, ''
+            self.restore_selected_model(saved_model, models)
+        
         # Reset to no model selected state if no model is currently selected
         if not self.selected_model:
             self.update_model_details(None)
@@ -4394,32 +5283,29 @@ Once installed, click 'Refresh' in the main application to detect models.
         if not self.is_downloading and not self.download_status_label.cget('text').startswith('✅'):
             self.download_status_label.config(text="")
 
-    def run_ollama_query(self, model, prompt):
-        """Query Ollama and update GUI with response."""
-        if not self.ollama_path:
-            self.root.after(0, lambda: self.chat_display.config(state='normal'))
-            self.root.after(0, lambda: self.chat_display.insert(tk.END, "Error: Ollama not found\n\n"))
-            self.root.after(0, lambda: self.chat_display.config(state='disabled'))
-            self.root.after(0, lambda: self.send_button.config(state='normal'))
-            self.root.after(0, lambda: self.stop_button.config(state='disabled'))
-            self.root.after(0, lambda: setattr(self, 'is_generating', False))
-            return
-
+    def run_ollama_query(self, model, prompt, generation):
+        """Query Ollama and update GUI with response (generation is the stream renderer id of this reply)."""
         try:
             timeout = int(self.response_timeout_var.get())
         except ValueError:
             timeout = 60
 
         def query():
+            backend = None
+            request = None
+            ttft_ms = None
+            token_counts = None  # Server and local token counts of this turn, applied when the reply is finalized
+            final_chunk = None
+            session_mode = self.chat_session_var.get()
             try:
-                url = "http://localhost:11434/api/chat"  # Use chat API instead of generate API
-                
-                # Build messages array with conversation history (including the current user message)
+                # Build messages array with conversation history (including the current user message).
+                # In session mode replies are resent exactly as generated, so every turn's prompt
+                # starts with the previous turn's tokens and the server's KV cache stays valid
                 messages = []
                 for message in self.conversation_history:
                     messages.append({
                         "role": message["role"],
-                        "content": message["content"]
+                        "content": message.get("sent", message["content"]) if session_mode else message["content"]
                     })
                 
                 # Ensure we have at least one message (should not happen, but safety check)
@@ -4429,6 +5315,12 @@ Once installed, click 'Refresh' in the main application to detect models.
                         "content": prompt
                     })
                 
+                # Size of the prompt actually sent; only the messages before the newest one
+                # can come from the server's KV cache
+                message_tokens = [self.token_counter.count(message["content"]) for message in messages]
+                prompt_tokens = sum(message_tokens)
+                cacheable_tokens = prompt_tokens - message_tokens[-1]
+                
                 payload = {
                     "model": model,
                     "messages": messages,
@@ -4455,147 +5347,222 @@ Once installed, click 'Refresh' in the main application to detect models.
                 if self.seed_var.get() >= 0:  # Only add if not random (-1)
                     payload["options"]["seed"] = self.seed_var.get()
                 
+                self.apply_session_settings(payload)
+                self.residency.touch(model)
+                
                 # Remove options key if empty
                 if not payload["options"]:
                     del payload["options"]
                 
-                # Store the request for potential cancellation
-                self.current_request = requests.post(url, json=payload, stream=True, timeout=timeout)
+                # Route to the least-loaded backend and store the request for potential cancellation
+                request_start = time.perf_counter()
+                if not self.stream_renderer.is_active(generation):
+                    return  # Stopped while the request was being prepared
+                backend, request = self.backend_pool.open_stream("/api/chat", payload, timeout)
+                self.current_request = request
                 
-                with self.current_request as response:
+                with request as response:
                     response.raise_for_status()
                     for line in response.iter_lines():
+                        if not self.stream_renderer.is_active(generation):
+                            return  # Stopped by the user
                         if line:
                             try:
                                 data = json.loads(line)
                                 # For chat API, the response content is in 'message.content'
-                                chunk = data.get("message", {}).get("content", "")
-                                self.root.after(0, self.update_chat_with_response, chunk)
+                                # and newer servers send reasoning separately in 'message.thinking'
+                                message = data.get("message", {})
+                                chunk = message.get("content", "")
+                                thinking = message.get("thinking", "")
+                                if (chunk or thinking) and ttft_ms is None:
+                                    ttft_ms = (time.perf_counter() - request_start) * 1000
+                                self.stream_renderer.push(self.update_reasoning_pane, thinking, generation)
+                                self.stream_renderer.push(self.update_chat_with_response, chunk, generation)
                                 if data.get("done"):
+                                    final_chunk = data
+                                    token_counts = (data.get("prompt_eval_count"), data.get("eval_count"),
+                                                    prompt_tokens, cacheable_tokens)
                                     break
                             except json.JSONDecodeError:
                                 continue
-                self.root.after(0, self.finalize_chat_response)
+                self.stream_renderer.call(lambda: self.finalize_chat_response(generation, token_counts), generation)
+                if final_chunk is not None:
+                    # On its own thread: reading server memory is an /api/ps request
+                    threading.Thread(target=self.record_request_metrics, daemon=True,
+                                     args=(backend, final_chunk, ttft_ms, prompt_tokens, cacheable_tokens)).start()
             except requests.exceptions.Timeout:
-                self.root.after(0, lambda: self.update_chat_with_response("\nError: Request timed out.\n"))
-                self.root.after(0, self.finalize_chat_response)
+                self.stream_renderer.push(self.update_chat_with_response, "\nError: Request timed out.\n", generation)
+                self.stream_renderer.call(lambda: self.finalize_chat_response(generation), generation)
             except requests.exceptions.RequestException as e:
-                # Check if it was a user-initiated cancellation
-                if not self.is_generating:
-                    return  # User stopped the generation, don't show error
-                self.root.after(0, lambda: self.update_chat_with_response(f"\nError: {str(e)}\n"))
-                self.root.after(0, self.finalize_chat_response)
+                # A stopped reply's renderer generation has ended, so nothing more is shown for it
+                self.stream_renderer.push(self.update_chat_with_response, f"\nError: {str(e)}\n", generation)
+                self.stream_renderer.call(lambda: self.finalize_chat_response(generation), generation)
             except Exception as e:
-                if not self.is_generating:
-                    return  # User stopped the generation, don't show error
-                self.root.after(0, lambda: self.update_chat_with_response(f"\nAn unexpected error occurred: {str(e)}\n"))
-                self.root.after(0, self.finalize_chat_response)
+                self.stream_renderer.push(self.update_chat_with_response, f"\nAn unexpected error occurred: {str(e)}\n", generation)
+                self.stream_renderer.call(lambda: self.finalize_chat_response(generation), generation)
             finally:
-                # Clean up the request reference
-                self.current_request = None
+                # Clean up the request reference, unless a newer reply already replaced it
+                if self.current_request is request:
+                    self.current_request = None
+                if backend is not None:
+                    self.backend_pool.release(backend, ttft_ms)
+                    self.root.after(0, self.update_backend_stats_display)
 
         threading.Thread(target=query, daemon=True).start()
 
-    def filter_thinking_tags(self, text):
-        """Filter out <think> and </think> tags and their content from model responses."""
-        # If user wants to see thinking, return text as-is
-        if self.show_thinking_var.get():
-            return text
+    def context_window(self, model_name=None, fetch=False):
+        """Context window in tokens for a model: num_ctx (DEFAULT_NUM_CTX when 0), capped at its trained window.
+        
+        Every request sends this as num_ctx, so it is the window the server really uses
+        and the one the history is budgeted against. fetch=True asks the server for
+        unknown metadata, so it is only for worker threads.
+        """
+        model_name = model_name or self.selected_model
+        metadata = self.get_model_metadata(model_name) if fetch else self.cached_model_metadata(model_name)
+        trained_tokens = metadata.context_length if metadata is not None else 0
+        if not trained_tokens and model_name == self.selected_model:
+            trained_tokens = self.max_context_tokens
+        num_ctx = self.num_ctx_var.get() or DEFAULT_NUM_CTX
+        return min(num_ctx, trained_tokens) if trained_tokens else num_ctx
+    
+    def apply_session_settings(self, payload):
+        """Add num_ctx to a chat/generate payload, and the model's keep_alive when session mode is on.
         
-        # Remove complete <think>...</think> blocks
-        text = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL)
+        num_ctx is always sent, so loads, chats and summaries share one model instance
+        whose window is the one the history is budgeted against. Runs in worker threads.
+        """
+        payload.setdefault("options", {})["num_ctx"] = self.context_window(payload["model"], fetch=True)
+        if not self.chat_session_var.get():
+            return payload
+        if payload["model"] in self.residency.pinned:
+            keep_alive = -1  # Pinned models never time out
+        else:
+            keep_alive = self.model_keep_alive.get(payload["model"], self.keep_alive_var.get().strip())
+        if keep_alive not in ("", None):
+            # Plain numbers are seconds for the API; strings like "30m" are durations
+            payload["keep_alive"] = keep_alive_value(keep_alive)
+        return payload
+    
+    def effective_context_tokens(self):
+        """Context window the server actually uses for the selected model (the num_ctx sent with each request)."""
+        if not self.selected_model or not self.max_context_tokens:
+            return 0
+        return self.context_window()
+    
+    def record_request_metrics(self, backend, final_chunk, ttft_ms, prompt_tokens=None, cacheable_tokens=0):
+        """Store the timings of a finished request and refresh the performance sparklines.
         
-        # Remove standalone opening or closing tags
-        text = re.sub(r'</?think>', '', text)
+        Runs on its own thread once the stream has ended, since the server memory
+        reading may block on an /api/ps request.
+        """
+        server_memory = None
+        if backend.client is self.ollama_client:
+            # Memory held by all loaded models, from the shared running-models snapshot
+            try:
+                server_memory = sum(running.size for running in self.running_models.get(max_age=0)) or None
+            except requests.exceptions.RequestException:
+                pass
+        self.metrics.record_request(final_chunk, ttft_ms, server_memory, prompt_tokens, cacheable_tokens)
+        self.root.after(0, self.update_metrics_display)
+    
+    def update_metrics_display(self):
+        """Redraw the performance sparklines from the metrics store."""
+        formats = {
+            'tokens_per_sec': lambda value: f"{value:.1f}",
+            'ttft_ms': lambda value: f"{value:.0f} ms",
+            'prompt_eval_ms': lambda value: f"{value:.0f} ms",
+            'prompt_eval_saved_ms': lambda value: f"{value:.0f} ms",
+            'total_ms': lambda value: f"{value / 1000:.1f} s",
+            'server_memory': self.format_model_size,
+        }
+        for series, sparkline in self.metrics_sparklines.items():
+            values = self.metrics.values(series)
+            value_label, title = self.metrics_value_labels[series]
+            value_label.config(text=f"{title}: {formats[series](values[-1])}" if values else f"{title}: --")
+            self.draw_sparkline(sparkline, [(values, '#1976D2', "")])
+    
+    def toggle_reasoning_pane(self):
+        """Expand or collapse the model reasoning pane."""
+        self.show_thinking_var.set(not self.show_thinking_var.get())
+        self.save_settings()
+    
+    def update_reasoning_pane_visibility(self):
+        """Show or hide the reasoning pane to match the show-thinking setting."""
+        if not hasattr(self, 'reasoning_frame'):
+            return
         
-        return text
+        if self.show_thinking_var.get():
+            # Pack before the transcript so the pane keeps its width when the window is narrow
+            self.reasoning_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(5, 0), before=self.chat_display)
+            self.reasoning_toggle_button.config(text="🧠 Reasoning ◂")
+        else:
+            self.reasoning_frame.pack_forget()
+            self.reasoning_toggle_button.config(text="🧠 Reasoning ▸")
+    
+    def clear_reasoning_pane(self):
+        """Clear the reasoning pane before a new response."""
+        self.reasoning_display.config(state='normal')
+        self.reasoning_display.delete("1.0", tk.END)
+        self.reasoning_display.config(state='disabled')
+    
+    def update_reasoning_pane(self, thinking):
+        """Append streamed reasoning text to the reasoning pane."""
+        if not thinking:
+            return
+        # Text is collected even while the pane is collapsed so it is complete when expanded
+        self.reasoning_display.config(state='normal')
+        self.reasoning_display.insert(tk.END, thinking)
+        self.reasoning_display.config(state='disabled')
+        self.reasoning_display.see(tk.END)
 
     def update_chat_with_response(self, chunk):
         """Append a chunk of the model's response to the chat display."""
         # Accumulate the response
         self.current_response += chunk
         
-        # For streaming, we'll show the text without markdown formatting during typing
-        # and apply formatting at the end to avoid flickering and partial markdown issues
+        # Split <think> blocks out as they stream in; the filter only looks at the
+        # new chunk (plus a partial tag held from the last one)
+        chunk, thinking = self.think_filter.feed(chunk)
+        self.update_reasoning_pane(thinking)
+        if not chunk:
+            return
         
-        # If thinking is disabled, we need to be smart about filtering
-        if not self.show_thinking_var.get():
-            # Check if we're inside a thinking block
-            if '<think>' in self.current_response and '</think>' not in self.current_response:
-                # We're inside a thinking block, don't display anything yet
-                return
-            elif '<think>' in chunk or '</think>' in chunk:
-                # This chunk contains thinking tags, filter the entire accumulated response
-                # and update display accordingly
-                filtered_response = self.filter_thinking_tags(self.current_response)
-                
-                # Clear the AI response area and re-insert the filtered content
-                self.chat_display.config(state='normal')
-                content = self.chat_display.get("1.0", tk.END)
-                lines = content.split('\n')
-                
-                # Find the last "AI: " prompt
-                ai_line_index = -1
-                for i, line in enumerate(lines):
-                    if line.strip().startswith("AI: "):
-                        ai_line_index = i
-                
-                if ai_line_index >= 0:
-                    # Calculate position after "AI: "
-                    ai_line_start = f"{ai_line_index + 1}.0"
-                    ai_content_start = f"{ai_line_index + 1}.4"  # After "AI: "
-                    
-                    # Delete everything after "AI: " and insert filtered response
-                    self.chat_display.delete(ai_content_start, tk.END)
-                    self.chat_display.insert(ai_content_start, filtered_response)
-                    self.chat_display.see(tk.END)
-                self.chat_display.config(state='disabled')
+        # Skip the blank lines models leave before the answer (e.g. after a reasoning block)
+        if ("ai_response_start" in self.chat_display.mark_names() and
+                self.chat_display.compare("ai_response_start", "==", "end-1c")):
+            chunk = chunk.lstrip()
+            if not chunk:
                 return
         
-        # Normal case: either thinking is enabled or no thinking tags in chunk
-        # Just append the raw chunk - formatting will be applied at the end
+        # Append the raw text; each markdown block is formatted as soon as it is complete
         self.chat_display.config(state='normal')
-        self.chat_display.insert(tk.END, chunk)
+        self.markdown_renderer.feed(chunk)
         self.chat_display.config(state='disabled')
         self.chat_display.see(tk.END)
 
-    def finalize_chat_response(self):
-        """Finalize the chat response - simplified version"""
-        # Apply final filtering if thinking is disabled
-        response_to_display = self.current_response
-        if not self.show_thinking_var.get() and self.current_response:
-            response_to_display = self.filter_thinking_tags(self.current_response)
+    def finalize_chat_response(self, generation, token_counts=None):
+        """Finalize the chat response - runs once per generation, later calls for it are ignored."""
+        if not self.stream_renderer.end(generation):
+            return
         
-        # Find and update the AI response
-        if response_to_display:
-            self.chat_display.config(state='normal')
-            
-            # Get all content
-            content = self.chat_display.get("1.0", tk.END)
-            
-            # Find the last "AI: " position
-            last_ai_pos = content.rfind("AI: ")
-            
-            if last_ai_pos != -1:
-                # Calculate text widget position
-                lines_before = content[:last_ai_pos].count('\n')
-                ai_line = lines_before + 1
-                ai_start = f"{ai_line}.4"  # Position after "AI: "
-                
-                # Get the raw response text that was streamed
-                raw_response = self.chat_display.get(ai_start, tk.END).strip()
-                
-                # Clean the markdown
-                cleaned_response = self.clean_markdown_text(raw_response)
-                
-                # Only replace if text actually changed (to avoid flickering)
-                if raw_response != cleaned_response:
-                    # Delete old content
-                    self.chat_display.delete(ai_start, tk.END)
-                    # Insert cleaned content
-                    self.chat_display.insert(ai_start, cleaned_response)
-            
-            self.chat_display.config(state='disabled')
+        # Show any trailing text that was held back as a possible partial tag
+        remaining_text, remaining_thinking = self.think_filter.flush()
+        self.update_reasoning_pane(remaining_thinking)
+        
+        # Format the last (possibly unterminated) markdown block; earlier blocks
+        # were already formatted while streaming
+        self.chat_display.config(state='normal')
+        if remaining_text:
+            self.markdown_renderer.feed(remaining_text)
+        self.markdown_renderer.finish()
+        
+        # The reply is done; drop the mark so a repeated finalize can't touch it again
+        if "ai_response_start" in self.chat_display.mark_names():
+            self.chat_display.mark_unset("ai_response_start")
+        self.chat_display.config(state='disabled')
+        
+        # Reasoning was already routed to its own pane while streaming
+        response_to_display = self.think_filter.answer_text()
         
         # Add final newlines
         self.chat_display.config(state='normal')
@@ -4606,12 +5573,15 @@ Once installed, click 'Refresh' in the main application to detect models.
         # Focus on the input field for next message
         self.user_input.focus()
         
-        # Add AI response to conversation history for token tracking
+        # Add AI response to conversation history, with the server's token counts when it sent them
+        prompt_eval_count, eval_count, prompt_tokens, cacheable_tokens = token_counts or (None, None, 0, 0)
+        if prompt_eval_count:
+            self.apply_prompt_token_count(prompt_eval_count, prompt_tokens, cacheable_tokens)
         if self.current_response:
-            response_to_track = self.current_response
-            if not self.show_thinking_var.get():
-                response_to_track = self.filter_thinking_tags(self.current_response)
-            self.add_to_conversation_history("assistant", response_to_track)
+            self.add_to_conversation_history("assistant", response_to_display, tokens=eval_count,
+                                             sent=self.current_response)
+            self.current_response = ""
+            self.manage_context_window()
         
         # Reset button states
         self.send_button.config(state='normal')
@@ -4640,6 +5610,28 @@ Once installed, click 'Refresh' in the main application to detect models.
             'repeat_penalty': 1.1,
             'max_tokens': 0,
             'seed': -1,
+            'stream_fps': 30,
+            'chat_session': True,  # Stable prompt prefix + num_ctx/keep_alive for KV cache reuse
+            'num_ctx': 0,  # 0 = auto (DEFAULT_NUM_CTX capped at the model's window)
+            'keep_alive': '30m',
+            'model_keep_alive': {},  # Per-model overrides, e.g. {"llama3.1:8b": "2h"}
+            
+            # HTTP connection settings
+            'ollama_host': OLLAMA_BASE_URL,
+            'ollama_backends': [],  # Extra servers for chat/translation load balancing
+            'http_pool_size': 4,
+            'http_retries': 2,
+            'http_timeouts': {},  # Per-endpoint overrides, e.g. {"/api/show": 20}
+            
+            # Warm pool
+            'pinned_models': [],  # Models kept loaded with keep_alive -1
+            'residency_budget_gb': 0,  # Unload idle models beyond this much loaded model memory (0 = no limit)
+            
+            # Resource monitoring
+            'process_monitor_interval': 2,  # Seconds between Ollama process tree samples
+            
+            # Context window management
+            'context_budget_percent': 75,  # History is summarized beyond this share of the context window
             
             # UI preferences
             'window_geometry': '1400x900',
@@ -4668,6 +5660,28 @@ Once installed, click 'Refresh' in the main application to detect models.
                 'repeat_penalty': self.repeat_penalty_var.get(),
                 'max_tokens': self.max_tokens_var.get(),
                 'seed': self.seed_var.get(),
+                'stream_fps': self.stream_fps_var.get(),
+                'chat_session': self.chat_session_var.get(),
+                'num_ctx': self.num_ctx_var.get(),
+                'keep_alive': self.keep_alive_var.get(),
+                'model_keep_alive': self.model_keep_alive,
+                
+                # HTTP connection settings
+                'ollama_host': self.ollama_client.base_url,
+                'ollama_backends': self.backend_pool.extra_urls(),
+                'http_pool_size': self.ollama_client.pool_size,
+                'http_retries': self.ollama_client.retries,
+                'http_timeouts': self.http_timeout_overrides,
+                
+                # Warm pool
+                'pinned_models': sorted(self.residency.pinned),
+                'residency_budget_gb': self.residency.budget_bytes / 1024 ** 3,
+                
+                # Resource monitoring
+                'process_monitor_interval': self.process_monitor_interval,
+                
+                # Context window management
+                'context_budget_percent': self.context_budget_percent,
                 
                 # UI preferences
                 'window_geometry': self.root.geometry(),
@@ -4684,6 +5698,21 @@ Once installed, click 'Refresh' in the main application to detect models.
             # Don't show error to user, just log it
             print(f"Error saving settings: {e}")
     
+    def numeric_setting(self, settings, key, default, minimum=None, maximum=None, convert=float):
+        """Return a setting converted to a number and clamped to [minimum, maximum], or default if invalid."""
+        try:
+            value = convert(settings.get(key, default))
+            if value != value:
+                raise ValueError("NaN")
+        except (TypeError, ValueError, OverflowError):
+            print(f"Invalid setting '{key}': {settings.get(key)!r}, using {default}")
+            return default
+        if minimum is not None:
+            value = max(minimum, value)
+        if maximum is not None:
+            value = min(maximum, value)
+        return value
+    
     def load_settings(self):
         """Load settings from file."""
         try:
@@ -4715,6 +5744,50 @@ Once installed, click 'Refresh' in the main application to detect models.
             self.repeat_penalty_var.set(settings.get('repeat_penalty', defaults['repeat_penalty']))
             self.max_tokens_var.set(settings.get('max_tokens', defaults['max_tokens']))
             self.seed_var.set(settings.get('seed', defaults['seed']))
+            # Same bounds as the settings spinbox and its validation
+            self.stream_fps_var.set(self.numeric_setting(settings, 'stream_fps', defaults['stream_fps'],
+                                                         StreamRenderer.MIN_FPS, StreamRenderer.MAX_FPS, int))
+            self.stream_renderer.set_fps(self.stream_fps_var.get())
+            self.chat_session_var.set(settings.get('chat_session', defaults['chat_session']))
+            self.num_ctx_var.set(settings.get('num_ctx', defaults['num_ctx']))
+            keep_alive = str(settings.get('keep_alive', defaults['keep_alive'])).strip()
+            if keep_alive and not PATTERNS['keep_alive'].match(keep_alive):
+                print(f"Invalid setting 'keep_alive': {keep_alive!r}, using {defaults['keep_alive']}")
+                keep_alive = defaults['keep_alive']
+            self.keep_alive_var.set(keep_alive)
+            # Invalid per-model values would make every request to that model fail, so they are dropped
+            self.model_keep_alive = {
+                model: keep_alive
+                for model, keep_alive in settings.get('model_keep_alive', defaults['model_keep_alive']).items()
+                if PATTERNS['keep_alive'].match(str(keep_alive).strip())
+            }
+            
+            # HTTP connection settings; timeouts that aren't positive numbers are dropped
+            http_timeouts = settings.get('http_timeouts', defaults['http_timeouts'])
+            self.http_timeout_overrides = {}
+            for endpoint in (http_timeouts if isinstance(http_timeouts, dict) else ()):
+                timeout = self.numeric_setting(http_timeouts, endpoint, 0, maximum=3600)
+                if timeout > 0:
+                    self.http_timeout_overrides[endpoint] = timeout
+            self.ollama_client.configure(
+                pool_size=self.numeric_setting(settings, 'http_pool_size', defaults['http_pool_size'], 1, 64, int),
+                retries=self.numeric_setting(settings, 'http_retries', defaults['http_retries'], 0, 10, int),
+                timeouts=self.http_timeout_overrides
+            )
+            self.backend_pool.set_extra_urls(settings.get('ollama_backends', defaults['ollama_backends']))
+            
+            # Warm pool
+            self.residency.pinned = set(settings.get('pinned_models', defaults['pinned_models']))
+            budget_gb = self.numeric_setting(settings, 'residency_budget_gb', defaults['residency_budget_gb'], 0, 1024 ** 2)
+            self.residency.budget_bytes = int(budget_gb * 1024 ** 3)
+            
+            # Resource monitoring
+            self.process_monitor_interval = self.numeric_setting(
+                settings, 'process_monitor_interval', defaults['process_monitor_interval'], 0.5, 3600)
+            
+            # Context window management
+            self.context_budget_percent = self.numeric_setting(
+                settings, 'context_budget_percent', defaults['context_budget_percent'], 10, 100, int)
             
             # Window geometry
             window_geometry = settings.get('window_geometry', defaults['window_geometry'])
@@ -4727,24 +5800,114 @@ Once installed, click 'Refresh' in the main application to detect models.
             #     # Schedule mode switch after UI is ready
             #     self.root.after(100, self.switch_to_translator_mode)
             
-            # Model selection - restore after models are loaded
-            saved_model = settings.get('selected_model', '')
-            if saved_model:
-                # Schedule model restoration after models list is populated
-                self.root.after(200, lambda: self.restore_selected_model(saved_model))
+            # Model selection - restored by refresh_models once the models list is known
+            self.saved_model = settings.get('selected_model', '')
                 
         except Exception as e:
             # Don't show error to user, just log it and continue with defaults
             print(f"Error loading settings: {e}")
     
-    def restore_selected_model(self, model_name):
-        """Restore previously selected model if it's still available."""
+    def get_saved_ollama_host(self):
+        """Get the Ollama server URL from settings, OLLAMA_HOST or the local default."""
+        # Read before the rest of the settings: the HTTP client must exist before
+        # load_settings() runs, and it needs to know which server to talk to
+        default_host = os.environ.get('OLLAMA_HOST') or OLLAMA_BASE_URL
+        try:
+            if os.path.exists(self.settings_file):
+                with open(self.settings_file, 'r') as f:
+                    settings = json.load(f)
+                return normalize_ollama_host(settings.get('ollama_host') or default_host)
+        except Exception as e:
+            print(f"Error reading Ollama host from settings: {e}")
+        try:
+            return normalize_ollama_host(default_host)
+        except ValueError as e:
+            print(f"Invalid OLLAMA_HOST, using {OLLAMA_BASE_URL}: {e}")
+            return OLLAMA_BASE_URL
+    
+    def show_server_endpoint_dialog(self):
+        """Ask for the Ollama server URL and switch the HTTP client to it."""
+        new_host = simpledialog.askstring(
+            "Server Endpoint",
+            "Ollama server URL (e.g. http://192.168.1.20:11434):",
+            initialvalue=self.ollama_client.base_url,
+            parent=self.root
+        )
+        if not new_host or not new_host.strip():
+            return
+        
+        try:
+            base_url = normalize_ollama_host(new_host.strip())
+        except ValueError as e:
+            messagebox.showerror("Invalid Server Endpoint", f"'{new_host.strip()}' is not a valid server URL: {e}")
+            return
+        
+        self.ollama_client.set_base_url(base_url)
+        self.running_models.invalidate()
+        self.model_loads.reset("switched to another server")
+        self.save_settings()
+        self.show_status_message(f"Ollama server endpoint set to {self.ollama_client.base_url}")
+        
+        # Re-check the server and refresh the model list off the UI thread
+        def check_endpoint():
+            self.root.after(0, self.update_server_status_display)
+            if self.is_ollama_server_running():
+                self.root.after(0, self.refresh_models)
+            else:
+                self.root.after(0, lambda: self.show_status_message(f"Ollama server at {self.ollama_client.base_url} is not reachable"))
+        
+        threading.Thread(target=check_endpoint, daemon=True).start()
+    
+    def show_backends_dialog(self):
+        """Ask for extra Ollama servers used to load-balance chat and translation."""
+        new_urls = simpledialog.askstring(
+            "Additional Backends",
+            "Extra Ollama server URLs, comma separated\n"
+            "(chat and translation are routed to the least busy one):",
+            initialvalue=", ".join(self.backend_pool.extra_urls()),
+            parent=self.root
+        )
+        if new_urls is None:
+            return
+        
+        urls = [url.strip() for url in new_urls.split(',') if url.strip()]
+        for url in urls:
+            try:
+                normalize_ollama_host(url)
+            except ValueError as e:
+                messagebox.showerror("Invalid Backend", f"'{url}' is not a valid server URL: {e}")
+                return
+        
+        self.backend_pool.set_extra_urls(urls)
+        self.save_settings()
+        self.show_status_message(f"Backend pool now has {len(self.backend_pool.backends)} server(s)")
+        
+        def check_backends():
+            self.backend_pool.check_health()
+            self.root.after(0, self.update_backend_stats_display)
+        
+        threading.Thread(target=check_backends, daemon=True).start()
+    
+    def update_backend_stats_display(self):
+        """Show per-backend load and time-to-first-token in the left panel."""
+        if not hasattr(self, 'backend_stats_label'):
+            return
+        
+        # A single backend is already covered by the server status line
+        if len(self.backend_pool.backends) < 2:
+            self.backend_stats_label.config(text="")
+            return
+        self.backend_stats_label.config(text="\n".join(self.backend_pool.stats_lines()))
+    
+    def restore_selected_model(self, model_name, models=None):
+        """Restore previously selected model if it's still available (in models, fetched if not given)."""
         try:
             if not model_name:
                 return
                 
             # Get current available models
-            models = self.get_ollama_models()
+            if models is None:
+                models = self.get_ollama_models()
             
             # Check if the saved model is still available
             if model_name in models:
@@ -4817,29 +5980,36 @@ Once installed, click 'Refresh' in the main application to detect models.
         
         return max(1, estimated_tokens)  # Minimum 1 token
     
+    def schedule_token_count(self, name, callback, delay_ms=200):
+        """Run callback once typing in an input pauses, instead of retokenizing on every keystroke."""
+        job = self.token_count_jobs.get(name)
+        if job is not None:
+            self.root.after_cancel(job)
+        self.token_count_jobs[name] = self.root.after(delay_ms, callback)
+    
     def update_token_counter(self):
         """Update the token counter display with current usage."""
         if not self.selected_model or self.max_context_tokens == 0:
             self.token_counter_label.config(text="Tokens: 0 / 0", foreground="gray")
             return
         
-        # Calculate tokens used in current conversation
-        total_tokens = 0
-        for message in self.conversation_history:
-            total_tokens += self.estimate_token_count(message.get('content', ''))
+        # The running total is kept by add_to_conversation_history; only the unsent draft is estimated
+        total_tokens = self.current_chat_tokens
+        draft = self.user_input.get("1.0", "end-1c") if hasattr(self, 'user_input') else ""
+        draft_tokens = self.token_counter.count(draft.strip())
+        draft_note = f" (+{'' if self.token_counter.exact else '~'}{draft_tokens} draft)" if draft_tokens else ""
         
-        self.current_chat_tokens = total_tokens
-        
-        # Calculate percentage used
-        if self.max_context_tokens > 0:
-            usage_percentage = (total_tokens / self.max_context_tokens) * 100
-            remaining_tokens = self.max_context_tokens - total_tokens
+        # Calculate percentage used (of the num_ctx every request sends)
+        context_tokens = self.effective_context_tokens()
+        if context_tokens > 0:
+            usage_percentage = (total_tokens / context_tokens) * 100
+            remaining_tokens = context_tokens - total_tokens
             
             # Format numbers for display
-            if self.max_context_tokens >= 1000:
-                max_display = f"{self.max_context_tokens // 1000}K"
+            if context_tokens >= 1000:
+                max_display = f"{context_tokens // 1000}K"
             else:
-                max_display = str(self.max_context_tokens)
+                max_display = str(context_tokens)
             
             # Set color based on usage - more conservative thresholds
             if usage_percentage < 60:
@@ -4857,11 +6027,11 @@ Once installed, click 'Refresh' in the main application to detect models.
                 warning = " ⚡"
             
             self.token_counter_label.config(
-                text=f"Tokens: {total_tokens} / {max_display}{warning}",
+                text=f"Tokens: {total_tokens}{draft_note} / {max_display}{warning}",
                 foreground=color
             )
         else:
-            self.token_counter_label.config(text=f"Tokens: {total_tokens}", foreground="gray")
+            self.token_counter_label.config(text=f"Tokens: {total_tokens}{draft_note}", foreground="gray")
     
     def reset_conversation_history(self):
         """Reset the conversation history and token counter."""
@@ -4869,15 +6039,153 @@ Once installed, click 'Refresh' in the main application to detect models.
         self.current_chat_tokens = 0
         self.update_token_counter()
     
-    def add_to_conversation_history(self, role, content):
-        """Add a message to the conversation history for token tracking."""
+    def manage_context_window(self):
+        """Summarize older turns in the background once the history passes the context budget."""
+        context_tokens = self.effective_context_tokens()
+        if self.summarizing_history or not self.selected_model or context_tokens <= 0:
+            return
+        budget = context_tokens * self.context_budget_percent // 100
+        if self.current_chat_tokens < budget:
+            return
+        
+        # Everything except the latest messages is folded into one summary (including an earlier summary)
+        older_messages = self.conversation_history[:-self.context_keep_recent]
+        if len(older_messages) < 2:
+            self.show_status_message(f"⚠️ Latest messages alone exceed the context budget ({budget} tokens)")
+            return
+        
+        self.summarizing_history = True
+        self.show_status_message(f"Context at {self.current_chat_tokens}/{context_tokens} tokens, "
+                                 f"summarizing {len(older_messages)} earlier messages...")
+        threading.Thread(target=self.summarize_history, args=(self.selected_model, older_messages), daemon=True).start()
+    
+    def summarize_history(self, model, older_messages):
+        """Ask the model for a summary of older_messages (runs in a worker thread).
+        
+        The transcript is summarized in pieces that fit the context window: each request
+        carries the summary so far plus the next piece, and the last answer is the summary.
+        """
+        window = self.context_window(model, fetch=True)
+        reply_tokens = max(128, window // 5)  # Upper bound for each summary (and room for the previous one)
+        prompt_tokens = 128  # Instructions and chat template
+        chunk_budget = window - 2 * reply_tokens - prompt_tokens
+        
+        try:
+            summary, summary_tokens = "", None
+            for chunk in self.split_transcript(older_messages, chunk_budget):
+                content = f"Summary so far:\n{summary}\n\nThe conversation continues:\n{chunk}" if summary else chunk
+                payload = {
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": "Summarize the following conversation for your own later reference. "
+                                                      "Keep every fact, decision, name, number and open question; "
+                                                      "drop pleasantries. Reply with the summary only."},
+                        {"role": "user", "content": content}
+                    ],
+                    "stream": False,
+                    "options": {"num_predict": reply_tokens}
+                }
+                # Same num_ctx/keep_alive as chat: different options would reload the model and evict the chat's KV cache
+                self.apply_session_settings(payload)
+                response = self.ollama_client.post("/api/chat", payload, timeout=300)
+                response.raise_for_status()
+                data = response.json()
+                # Reasoning models may wrap their notes in <think> blocks; keep only the answer
+                think_filter = ThinkTagFilter()
+                think_filter.feed(data.get("message", {}).get("content", ""))
+                think_filter.flush()
+                summary = think_filter.answer_text().strip()
+                summary_tokens = data.get("eval_count")
+                if not summary:
+                    raise ValueError("empty summary")
+            self.root.after(0, lambda: self.apply_history_summary(older_messages, summary, summary_tokens))
+        except Exception as e:
+            self.root.after(0, lambda: self.show_status_message(f"Could not summarize conversation history: {str(e)}"))
+            self.summarizing_history = False
+    
+    def split_transcript(self, messages, budget):
+        """Return the messages as transcript pieces of at most budget tokens each (oversized messages are cut)."""
+        budget = max(1, budget * 9 // 10)  # Leave slack for estimated counts
+        chunks, lines, used = [], [], 0
+        for message in messages:
+            line = f"{message['role']}: {message['content']}"
+            tokens = max(message.get('tokens') or 0, self.token_counter.count(line))
+            if tokens > budget:
+                # Keep the start of a message that can't fit on its own
+                line = line[:len(line) * budget // tokens]
+                tokens = budget
+            if lines and used + tokens > budget:
+                chunks.append("\n\n".join(lines))
+                lines, used = [], 0
+            lines.append(line)
+            used += tokens
+        if lines:
+            chunks.append("\n\n".join(lines))
+        return chunks
+    
+    def apply_history_summary(self, older_messages, summary, summary_tokens):
+        """Replace the summarized messages with the summary, if the history still starts with them."""
+        self.summarizing_history = False
+        
+        # A reset or new chat while the summary was generated makes it stale
+        count = len(older_messages)
+        if any(a is not b for a, b in zip(self.conversation_history[:count], older_messages)) \
+                or len(self.conversation_history) < count:
+            return
+        
+        content = f"Summary of the earlier conversation:\n{summary}"
+        tokens = summary_tokens or self.token_counter.count(content)
+        removed_tokens = sum(message['tokens'] for message in older_messages)
+        self.conversation_history[:count] = [
+            {'role': 'system', 'content': content, 'tokens': tokens, 'exact': bool(summary_tokens), 'summary': True}
+        ]
+        self.current_chat_tokens += tokens - removed_tokens
+        self.update_token_counter()
+        self.show_status_message(f"Summarized {count} earlier messages: {removed_tokens} → {tokens} tokens")
+    
+    def add_to_conversation_history(self, role, content, tokens=None, sent=None):
+        """Add a message to the conversation history for token tracking.
+        
+        tokens is the server-reported count when known; otherwise it is estimated
+        until the server's count for the turn arrives. sent is the exact text to
+        resend in session mode (e.g. a reply as generated, before cleanup).
+        """
         if content.strip():  # Only add non-empty messages
-            self.conversation_history.append({
+            exact = bool(tokens)
+            if not exact:
+                tokens = self.token_counter.count(content.strip())
+            message = {
                 'role': role,
-                'content': content.strip()
-            })
+                'content': content.strip(),
+                'tokens': tokens,
+                'exact': exact
+            }
+            if sent:
+                message['sent'] = sent
+            self.conversation_history.append(message)
+            self.current_chat_tokens += tokens
             self.update_token_counter()
     
+    def apply_prompt_token_count(self, prompt_eval_count, prompt_tokens, cacheable_tokens):
+        """Replace the estimate for the last user message with the server's prompt_eval_count.
+        
+        prompt_tokens/cacheable_tokens are the local counts of the prompt sent with this request,
+        used to tell a KV cache hit from a full evaluation (see cached_prompt_tokens).
+        """
+        if not self.conversation_history or self.conversation_history[-1]['role'] != 'user':
+            return
+        message = self.conversation_history[-1]
+        earlier_tokens = self.current_chat_tokens - message['tokens']
+        if cached_prompt_tokens(prompt_eval_count, prompt_tokens, cacheable_tokens):
+            # The earlier messages came from the server's prompt cache, so only this turn was evaluated
+            new_tokens = prompt_eval_count
+        else:
+            # The whole prompt was evaluated: this turn adds what the earlier messages don't account for
+            new_tokens = max(1, prompt_eval_count - earlier_tokens)
+        self.current_chat_tokens = earlier_tokens + new_tokens
+        message['tokens'] = new_tokens
+        message['exact'] = True
+    
     def show_settings_dialog(self):
         """Show the model parameters settings dialog.
         
@@ -4928,7 +6236,11 @@ Once installed, click 'Refresh' in the main application to detect models.
             'top_k': self.top_k_var.get(),
             'repeat_penalty': self.repeat_penalty_var.get(),
             'max_tokens': self.max_tokens_var.get(),
-            'seed': self.seed_var.get()
+            'seed': self.seed_var.get(),
+            'stream_fps': self.stream_fps_var.get(),
+            'chat_session': self.chat_session_var.get(),
+            'num_ctx': self.num_ctx_var.get(),
+            'keep_alive': self.keep_alive_var.get()
         }
         
         # Create notebook for organized sections
@@ -4949,14 +6261,40 @@ Once installed, click 'Refresh' in the main application to detect models.
         ttk.Label(timeout_frame, text="How long to wait for model response", 
                  font=('Arial', 9), foreground='#666').pack(anchor='w', pady=(2, 0))
         
+        ttk.Label(timeout_frame, text="Streaming refresh rate (frames per second):").pack(anchor='w', pady=(10, 0))
+        fps_spinbox = ttk.Spinbox(timeout_frame, from_=StreamRenderer.MIN_FPS, to=StreamRenderer.MAX_FPS, 
+                                 textvariable=self.stream_fps_var, width=10)
+        fps_spinbox.pack(anchor='w', pady=(5, 0))
+        ttk.Label(timeout_frame, text="How often streamed text is drawn; lower values use less CPU", 
+                 font=('Arial', 9), foreground='#666').pack(anchor='w', pady=(2, 0))
+        
+        # KV cache session settings
+        session_frame = ttk.LabelFrame(general_frame, text="Session", padding=10)
+        session_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        session_check = ttk.Checkbutton(session_frame, text="Reuse the server's prompt cache across turns", 
+                                       variable=self.chat_session_var)
+        session_check.pack(anchor='w')
+        ttk.Label(session_frame, text="Resends replies unchanged with a fixed context size and keep-alive", 
+                 font=('Arial', 9), foreground='#666').pack(anchor='w', pady=(2, 0))
+        
+        session_values_frame = ttk.Frame(session_frame)
+        session_values_frame.pack(anchor='w', pady=(5, 0))
+        ttk.Label(session_values_frame, text="Context size (num_ctx, 0 = auto):").grid(row=0, column=0, sticky='w')
+        ttk.Spinbox(session_values_frame, from_=0, to=1048576, increment=1024, 
+                   textvariable=self.num_ctx_var, width=10).grid(row=0, column=1, sticky='w', padx=(5, 0))
+        ttk.Label(session_values_frame, text="Keep model loaded for (keep_alive):").grid(row=1, column=0, sticky='w', pady=(5, 0))
+        ttk.Entry(session_values_frame, textvariable=self.keep_alive_var, 
+                 width=10).grid(row=1, column=1, sticky='w', padx=(5, 0), pady=(5, 0))
+        
         # Show thinking toggle
         thinking_frame = ttk.LabelFrame(general_frame, text="Display Options", padding=10)
         thinking_frame.pack(fill=tk.X, pady=(0, 10))
         
-        thinking_check = ttk.Checkbutton(thinking_frame, text="Show model reasoning (<think> tags)", 
+        thinking_check = ttk.Checkbutton(thinking_frame, text="Show model reasoning pane", 
                                         variable=self.show_thinking_var)
         thinking_check.pack(anchor='w')
-        ttk.Label(thinking_frame, text="Display internal model reasoning when available", 
+        ttk.Label(thinking_frame, text="Expand the side pane that streams the model's reasoning", 
                  font=('Arial', 9), foreground='#666').pack(anchor='w', pady=(2, 0))
         
         # Model parameters tab
@@ -5065,6 +6403,19 @@ Once installed, click 'Refresh' in the main application to detect models.
                 if timeout_val <= 0:
                     raise ValueError("Timeout must be positive")
                 
+                # Validate streaming frame rate
+                fps_val = int(self.stream_fps_var.get())
+                if not StreamRenderer.MIN_FPS <= fps_val <= StreamRenderer.MAX_FPS:
+                    raise ValueError(f"Streaming refresh rate must be between {StreamRenderer.MIN_FPS} and {StreamRenderer.MAX_FPS}")
+                self.stream_renderer.set_fps(fps_val)
+                
+                # Validate session settings
+                if self.num_ctx_var.get() < 0:
+                    raise ValueError("Context size must be 0 or positive")
+                if not PATTERNS['keep_alive'].match(self.keep_alive_var.get().strip()):
+                    raise ValueError("Keep-alive must be seconds or a duration like 30m, 2h or -1")
+                self.update_token_counter()
+                
                 # Log settings changes
                 self.show_status_message("✅ Model parameters applied successfully")
                 
@@ -5084,6 +6435,14 @@ Once installed, click 'Refresh' in the main application to detect models.
                     changes.append(f"Seed: {original_values['seed']} → {self.seed_var.get()}")
                 if original_values['timeout'] != self.response_timeout_var.get():
                     changes.append(f"Timeout: {original_values['timeout']}s → {self.response_timeout_var.get()}s")
+                if original_values['stream_fps'] != self.stream_fps_var.get():
+                    changes.append(f"Streaming refresh rate: {original_values['stream_fps']} → {self.stream_fps_var.get()} fps")
+                if original_values['chat_session'] != self.chat_session_var.get():
+                    changes.append(f"Prompt cache session: {'enabled' if self.chat_session_var.get() else 'disabled'}")
+                if original_values['num_ctx'] != self.num_ctx_var.get():
+                    changes.append(f"Context size: {original_values['num_ctx']} → {self.num_ctx_var.get()}")
+                if original_values['keep_alive'] != self.keep_alive_var.get():
+                    changes.append(f"Keep-alive: {original_values['keep_alive']} → {self.keep_alive_var.get()}")
                 if original_values['thinking'] != self.show_thinking_var.get():
                     thinking_status = "enabled" if self.show_thinking_var.get() else "disabled"
                     changes.append(f"Show reasoning: {thinking_status}")
@@ -5098,7 +6457,7 @@ Once installed, click 'Refresh' in the main application to detect models.
                 
                 dialog.destroy()
                 
-            except ValueError as e:
+            except (ValueError, tk.TclError) as e:
                 messagebox.showerror("Invalid Input", f"Please check your input values:\n{str(e)}")
         
         def cancel_settings():
@@ -5111,6 +6470,10 @@ Once installed, click 'Refresh' in the main application to detect models.
             self.repeat_penalty_var.set(original_values['repeat_penalty'])
             self.max_tokens_var.set(original_values['max_tokens'])
             self.seed_var.set(original_values['seed'])
+            self.stream_fps_var.set(original_values['stream_fps'])
+            self.chat_session_var.set(original_values['chat_session'])
+            self.num_ctx_var.set(original_values['num_ctx'])
+            self.keep_alive_var.set(original_values['keep_alive'])
             
             self.show_status_message("Settings cancelled - original values restored")
             dialog.destroy()
@@ -5125,6 +6488,11 @@ Once installed, click 'Refresh' in the main application to detect models.
             self.repeat_penalty_var.set(1.1)
             self.max_tokens_var.set(0)
             self.seed_var.set(-1)
+            self.stream_fps_var.set(30)
+            self.stream_renderer.set_fps(30)
+            self.chat_session_var.set(True)
+            self.num_ctx_var.set(0)
+            self.keep_alive_var.set("30m")
             
             update_value_labels()
             self.show_status_message("All parameters reset to default values")
@@ -5255,10 +6623,22 @@ Once installed, click 'Refresh' in the main application to detect models.
             self.translate_button.config(state='normal')
         else:
             self.translate_button.config(state='disabled')
+        
+        self.schedule_token_count('translation', self.update_translation_token_count)
+    
+    def update_translation_token_count(self):
+        """Show the size of the translation input in tokens."""
+        text = self.translation_input.get("1.0", tk.END).strip()
+        if text:
+            prefix = "" if self.token_counter.exact else "~"
+            self.translation_token_label.config(text=f"Input: {prefix}{self.token_counter.count(text)} tokens")
+        else:
+            self.translation_token_label.config(text="")
     
     def clear_translation(self):
         """Clear both input and output translation areas."""
         self.translation_input.delete("1.0", tk.END)
+        self.translation_token_label.config(text="")
         self.translation_output.config(state='normal')
         self.translation_output.delete("1.0", tk.END)
         self.translation_output.config(state='disabled')
@@ -5313,31 +6693,32 @@ Once installed, click 'Refresh' in the main application to detect models.
         self.translation_output.delete("1.0", tk.END)
         self.translation_output.config(state='disabled')
         
-        # Reset response accumulator
+        # Reset response accumulator and the streaming <think> filter
         self.current_response = ""
+        self.think_filter = ThinkTagFilter()
         
         self.show_status_message(f"Translating from {source_lang} to {target_lang}...")
         
+        generation = self.stream_renderer.begin()
+        
         def run_translation():
-            self.run_translation_query(self.selected_model, prompt)
+            self.run_translation_query(self.selected_model, prompt, generation)
         
         threading.Thread(target=run_translation, daemon=True).start()
     
-    def run_translation_query(self, model, prompt):
-        """Run translation query and update translator interface."""
-        if not self.ollama_path:
-            self.root.after(0, lambda: self.update_translation_output("Error: Ollama not found\n"))
-            self.root.after(0, self.finalize_translation_response)
-            return
-
+    def run_translation_query(self, model, prompt, generation):
+        """Run translation query and update translator interface (generation is the stream renderer id)."""
         try:
             timeout = int(self.response_timeout_var.get())
         except ValueError:
             timeout = 60
 
         def query():
+            backend = None
+            request = None
+            ttft_ms = None
+            final_chunk = None
             try:
-                url = "http://localhost:11434/api/generate"
                 payload = {
                     "model": model,
                     "prompt": prompt,
@@ -5364,66 +6745,91 @@ Once installed, click 'Refresh' in the main application to detect models.
                 if self.seed_var.get() >= 0:
                     payload["options"]["seed"] = self.seed_var.get()
                 
+                # Same num_ctx/keep_alive as chat, so switching modes doesn't reload the model
+                self.apply_session_settings(payload)
+                self.residency.touch(model)
+                
                 # Remove options key if empty
                 if not payload["options"]:
                     del payload["options"]
                 
-                # Store the request for potential cancellation
-                self.current_request = requests.post(url, json=payload, stream=True, timeout=timeout)
+                # Route to the least-loaded backend and store the request for potential cancellation
+                request_start = time.perf_counter()
+                if not self.stream_renderer.is_active(generation):
+                    return  # Stopped while the request was being prepared
+                backend, request = self.backend_pool.open_stream("/api/generate", payload, timeout)
+                self.current_request = request
                 
-                with self.current_request as response:
+                with request as response:
                     response.raise_for_status()
                     for line in response.iter_lines():
+                        if not self.stream_renderer.is_active(generation):
+                            return  # Stopped by the user
                         if line:
                             try:
                                 data = json.loads(line)
                                 if 'response' in data:
                                     chunk = data['response']
                                     if chunk:
+                                        if ttft_ms is None:
+                                            ttft_ms = (time.perf_counter() - request_start) * 1000
                                         self.current_response += chunk
-                                        self.root.after(0, lambda c=chunk: self.update_translation_output(c))
+                                        self.stream_renderer.push(self.update_translation_output, chunk, generation)
                                 
                                 if data.get('done', False):
+                                    final_chunk = data
                                     break
                             except json.JSONDecodeError:
                                 continue
                 
-                self.root.after(0, self.finalize_translation_response)
+                self.stream_renderer.call(lambda: self.finalize_translation_response(generation), generation)
+                if final_chunk is not None:
+                    # On its own thread: reading server memory is an /api/ps request
+                    threading.Thread(target=self.record_request_metrics, daemon=True,
+                                     args=(backend, final_chunk, ttft_ms)).start()
             except requests.exceptions.Timeout:
-                self.root.after(0, lambda: self.update_translation_output("\nError: Request timed out.\n"))
-                self.root.after(0, self.finalize_translation_response)
+                self.stream_renderer.push(self.update_translation_output, "\nError: Request timed out.\n", generation)
+                self.stream_renderer.call(lambda: self.finalize_translation_response(generation), generation)
             except requests.exceptions.RequestException as e:
-                if not self.is_generating:
-                    return  # User stopped the generation
-                self.root.after(0, lambda: self.update_translation_output(f"\nError: {str(e)}\n"))
-                self.root.after(0, self.finalize_translation_response)
+                # A stopped translation's renderer generation has ended, so nothing more is shown for it
+                self.stream_renderer.push(self.update_translation_output, f"\nError: {str(e)}\n", generation)
+                self.stream_renderer.call(lambda: self.finalize_translation_response(generation), generation)
             except Exception as e:
-                if not self.is_generating:
-                    return  # User stopped the generation
-                self.root.after(0, lambda: self.update_translation_output(f"\nAn unexpected error occurred: {str(e)}\n"))
-                self.root.after(0, self.finalize_translation_response)
+                self.stream_renderer.push(self.update_translation_output, f"\nAn unexpected error occurred: {str(e)}\n", generation)
+                self.stream_renderer.call(lambda: self.finalize_translation_response(generation), generation)
             finally:
-                self.current_request = None
+                if self.current_request is request:
+                    self.current_request = None
+                if backend is not None:
+                    self.backend_pool.release(backend, ttft_ms)
+                    self.root.after(0, self.update_backend_stats_display)
 
         threading.Thread(target=query, daemon=True).start()
     
     def update_translation_output(self, chunk):
         """Update the translation output with a chunk of text."""
+        # Reasoning is never part of a translation - drop <think> blocks as they stream
+        chunk, _ = self.think_filter.feed(chunk)
+        if self.translation_output.compare("end-1c", "==", "1.0"):
+            # Skip the blank lines models leave after a reasoning block
+            chunk = chunk.lstrip()
+        if not chunk:
+            return
         self.translation_output.config(state='normal')
         self.translation_output.insert(tk.END, chunk)
         self.translation_output.config(state='disabled')
         self.translation_output.see(tk.END)
     
-    def finalize_translation_response(self):
-        """Finalize the translation response and reset UI state."""
-        # Apply thinking filter if needed
-        if not self.show_thinking_var.get() and self.current_response:
-            filtered_response = self.filter_thinking_tags(self.current_response)
-            
-            # Update the output with filtered response
+    def finalize_translation_response(self, generation):
+        """Finalize the translation response and reset UI state (once per generation)."""
+        if not self.stream_renderer.end(generation):
+            return
+        
+        # Show any trailing text that was held back as a possible partial tag
+        remaining_text, _ = self.think_filter.flush()
+        if remaining_text:
             self.translation_output.config(state='normal')
-            self.translation_output.delete("1.0", tk.END)
-            self.translation_output.insert("1.0", filtered_response.strip())
+            self.translation_output.insert(tk.END, remaining_text)
             self.translation_output.config(state='disabled')
         
         # Reset UI state
@@ -5446,7 +6852,7 @@ Once installed, click 'Refresh' in the main application to detect models.
         self.translation_input.focus()
     
     def start_periodic_model_updates(self):
-        """Start periodic updates for model RAM and CPU/GPU usage information."""
+        """Start periodic updates for the model's RAM and GPU memory usage."""
         def update_model_usage():
             while self.monitoring:
                 try:
@@ -5457,7 +6863,12 @@ Once installed, click 'Refresh' in the main application to detect models.
                         # Get fresh model info
                         model_info = self.get_model_info(self.selected_model)
                         
-                        # Update only the RAM usage and CPU/GPU usage lines
+                        # The server dropped the model (keep_alive expired or it was evicted)
+                        if model_info and model_info['ram_usage'] == "Not loaded" and not self.is_generating:
+                            self.model_loads.unloaded(self.selected_model, "no longer in server memory")
+                            model_info = None
+                        
+                        # Update only the RAM usage and GPU memory lines
                         # Don't change the overall status or other details
                         if model_info:
                             # Schedule UI update on main thread
@@ -5471,9 +6882,9 @@ Once installed, click 'Refresh' in the main application to detect models.
                                         ram_color = "#1976D2" if model_info['ram_usage'] in ["Unknown", "Loading", "Error", "Not loaded"] else "green"
                                         self.model_detail_lines[3].config(text=f"RAM usage: {model_info['ram_usage']}", foreground=ram_color)
                                         
-                                        # Update CPU/GPU usage (line 4)
-                                        usage_color = "#1976D2" if model_info['gpu_cpu_usage'] in ["Unknown", "Loading", "Error", "Model not loaded", "Checking..."] else "green"
-                                        self.model_detail_lines[4].config(text=f"CPU/GPU usage: {model_info['gpu_cpu_usage']}", foreground=usage_color)
+                                        # Update GPU memory (line 4)
+                                        usage_color = "#1976D2" if model_info['vram_usage'] in ["Unknown", "Loading", "Error", "Model not loaded", "Checking..."] else "green"
+                                        self.model_detail_lines[4].config(text=f"GPU memory: {model_info['vram_usage']}", foreground=usage_color)
                                 except Exception:
                                     pass  # Silently ignore errors in UI updates
                             
@@ -5486,9 +6897,6 @@ Once installed, click 'Refresh' in the main application to detect models.
         threading.Thread(target=update_model_usage, daemon=True).start()
     
 if __name__ == "__main__":
-    import re
-    import random
-
     root = tk.Tk()
     app = OllamaGUI(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: single-pass inline markdown tokenizer vs. the previous implementation.
+
+Run from the repository root:
+
+    python benchmarks/bench_markdown.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Ollama_Tkinter_Ui import iter_inline_markdown
+
+
+def legacy_parse_inline_markdown(text):
+    """The previous _parse_inline_markdown: re.search every pattern, then slice the rest."""
+    parts = []
+    remaining = text
+    
+    patterns = [
+        (r'`([^`\n]+)`', 'inline_code'),
+        (r'\*\*([^*]+)\*\*', 'bold'),
+        (r'\*([^*]+)\*', 'italic'),
+        (r'__([^_]+)__', 'bold'),
+        (r'_([^_]+)_', 'italic'),
+    ]
+    
+    while remaining:
+        earliest_match = None
+        earliest_pos = len(remaining)
+        pattern_info = None
+        
+        for pattern, format_type in patterns:
+            match = re.search(pattern, remaining)
+            if match and match.start() < earliest_pos:
+                earliest_match = match
+                earliest_pos = match.start()
+                pattern_info = (pattern, format_type)
+        
+        if earliest_match:
+            if earliest_pos > 0:
+                parts.append(("text", remaining[:earliest_pos]))
+            parts.append((pattern_info[1], earliest_match.group(1)))
+            remaining = remaining[earliest_match.end():]
+        else:
+            if remaining:
+                parts.append(("text", remaining))
+            break
+    
+    return parts
+
+
+def generate_document(size, seed=42):
+    """Build a chat-like reply of roughly size characters with many emphasis markers."""
+    rng = random.Random(seed)
+    words = ["model", "token", "stream", "context", "layer", "weights", "prompt", "reply"]
+    pieces = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        style = rng.random()
+        if style < 0.08:
+            piece = f"**{word}**"
+        elif style < 0.14:
+            piece = f"*{word}*"
+        elif style < 0.20:
+            piece = f"`{word}()`"
+        elif style < 0.23:
+            piece = f"__{word}__"
+        elif style < 0.25:
+            piece = f"_{word}_"
+        else:
+            piece = word
+        pieces.append(piece)
+        pieces.append("\n" if rng.random() < 0.05 else " ")
+        length += len(piece) + 1
+    return "".join(pieces)
+
+
+def best_time(func, text, repeat):
+    """Return the fastest of repeat runs in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print(f"{'chars':>10} {'spans':>8} {'legacy ms':>12} {'single-pass ms':>15} {'speedup':>9}")
+    for size in (2_000, 10_000, 50_000, 200_000):
+        text = generate_document(size)
+        legacy = legacy_parse_inline_markdown(text)
+        current = list(iter_inline_markdown(text))
+        assert legacy == current, "tokenizers disagree"
+        
+        repeat = 5 if size <= 50_000 else 1
+        legacy_ms = best_time(legacy_parse_inline_markdown, text, repeat)
+        current_ms = best_time(lambda t: list(iter_inline_markdown(t)), text, repeat)
+        print(f"{len(text):>10} {len(current):>8} {legacy_ms:>12.2f} {current_ms:>15.2f} {legacy_ms / current_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
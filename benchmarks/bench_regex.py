@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""Benchmark: precompiled pattern registry vs. the previous inline regex parsing.
+
+Times one periodic model-info refresh (model details + ps usage line) and one
+download progress line, before and after. The "after" refresh reads the
+structured /api/show and /api/ps fields instead of regex-scraping the text
+layouts. Run from the repository root:
+
+    python benchmarks/bench_regex.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Ollama_Tkinter_Ui import ModelMetadata, RunningModel, parse_download_progress
+
+
+def legacy_model_info_parse(output, line):
+    """The previous get_model_info parsing: pattern strings re.search'ed on every refresh."""
+    import re
+    
+    model_info = {"size": "Unknown", "ram_usage": "Unknown", "gpu_cpu_usage": "Unknown", "context": "Unknown"}
+    output_lower = output.lower()
+    
+    # Parse size information - look for patterns like "7b", "13b", "70b"
+    size_patterns = [
+        r'(\d+(?:\.\d+)?)\s*b(?:illion)?',  # "7b" or "7 billion"
+        r'parameters[:\s]+(\d+(?:\.\d+)?)\s*b',  # "parameters: 7b"
+        r'model\s+size[:\s]+(\d+(?:\.\d+)?)\s*b',  # "model size: 7b"
+        r'param(?:eter)?s?[:\s]+(\d+(?:\.\d+)?)\s*b',  # "params: 7b"
+    ]
+
+    for pattern in size_patterns:
+        match = re.search(pattern, output_lower)
+        if match:
+            size_num = match.group(1)
+            model_info["size"] = f"{size_num}B"
+            break
+
+    # Parse context window - look for various context patterns
+    # Context tokens are different from model parameters!
+    context_patterns = [
+        # Patterns for context values with K/M/B suffixes (tokens, not parameters)
+        r'context(?:\s+(?:length|size|window))?[:\s]+(\d+(?:\.\d+)?)\s*([kmb])\s*(?:tokens?)?',  # "context length: 131k tokens"
+        r'max(?:imum)?[_\s]?context[:\s]+(\d+(?:\.\d+)?)\s*([kmb])\s*(?:tokens?)?',  # "max_context: 1.5m tokens"
+        r'context[_\s]?(?:size|window)[:\s]+(\d+(?:\.\d+)?)\s*([kmb])\s*(?:tokens?)?',  # "context_size: 2b tokens"
+        r'num_ctx[:\s]+(\d+(?:\.\d+)?)\s*([kmb])\s*(?:tokens?)?',  # "num_ctx: 131k tokens"
+        r'(\d+(?:\.\d+)?)\s*([kmb])\s*(?:token|context)',  # "131k token context"
+
+        # Patterns for raw context numbers (not parameters)
+        r'context(?:\s+(?:length|size|window))?[:\s]+(\d+)(?:\s+tokens?)?',  # "context length: 4096" or "context: 4096 tokens"
+        r'max(?:imum)?[_\s]?context[:\s]+(\d+)(?:\s+tokens?)?',  # "max_context: 4096"
+        r'context[_\s]?(?:size|window)[:\s]+(\d+)(?:\s+tokens?)?',  # "context_size: 4096"
+        r'num_ctx[:\s]+(\d+)(?:\s+tokens?)?',  # "num_ctx: 4096"
+        r'(\d+)\s*(?:token|k)\s*context',  # "4096 token context"
+
+        # Common context window sizes to help identify them
+        r'(?:context|window|tokens?).*?(\d+)\s*k(?:\s+tokens?)?',  # "context window of 8k tokens"
+        r'(?:supports?|up\s+to)\s+(\d+)\s*k\s*(?:token|context)',  # "supports 32k context"
+    ]
+
+    for pattern in context_patterns:
+        match = re.search(pattern, output_lower)
+        if match:
+            if len(match.groups()) == 2:
+                # Pattern matched with suffix (K/M/B)
+                value = float(match.group(1))
+                suffix = match.group(2).lower()
+
+                if suffix == 'k':
+                    context_size = int(value * 1000)
+                elif suffix == 'm':
+                    context_size = int(value * 1000000)
+                elif suffix == 'b':
+                    context_size = int(value * 1000000000)
+                else:
+                    context_size = int(value)
+            else:
+                # Pattern matched raw number
+                context_size = int(match.group(1))
+
+            # Validate that this looks like a context size, not parameter count
+            # Context windows are typically 1K-2M tokens, parameter counts are typically 1B-405B
+            if context_size < 1000:
+                # Very small numbers (like 7, 13, 70) are likely parameters, not context
+                continue
+            elif context_size > 10_000_000:
+                # Very large numbers (10M+) are likely parameters, not context tokens  
+                continue
+
+            # Format the output consistently for context tokens
+            if context_size >= 1000000:
+                # 1M+ tokens: show as "1.2M" format
+                if context_size % 1000000 == 0:
+                    model_info["context"] = f"{context_size//1000000}M"
+                else:
+                    model_info["context"] = f"{context_size/1000000:.1f}M"
+            elif context_size >= 1000:
+                # 1K+ tokens: show as "131K" format  
+                if context_size % 1000 == 0:
+                    model_info["context"] = f"{context_size//1000}K"
+                else:
+                    model_info["context"] = f"{context_size/1000:.1f}K"
+            else:
+                # Less than 1000: show exact number
+                model_info["context"] = str(context_size)
+            break
+    
+    # Try to extract memory usage info for RAM with more flexible patterns
+    memory_match = re.search(r'(\d+(?:\.\d+)?)\s*(GB|MB|G|M)', line, re.IGNORECASE)
+    if memory_match:
+        memory_size = memory_match.group(1)
+        memory_unit = memory_match.group(2).upper()
+        # Normalize unit format
+        if memory_unit == "G":
+            memory_unit = "GB"
+        elif memory_unit == "M":
+            memory_unit = "MB"
+        model_info["ram_usage"] = f"~{memory_size} {memory_unit}"
+    else:
+        # If no memory info found but model is in ps output, consider it loaded
+        model_info["ram_usage"] = "~1.0 GB"  # Use default value
+
+    # Try to extract CPU/GPU usage percentages
+    # Look for patterns like "38%/62%" or "GPU: 38% CPU: 62%"
+    gpu_cpu_patterns = [
+        r'(\d+)%[/\s]*(\d+)%',  # "38%/62%" or "38% 62%"
+        r'gpu[:\s]*(\d+)%[,\s]*cpu[:\s]*(\d+)%',  # "GPU: 38%, CPU: 62%"
+        r'(\d+)%\s*gpu[,\s]*(\d+)%\s*cpu',  # "38% GPU, 62% CPU"
+        r'gpu[:\s]*(\d+)[,\s]*cpu[:\s]*(\d+)',  # "GPU: 38, CPU: 62" (without %)
+        r'(\d+)%[/\s,]*(\d+)%',  # More flexible separator patterns
+        r'gpu[:\s]*(\d+).*?cpu[:\s]*(\d+)',  # Very flexible GPU/CPU pattern
+    ]
+
+    usage_found = False
+    for pattern in gpu_cpu_patterns:
+        usage_match = re.search(pattern, line.lower())
+        if usage_match:
+            gpu_pct = usage_match.group(1)
+            cpu_pct = usage_match.group(2)
+            model_info["gpu_cpu_usage"] = f"{gpu_pct}%/{cpu_pct}%"
+            usage_found = True
+            break
+
+    if not usage_found:
+        # Look for any single percentage that might indicate model activity
+        # Check for GPU-specific patterns first
+        gpu_patterns = [
+            r'gpu[:\s]*(\d+(?:\.\d+)?)%',  # "GPU: 45%"
+            r'(\d+(?:\.\d+)?)%\s*gpu',  # "45% GPU"
+            r'vram[:\s]*(\d+(?:\.\d+)?)%',  # "VRAM: 45%"
+            r'(\d+(?:\.\d+)?)%\s*vram',  # "45% VRAM"
+        ]
+
+        # Check for CPU-specific patterns
+        cpu_patterns = [
+            r'cpu[:\s]*(\d+(?:\.\d+)?)%',  # "CPU: 45%"
+            r'(\d+(?:\.\d+)?)%\s*cpu',  # "45% CPU"
+            r'ram[:\s]*(\d+(?:\.\d+)?)%',  # "RAM: 45%"
+            r'(\d+(?:\.\d+)?)%\s*ram',  # "45% RAM"
+        ]
+
+        # Generic patterns (without explicit GPU/CPU context)
+        generic_patterns = [
+            r'(\d+(?:\.\d+)?)%',  # Any percentage like "45%", "67.5%"
+            r'(\d+(?:\.\d+)?)\s*percent',  # "45 percent"
+            r'load[:\s]*(\d+(?:\.\d+)?)%',  # "load: 45%"
+            r'usage[:\s]*(\d+(?:\.\d+)?)%',  # "usage: 45%"
+        ]
+
+        # Try GPU patterns first
+        for pattern in gpu_patterns:
+            gpu_match = re.search(pattern, line.lower())
+            if gpu_match:
+                pct = gpu_match.group(1)
+                model_info["gpu_cpu_usage"] = f"{pct}%/0%"
+                usage_found = True
+                break
+
+        # If no GPU pattern found, try CPU patterns
+        if not usage_found:
+            for pattern in cpu_patterns:
+                cpu_match = re.search(pattern, line.lower())
+                if cpu_match:
+                    pct = cpu_match.group(1)
+                    model_info["gpu_cpu_usage"] = f"0%/{pct}%"
+                    usage_found = True
+                    break
+
+        # If still no specific pattern found, use generic patterns
+        # Default to GPU usage for generic percentages (most common case)
+        if not usage_found:
+            for pattern in generic_patterns:
+                generic_match = re.search(pattern, line.lower())
+                if generic_match:
+                    pct = generic_match.group(1)
+                    # For generic percentages without context, assume GPU usage
+                    model_info["gpu_cpu_usage"] = f"{pct}%/0%"
+                    usage_found = True
+                    break
+    
+    if not usage_found:
+        model_info["gpu_cpu_usage"] = "Model running"
+    return model_info
+
+
+def legacy_parse_download_progress(line):
+    """The previous nested parse_download_progress, including its per-call import."""
+    import re
+    
+    percent_match = re.search(r'(\d+)%', line)
+    if percent_match:
+        percentage = int(percent_match.group(1))
+        
+        status = line.strip()
+        if 'pulling' in line.lower():
+            status = "Pulling manifest..."
+        elif 'downloading' in line.lower():
+            status = "Downloading model data..."
+        elif 'verifying' in line.lower():
+            status = "Verifying download..."
+        elif 'success' in line.lower() or 'complete' in line.lower():
+            status = "Download complete!"
+        
+        return {'percentage': percentage, 'status': status, 'raw': line}
+    
+    size_match = re.search(r'(\d+(?:\.\d+)?)\s*([KMGT]?B)', line)
+    if size_match:
+        return {'status': line.strip(), 'raw': line}
+    
+    return None
+
+
+def current_model_info_parse(show_data, ps_entry):
+    """The same refresh using the structured metadata and the exact /api/ps memory split."""
+    metadata = ModelMetadata.from_show("llama3.1:8b", "46e0c10c039e", show_data)
+    running = RunningModel.from_api(ps_entry)
+    model_info = {"size": metadata.size_display, "context": metadata.context_display}
+    model_info["ram_bytes"], model_info["gpu_percent"] = running.size_ram, running.gpu_percent
+    return model_info
+
+
+SHOW_OUTPUT = (
+    "  Model\n"
+    "    architecture        llama\n"
+    "    parameters          8.0B\n"
+    "    context length      131072\n"
+    "    embedding length    4096\n"
+    "    quantization        Q4_K_M\n"
+)
+SHOW_DATA = {
+    "details": {"family": "llama", "parameter_size": "8.0B", "quantization_level": "Q4_K_M"},
+    "model_info": {
+        "general.architecture": "llama",
+        "general.parameter_count": 8030261248,
+        "llama.context_length": 131072,
+        "llama.embedding_length": 4096,
+    },
+}
+PS_LINES = [
+    "llama3.1:8b    46e0c10c039e    6.2 GB    100% GPU    2025-01-01T10:00:00Z",
+    "qwen2.5:32b    9f13ba1299af    21 GB    48%/52% CPU/GPU    2025-01-01T10:00:00Z",
+    "phi3:mini    4f2222927938    2.8 GB    100% CPU    2025-01-01T10:00:00Z",
+]
+PS_ENTRIES = [
+    {"name": "llama3.1:8b", "digest": "46e0c10c039e", "size": 6657199104, "size_vram": 6657199104,
+     "expires_at": "2025-01-01T10:00:00Z"},
+    {"name": "qwen2.5:32b", "digest": "9f13ba1299af", "size": 22548578304, "size_vram": 11724260720,
+     "expires_at": "2025-01-01T10:00:00Z"},
+    {"name": "phi3:mini", "digest": "4f2222927938", "size": 3006477107, "size_vram": 0,
+     "expires_at": "2025-01-01T10:00:00Z"},
+]
+PROGRESS_LINES = [
+    "pulling manifest",
+    "pulling 6a0746a1ec1a 42% (1.9 GB/4.7 GB)",
+    "verifying sha256 digest",
+    "writing manifest",
+    "success",
+]
+
+
+def per_call_us(func, args_list, iterations):
+    """Return the average cost of one call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for args in args_list:
+            func(*args)
+    return (time.perf_counter() - start) / (iterations * len(args_list)) * 1_000_000
+
+
+def main():
+    legacy_refresh_args = [(SHOW_OUTPUT, line) for line in PS_LINES]
+    refresh_args = [(SHOW_DATA, entry) for entry in PS_ENTRIES]
+    progress_args = [(line,) for line in PROGRESS_LINES]
+    
+    for legacy_args, args in zip(legacy_refresh_args, refresh_args):
+        # The memory columns differ by design (exact bytes instead of scraped percentages)
+        legacy, current = legacy_model_info_parse(*legacy_args), current_model_info_parse(*args)
+        assert (legacy["size"], legacy["context"]) == (current["size"], current["context"]), args
+    for args in progress_args:
+        assert legacy_parse_download_progress(*args) == parse_download_progress(*args), args
+    
+    print(f"{'parser':<26} {'before us/call':>15} {'after us/call':>14} {'speedup':>9}")
+    for name, legacy, current, legacy_args_list, args_list, iterations in (
+        ("model-info refresh", legacy_model_info_parse, current_model_info_parse,
+         legacy_refresh_args, refresh_args, 2000),
+        ("download progress line", legacy_parse_download_progress, parse_download_progress,
+         progress_args, progress_args, 20000),
+    ):
+        before = per_call_us(legacy, legacy_args_list, iterations)
+        after = per_call_us(current, args_list, iterations)
+        print(f"{name:<26} {before:>15.2f} {after:>14.2f} {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()